@@ -9,7 +9,13 @@ from alembic import context
 
 from application.core.config import settings
 from application.core.models.base import Base
-from application.core.models import User, Task, Project
+from application.core.models import (
+    User,
+    Task,
+    Project,
+    ProjectTaskCounter,
+    ContractorTaskCounter,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,53 @@
+"""Add task access path indexes
+
+Revision ID: 8b41f0c2d7e3
+Revises: cf3b8e8226cb
+Create Date: 2026-10-18 10:12:41.208114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b41f0c2d7e3"
+down_revision: Union[str, None] = "cf3b8e8226cb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Индексы таблицы tasks: имя -> колонки (должны совпадать с Task.__table_args__)
+TASK_INDEXES = {
+    "ix_tasks_contractor_date_to": ["contractor", "date_to"],
+    "ix_tasks_project_id_date_to": ["project_id", "date_to"],
+    "ix_tasks_status_date_to": ["status", "date_to"],
+    "ix_tasks_date_to_id": ["date_to", "id"],
+}
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции,
+    # поэтому индексы строятся в autocommit-блоке без блокировки записи в таблицу
+    with op.get_context().autocommit_block():
+        for name, columns in TASK_INDEXES.items():
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in TASK_INDEXES:
+            op.drop_index(
+                name,
+                table_name="tasks",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,71 @@
+"""Add full-text search vectors for tasks and projects
+
+Revision ID: 4f6a9d2c81b5
+Revises: 8b41f0c2d7e3
+Create Date: 2026-10-18 11:30:12.532871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f6a9d2c81b5"
+down_revision: Union[str, None] = "8b41f0c2d7e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Выражение поискового вектора (должно совпадать с search_vector в моделях Task и Project)
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+# Таблица -> имя GIN-индекса по search_vector
+SEARCH_INDEXES = {
+    "tasks": "ix_tasks_search_vector",
+    "projects": "ix_projects_search_vector",
+}
+
+
+def upgrade() -> None:
+    for table in SEARCH_INDEXES:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTOR, persisted=True),
+            ),
+        )
+
+    # GIN-индексы строятся без блокировки записи (см. 8b41f0c2d7e3)
+    with op.get_context().autocommit_block():
+        for table, name in SEARCH_INDEXES.items():
+            op.create_index(
+                name,
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name in SEARCH_INDEXES.items():
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for table in SEARCH_INDEXES:
+        op.drop_column(table, "search_vector")
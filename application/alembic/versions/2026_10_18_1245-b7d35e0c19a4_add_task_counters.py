@@ -0,0 +1,110 @@
+"""Add incrementally maintained task counters
+
+Revision ID: b7d35e0c19a4
+Revises: 4f6a9d2c81b5
+Create Date: 2026-10-18 12:45:03.118404
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d35e0c19a4"
+down_revision: Union[str, None] = "4f6a9d2c81b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Таблица счетчиков -> колонка задачи, по которой ведется подсчет
+COUNTER_TABLES = {
+    "project_task_counters": "project_id",
+    "contractor_task_counters": "contractor",
+}
+
+# Изменения счетчиков для каждой операции (см. application.core.models.task_counter)
+DELTAS = {
+    "insert": "SELECT project_id, contractor, status, 1 AS delta FROM new_rows",
+    "update": (
+        "SELECT project_id, contractor, status, 1 AS delta FROM new_rows "
+        "UNION ALL SELECT project_id, contractor, status, -1 FROM old_rows"
+    ),
+    "delete": "SELECT project_id, contractor, status, -1 AS delta FROM old_rows",
+}
+
+TRANSITIONS = {
+    "insert": "NEW TABLE AS new_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+}
+
+FUNCTION = """
+CREATE OR REPLACE FUNCTION task_counters_{op}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    WITH delta AS ({source}),
+    by_project AS (
+        INSERT INTO project_task_counters AS c (project_id, status, count)
+        SELECT project_id, status, sum(delta) FROM delta
+        GROUP BY project_id, status HAVING sum(delta) <> 0
+        ORDER BY project_id, status
+        ON CONFLICT (project_id, status) DO UPDATE SET count = c.count + EXCLUDED.count
+    )
+    INSERT INTO contractor_task_counters AS c (contractor, status, count)
+    SELECT contractor, status, sum(delta) FROM delta
+    GROUP BY contractor, status HAVING sum(delta) <> 0
+    ORDER BY contractor, status
+    ON CONFLICT (contractor, status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    RETURN NULL;
+END $$
+"""
+
+TRIGGER = """
+CREATE TRIGGER task_counters_{op} AFTER {event} ON tasks
+REFERENCING {transition}
+FOR EACH STATEMENT EXECUTE FUNCTION task_counters_{op}()
+"""
+
+
+def upgrade() -> None:
+    status = postgresql.ENUM(name="taskstatus", create_type=False)
+    for table, key in COUNTER_TABLES.items():
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column(key, sa.Integer(), nullable=False),
+            sa.Column("status", status, nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(key, "status"),
+        )
+
+    # Триггеры и начальное заполнение в одной транзакции с блокировкой записи в tasks,
+    # чтобы ни одно изменение не прошло мимо счетчиков
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    for operation, source in DELTAS.items():
+        op.execute(FUNCTION.format(op=operation, source=source))
+        op.execute(
+            TRIGGER.format(
+                op=operation,
+                event=operation.upper(),
+                transition=TRANSITIONS[operation],
+            )
+        )
+    for table, key in COUNTER_TABLES.items():
+        op.execute(
+            f"INSERT INTO {table} ({key}, status, count) "
+            f"SELECT {key}, status, count(*) FROM tasks GROUP BY {key}, status"
+        )
+
+
+def downgrade() -> None:
+    for operation in DELTAS:
+        op.execute(f"DROP TRIGGER IF EXISTS task_counters_{operation} ON tasks")
+        op.execute(f"DROP FUNCTION IF EXISTS task_counters_{operation}()")
+    for table in COUNTER_TABLES:
+        op.drop_table(table)
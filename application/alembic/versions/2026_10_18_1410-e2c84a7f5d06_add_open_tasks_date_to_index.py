@@ -0,0 +1,42 @@
+"""Add partial index on open tasks by deadline
+
+Revision ID: e2c84a7f5d06
+Revises: b7d35e0c19a4
+Create Date: 2026-10-18 14:10:27.640915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2c84a7f5d06"
+down_revision: Union[str, None] = "b7d35e0c19a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индекс строится без блокировки записи (см. 8b41f0c2d7e3)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_date_to",
+            "tasks",
+            ["date_to", "id"],
+            postgresql_where=sa.text("status <> 'COMPLETED'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_open_date_to",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,135 @@
+"""Partition tasks into hot and archive partitions
+
+Revision ID: 9c1e5b7a3f42
+Revises: e2c84a7f5d06
+Create Date: 2026-10-18 15:30:41.372518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1e5b7a3f42"
+down_revision: Union[str, None] = "e2c84a7f5d06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Индексы tasks -> имена, которые они получают в разделе tasks_hot
+INDEXES = {
+    "ix_tasks_status_date_to": "tasks_hot_status_date_to_idx",
+    "ix_tasks_project_id_date_to": "tasks_hot_project_id_date_to_idx",
+    "ix_tasks_contractor_date_to": "tasks_hot_contractor_date_to_idx",
+    "ix_tasks_date_to_id": "tasks_hot_date_to_id_idx",
+    "ix_tasks_search_vector": "tasks_hot_search_vector_idx",
+    "ix_tasks_open_date_to": "tasks_hot_date_to_id_idx1",
+}
+
+# Определения индексов на родительской таблице (совпадают с индексами раздела)
+INDEX_DEFINITIONS = {
+    "ix_tasks_status_date_to": "(status, date_to)",
+    "ix_tasks_project_id_date_to": "(project_id, date_to)",
+    "ix_tasks_contractor_date_to": "(contractor, date_to)",
+    "ix_tasks_date_to_id": "(date_to, id)",
+    "ix_tasks_search_vector": "USING gin (search_vector)",
+    "ix_tasks_open_date_to": "(date_to, id) WHERE status <> 'COMPLETED'",
+}
+
+# Триггеры счетчиков задач (см. b7d35e0c19a4)
+COUNTER_TRIGGERS = {
+    "insert": "NEW TABLE AS new_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+}
+
+# Короткое ожидание блокировки: миграцию лучше повторить, чем остановить запись в tasks
+LOCK_TIMEOUT = "SET LOCAL lock_timeout = '5s'"
+
+
+def _drop_counter_triggers(table: str) -> None:
+    for operation in COUNTER_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS task_counters_{operation} ON {table}")
+
+
+def _create_counter_triggers() -> None:
+    for operation, transition in COUNTER_TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER task_counters_{operation} AFTER {operation.upper()} ON tasks "
+            f"REFERENCING {transition} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION task_counters_{operation}()"
+        )
+
+
+def upgrade() -> None:
+    # 1. Новая колонка без перезаписи таблицы и ограничение, которое позволит
+    #    подключить таблицу как раздел без полного сканирования
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "archived", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_hot_archived_check "
+        "CHECK (archived = false) NOT VALID"
+    )
+
+    # 2. Долгие операции без блокировки записи
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE tasks VALIDATE CONSTRAINT tasks_hot_archived_check")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS tasks_hot_pkey "
+            "ON tasks (id, date_to, archived)"
+        )
+
+    # 3. Подмена таблицы секционированной: только изменения каталога, без копирования строк
+    op.execute(LOCK_TIMEOUT)
+    _drop_counter_triggers("tasks")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_pkey")
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_hot_pkey PRIMARY KEY USING INDEX tasks_hot_pkey"
+    )
+    op.execute("ALTER TABLE tasks RENAME TO tasks_hot")
+    for index, hot_index in INDEXES.items():
+        op.execute(f"ALTER INDEX {index} RENAME TO {hot_index}")
+
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_hot INCLUDING DEFAULTS INCLUDING GENERATED, "
+        "CONSTRAINT tasks_pkey PRIMARY KEY (id, date_to, archived), "
+        "CONSTRAINT tasks_project_id_fkey FOREIGN KEY (project_id) REFERENCES projects (id), "
+        "CONSTRAINT tasks_contractor_fkey FOREIGN KEY (contractor) REFERENCES users (id)) "
+        "PARTITION BY LIST (archived)"
+    )
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+    op.execute("ALTER TABLE tasks ATTACH PARTITION tasks_hot FOR VALUES IN (false)")
+    op.execute(
+        "CREATE TABLE tasks_archive PARTITION OF tasks FOR VALUES IN (true) "
+        "PARTITION BY RANGE (date_to)"
+    )
+    # Индексы родителя подключают уже построенные индексы tasks_hot
+    for index, definition in INDEX_DEFINITIONS.items():
+        op.execute(f"CREATE INDEX {index} ON tasks {definition}")
+    _create_counter_triggers()
+    op.execute("ALTER TABLE tasks_hot DROP CONSTRAINT tasks_hot_archived_check")
+
+
+def downgrade() -> None:
+    # Архивные задачи возвращаются в основной раздел
+    op.execute("UPDATE tasks SET archived = false WHERE archived")
+
+    op.execute(LOCK_TIMEOUT)
+    _drop_counter_triggers("tasks")
+    op.execute("ALTER TABLE tasks DETACH PARTITION tasks_hot")
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks_hot.id")
+    op.execute("DROP TABLE tasks CASCADE")
+    op.execute("ALTER TABLE tasks_hot RENAME TO tasks")
+    for index, hot_index in INDEXES.items():
+        op.execute(f"ALTER INDEX {hot_index} RENAME TO {index}")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_hot_pkey")
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id)")
+    op.drop_column("tasks", "archived")
+    _create_counter_triggers()
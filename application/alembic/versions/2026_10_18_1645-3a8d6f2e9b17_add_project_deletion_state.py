@@ -0,0 +1,36 @@
+"""Add background project deletion state
+
+Revision ID: 3a8d6f2e9b17
+Revises: 9c1e5b7a3f42
+Create Date: 2026-10-18 16:45:12.904316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a8d6f2e9b17"
+down_revision: Union[str, None] = "9c1e5b7a3f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Колонки с постоянными значениями по умолчанию добавляются без перезаписи таблицы
+    op.add_column(
+        "projects",
+        sa.Column("deleting", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("tasks_deleted", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "tasks_deleted")
+    op.drop_column("projects", "deleting")
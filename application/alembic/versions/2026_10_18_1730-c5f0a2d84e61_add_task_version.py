@@ -0,0 +1,31 @@
+"""Add task version for conditional updates
+
+Revision ID: c5f0a2d84e61
+Revises: 3a8d6f2e9b17
+Create Date: 2026-10-18 17:30:54.218037
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f0a2d84e61"
+down_revision: Union[str, None] = "3a8d6f2e9b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Постоянное значение по умолчанию: колонка добавляется без перезаписи секций
+    op.add_column(
+        "tasks",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
@@ -0,0 +1,51 @@
+"""Add transactional outbox for task notifications
+
+Revision ID: 7e4b2c9d1a03
+Revises: c5f0a2d84e61
+Create Date: 2026-10-18 18:15:12.604871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7e4b2c9d1a03"
+down_revision: Union[str, None] = "c5f0a2d84e61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox",
+        sa.Column(
+            "event",
+            sa.Enum(
+                "TASK_CREATED",
+                "TASKS_CREATED",
+                "TASK_CHANGED",
+                "TASK_ACCEPTED",
+                name="outboxevent",
+            ),
+            nullable=False,
+        ),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox")
+    sa.Enum(name="outboxevent").drop(op.get_bind())
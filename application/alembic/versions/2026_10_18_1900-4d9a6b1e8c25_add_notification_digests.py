@@ -0,0 +1,53 @@
+"""Add notification mode and outbox recipient for digests
+
+Revision ID: 4d9a6b1e8c25
+Revises: 7e4b2c9d1a03
+Create Date: 2026-10-18 19:00:37.914256
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d9a6b1e8c25"
+down_revision: Union[str, None] = "7e4b2c9d1a03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+notification_mode = sa.Enum("INSTANT", "HOURLY", "DAILY", name="notificationmode")
+
+
+def upgrade() -> None:
+    notification_mode.create(op.get_bind())
+    op.add_column(
+        "users",
+        sa.Column(
+            "notification_mode",
+            notification_mode,
+            server_default="INSTANT",
+            nullable=False,
+        ),
+    )
+
+    # Получатель уже записанных сообщений - текущий исполнитель задачи;
+    # сообщения об удаленных задачах все равно не были бы отправлены
+    op.add_column("outbox", sa.Column("recipient", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE outbox SET recipient = tasks.contractor FROM tasks "
+        "WHERE tasks.id = (CASE WHEN outbox.event = 'TASKS_CREATED' "
+        "THEN outbox.payload -> 0 ->> 0 ELSE outbox.payload ->> 0 END)::int"
+    )
+    op.execute("DELETE FROM outbox WHERE recipient IS NULL")
+    op.alter_column("outbox", "recipient", nullable=False)
+    op.create_index("ix_outbox_recipient_id", "outbox", ["recipient", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_recipient_id", table_name="outbox")
+    op.drop_column("outbox", "recipient")
+    op.drop_column("users", "notification_mode")
+    notification_mode.drop(op.get_bind())
@@ -1,19 +1,24 @@
 import json
 from random import randint
-from typing import Annotated, Dict
+from typing import Annotated, Dict, Optional
 
-import asyncio
 from fastapi import APIRouter, HTTPException, Depends, Form
 from fastapi import Response, Request
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import RedirectResponse, JSONResponse
+from jose import JWTError
 
 from application.background_tasks.send_message import (
+    dispatch_email,
     send_email_confirmation_code,
 )
-from application.core.exception.user_exception import UserNotFound, InvalidPasswordError
+from application.core.exception.user_exception import (
+    UserNotFound,
+    InvalidPasswordError,
+    PasswordHashingBusy,
+)
 from application.core.models.db_helper import db_helper
 from application.core.models.user import PositionType
 from application.core.schemas.user import (
@@ -22,12 +27,15 @@ from application.core.schemas.user import (
     SUserLogForm,
 )
 from application.crud.users import add_user, get_user
-from application.utils.auth_user import create_access_token
-from application.utils.dependencies import authenticate_user
-from application.utils.verification_code import (
-    verification_codes,
-    remove_code_after_delay,
+from application.utils.auth_user import (
+    create_refresh_token,
+    create_session_access_token,
+    decode_token,
+    set_session_cookies,
 )
+from application.utils.dependencies import authenticate_user, load_refresh_session
+from application.utils.revocation import revocation_list
+from application.utils.verification_code import verification_codes
 
 # Роутер для обработки авторизации и регистрации
 router = APIRouter(tags=["Auth"], prefix="/auth")
@@ -57,9 +65,10 @@ async def register_user(
         if not current_user:
             # Генерация и отправка кода подтверждения
             verification_code = randint(1000, 9999)
-            verification_codes[user_data.email] = verification_code
-            send_email_confirmation_code(user_data.email, verification_code)
-            asyncio.create_task(remove_code_after_delay(user_data.email))
+            await verification_codes.set(user_data.email, verification_code)
+            await dispatch_email(
+                send_email_confirmation_code, user_data.email, verification_code
+            )
 
             # Сохранение временных данных пользователя в cookies
             data = {
@@ -135,7 +144,7 @@ async def verify_register(
         user_data = json.loads(user_data_cookie)
 
         # Проверка правильности кода подтверждения
-        if verification_codes.get(user_data["email"]) == code:
+        if await verification_codes.get(user_data["email"]) == code:
             # Создание пользователя
             user = await add_user(
                 name=user_data["name"],
@@ -150,27 +159,34 @@ async def verify_register(
                 user_data["email"], user_data["password"], session
             )
 
-            # Создание JWT-токена
-            access_token = create_access_token(
-                {"sub": str(current_user.id), "admin": str(current_user.is_director)}
+            # Создание токенов сессии и установка их в cookies
+            set_session_cookies(
+                response,
+                create_session_access_token(current_user),
+                create_refresh_token(current_user.id),
             )
 
-            # Установка токена в cookies
-            response.set_cookie("access_token", access_token, httponly=True, path="/")
-
             # Удаление кода подтверждения
-            del verification_codes[user_data["email"]]
+            await verification_codes.delete(user_data["email"])
 
             # Удаление cookies с данными пользователя
             response.delete_cookie("user_data", httponly=True)
 
             # Перенаправление на главную страницу
-            return RedirectResponse(url="/pages/base", status_code=303)
+            return response
         else:
             return JSONResponse(
                 status_code=400, content={"message": "Код подтверждения неверен"}
             )
 
+    # Очередь хеширования паролей переполнена
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": "1"},
+        )
+
     # Обработка ошибок базы данных
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Ошибка базы данных") from e
@@ -201,14 +217,11 @@ async def login_user(
         # Аутентификация пользователя по email и паролю
         user = await authenticate_user(user_data.email, user_data.password, session)
 
-        # Генерация JWT-токена
-        access_token = create_access_token(
-            {"sub": str(user.id), "admin": str(user.is_director)}
-        )
-
-        # Установка токена в cookies
+        # Генерация токенов сессии и установка их в cookies
         response = RedirectResponse(url="/pages/base", status_code=303)
-        response.set_cookie("access_token", access_token, httponly=True)
+        set_session_cookies(
+            response, create_session_access_token(user), create_refresh_token(user.id)
+        )
 
         # Перенаправление на главную страницу
         return response
@@ -221,6 +234,14 @@ async def login_user(
     except InvalidPasswordError:
         raise HTTPException(status_code=401, detail="Пароль неверный")
 
+    # Очередь хеширования паролей переполнена
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": "1"},
+        )
+
     # Обработка ошибок базы данных
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Ошибка базы данных") from e
@@ -232,17 +253,65 @@ async def login_user(
         ) from e
 
 
+# Обновление токенов сессии
+@router.post("/refresh")
+async def refresh_session(
+    request: Request,  # Запрос для получения cookies
+    session: Annotated[
+        AsyncSession, Depends(db_helper.session_getter)
+    ],  # Получение сессии БД
+    refresh_token: Optional[str] = Form(None),  # Refresh-токен (если не в cookies)
+) -> dict:
+    """
+    Обновление токенов сессии:
+    - Проверяет refresh-токен из формы или cookies и отзывает его.
+    - Выдает новую пару токенов с актуальными данными пользователя.
+    """
+    refresh_token = refresh_token or request.cookies.get("refresh_token")
+    if not refresh_token:
+        raise HTTPException(status_code=401, detail="Refresh-токен не найден")
+
+    user, payload = await load_refresh_session(refresh_token, session)
+    await revocation_list.revoke(payload["jti"], payload["exp"])
+
+    access_token = create_session_access_token(user)
+    new_refresh_token = create_refresh_token(user.id)
+    response = JSONResponse(
+        {
+            "access_token": access_token,
+            "refresh_token": new_refresh_token,
+            "token_type": "bearer",
+        }
+    )
+    set_session_cookies(response, access_token, new_refresh_token)
+    return response
+
+
 # Выход пользователя
 @router.post("/logout")
-async def logout_user(response: Response) -> dict:
+async def logout_user(request: Request, response: Response) -> dict:
     """
     Выход пользователя:
-    - Удаляет JWT-токен из cookies, деавторизуя пользователя.
+    - Отзывает токены сессии до истечения их срока действия.
+    - Удаляет JWT-токены из cookies, деавторизуя пользователя.
     """
     try:
-        # Удаление токена из cookies
+        # Отзыв токенов сессии из cookies
+        for cookie in ("access_token", "refresh_token"):
+            token = request.cookies.get(cookie)
+            if not token:
+                continue
+            try:
+                payload = decode_token(token, verify_exp=False)
+            except JWTError:
+                continue
+            if "jti" in payload and "exp" in payload:
+                await revocation_list.revoke(payload["jti"], payload["exp"])
+
+        # Удаление токенов из cookies
         response = RedirectResponse(url="/pages/base", status_code=303)
         response.delete_cookie("access_token", httponly=True)
+        response.delete_cookie("refresh_token", httponly=True)
 
         # Перенаправление на главную страницу
         return response
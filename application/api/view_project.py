@@ -1,17 +1,27 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, Request, Form, HTTPException
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.core.config import settings
+from application.core.exception.base_exception import InvalidCursorError
 from application.core.models import User
 from application.core.models.db_helper import db_helper
-from application.core.schemas.project import SProject, SProjectCreateForm
+from application.core.schemas.pagination import SPage
+from application.background_tasks.project_delete import delete_project_job
+from application.core.schemas.project import (
+    SProject,
+    SProjectCreateForm,
+    SProjectDeletion,
+)
 from application.crud.projects import (
     add_project,
     get_project,
     update_project,
-    get_all_projects,
-    del_project,
+    get_projects_page,
+    mark_project_deleting,
+    get_project_deletion,
+    search_projects,
 )
 from application.pages.router_base import templates
 from application.pages.router_admin import templates_admin as templates_admit
@@ -45,15 +55,16 @@ async def create_project(
             # Добавление нового проекта
             project = await add_project(data_project, session)
 
-            # Получение всех проектов после добавления нового
-            projects = await get_all_projects(session)
+            # Получение первой страницы проектов после добавления нового
+            page = await get_projects_page(session)
 
             # Возврат ответа с обновленным списком проектов и сообщением об успехе
             return templates_admit.TemplateResponse(
                 "project_admin.html",
                 {
                     "request": request,
-                    "projects": projects,
+                    "projects": page.items,
+                    "page": page,
                     "message": "Проект успешно создан.",
                 },
             )
@@ -116,28 +127,32 @@ async def change_project(
 async def get_projects(
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    cursor: Optional[str] = None,  # Курсор страницы
+    limit: int = Query(
+        settings.page_size, ge=1, le=settings.page_size_max
+    ),  # Размер страницы
 ) -> List[SProject] | dict:
     """
-    Получение списка всех проектов:
+    Получение списка проектов постранично:
     - Если пользователь является директором, возвращается административный шаблон.
     - Для обычных пользователей возвращается стандартный шаблон.
     """
     try:
-        projects = await get_all_projects(session)
+        page = await get_projects_page(session, cursor, limit)
+        context = {"request": request, "projects": page.items, "page": page}
 
         if current_user.is_director:
-            return templates_admit.TemplateResponse(
-                "project_admin.html", {"request": request, "projects": projects}
-            )
+            return templates_admit.TemplateResponse("project_admin.html", context)
         else:
-            return templates.TemplateResponse(
-                "project.html", {"request": request, "projects": projects}
-            )
+            return templates.TemplateResponse("project.html", context)
+
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
 
     except Exception as e:
         # Общая обработка исключений
@@ -146,6 +161,30 @@ async def get_projects(
         )
 
 
+# Роутер для полнотекстового поиска проектов
+@router.get("/search")
+async def search_projects_view(
+    session: Annotated[
+        AsyncSession, Depends(db_helper.read_session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+    q: str = Query(..., min_length=1, max_length=200),  # Строка поиска
+    cursor: Optional[str] = None,  # Курсор страницы
+    limit: int = Query(
+        settings.page_size, ge=1, le=settings.page_size_max
+    ),  # Размер страницы
+) -> SPage:
+    """
+    Поиск проектов по имени и описанию с сортировкой по релевантности и пагинацией.
+    """
+    try:
+        return await search_projects(session, q, cursor, limit)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
+
+
 # Роутер для удаления проекта
 @router.post("/delete")
 async def delete_project(
@@ -160,24 +199,31 @@ async def delete_project(
 ) -> dict:
     """
     Удаление проекта:
-    - Если пользователь имеет права директора, проект удаляется и возвращается список проектов с сообщением об удалении.
+    - Если пользователь имеет права директора, проект помечается как удаляемый и сразу
+      скрывается из списка, а его задачи и сам проект удаляются в фоне пачками.
+      Ход удаления возвращает /project/delete_status/{project_id}.
     - Если нет прав, возвращается сообщение об отсутствии доступа.
     """
     try:
         if current_user.is_director:
-            # Удаление проекта
-            project = await del_project(project_id, session)
+            # Пометка проекта и запуск фонового удаления
+            if await mark_project_deleting(project_id, session):
+                delete_project_job.delay(project_id)
+                message = "Проект удаляется"
+            else:
+                message = "Такого проекта не существует"
 
-            # Получение обновленного списка проектов после удаления
-            projects = await get_all_projects(session)
+            # Получение первой страницы проектов после удаления
+            page = await get_projects_page(session)
 
-            # Возврат ответа с обновленным списком проектов и сообщением об успехе
+            # Возврат ответа с обновленным списком проектов и сообщением
             return templates_admit.TemplateResponse(
                 "project_admin.html",
                 {
                     "request": request,
-                    "projects": projects,
-                    "message": "Проект успешно удален",
+                    "projects": page.items,
+                    "page": page,
+                    "message": message,
                 },
             )
         else:
@@ -190,3 +236,28 @@ async def delete_project(
         raise HTTPException(
             status_code=500, detail=f"Ошибка при удалении проекта: {str(e)}"
         )
+
+
+# Роутер для хода фонового удаления проекта
+@router.get("/delete_status/{project_id}")
+async def project_deletion_status(
+    project_id: int,  # Идентификатор удаляемого проекта
+    session: Annotated[
+        AsyncSession, Depends(db_helper.session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> SProjectDeletion:
+    """
+    Ход удаления проекта: количество удаленных и оставшихся задач.
+    - Доступно только директору.
+    - Если проект не удаляется, возвращается 404.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+
+    deletion = await get_project_deletion(project_id, session)
+    if deletion is None:
+        raise HTTPException(status_code=404, detail="Проект не удаляется")
+    return deletion
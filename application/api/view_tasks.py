@@ -1,44 +1,80 @@
-from typing import Annotated, List, Dict
+from datetime import date
+from typing import Annotated, List, Dict, Optional, Literal
 
-from fastapi import APIRouter, Depends, Request, HTTPException, Form
+from fastapi import (
+    APIRouter,
+    Depends,
+    Request,
+    Response,
+    HTTPException,
+    Form,
+    Header,
+    Query,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from application.background_tasks.send_message import (
-    send_email_add_new_task_for_you,
-    send_email_change_task_for_you,
-    send_email_accept_task,
+from application.background_tasks.outbox import flush_outbox
+from application.core.config import settings
+from application.core.exception.base_exception import (
+    InvalidCursorError,
+    ProjectUnavailableError,
 )
 from application.core.models import User
 from application.core.models.db_helper import db_helper
 from application.core.models.task import TypeTask, TaskStatus
+from application.core.schemas.pagination import SPage
 from application.core.schemas.task import (
     STask,
     SChangeTask,
     SBaseTask,
     SMyTask,
     STaskCreateForm,
+    STaskStatusBatch,
+    STaskStatusBatchResult,
+    STaskStats,
+    SDashboard,
 )
 from application.crud.projects import get_all_projects
 from application.crud.tasks import (
+    accept_task,
     add_task,
-    get_all_tasks,
-    get_task,
-    change_status_task,
+    add_tasks_bulk,
+    get_tasks_page,
+    change_status_tasks,
     update_task,
+    update_task_if_match,
     get_my_tasks,
     get_task_by_id,
     remove_task,
     get_tasks_by_project,
+    search_tasks,
+    stream_tasks,
 )
+from application.crud.dashboard import get_dashboard
+from application.crud.task_counters import get_task_stats
 from application.crud.users import get_users
 from application.pages.router_base import templates
 from application.pages.router_admin import templates_admin as templates_admin
+from application.utils.cache import TTLCache
+from application.utils.bulk_tasks import parse_tasks_payload
 from application.utils.dependencies import get_current_user
+from application.utils.export_tasks import (
+    EXPORT_MEDIA_TYPES,
+    tasks_to_csv,
+    tasks_to_ndjson,
+)
 from application.utils.detected_change_task import detect_changes
+from application.utils.etag import parse_if_match, version_etag
 
 # Маршрутизатор для управления задачами
 router = APIRouter(tags=["Task"], prefix="/task")
 
+# Кэш сводки директора (одна запись на дату)
+dashboard_cache = TTLCache(ttl=settings.dashboard_cache_ttl, maxsize=2)
+
 
 # Роутер для создания задачи
 @router.post("/create")
@@ -59,34 +95,91 @@ async def create_task(
     - Проверяет, является ли пользователь директором, и добавляет задачу.
     - Возвращает страницу с новой задачей или сообщение об отсутствии прав.
     """
+    message = "У вас нет прав для создания задач"
     if current_user.is_director:
-        # Создание новой задачи
-        new_task = await add_task(task_data, session)
-        task = await get_task_by_id(new_task.id, session)
+        # Создание новой задачи: вставка и данные для шаблона за один запрос,
+        # email о новой задаче записан в outbox в той же транзакции
+        try:
+            task = await add_task(task_data, session)
+        except ProjectUnavailableError:
+            message = "Проект не существует или удаляется"
+        else:
+            await flush_outbox()
 
-        # Получение списков проектов и пользователей для формы
-        projects = await get_all_projects(session)
-        users = await get_users(session)
+            # Возвращаем шаблон с созданной задачей
+            return templates_admin.TemplateResponse(
+                "new_task.html", {"request": request, "task": task}
+            )
 
-        # Отправка email о новой задаче
-        send_email_add_new_task_for_you(task.contractor_email, task)
+    projects = await get_all_projects(session)
+    users = await get_users(session)
+    return templates_admin.TemplateResponse(
+        "create_task_admin.html",
+        {
+            "request": request,
+            "message": message,
+            "projects": projects,
+            "users": users,
+        },
+    )
 
-        # Возвращаем шаблон с созданной задачей
-        return templates_admin.TemplateResponse(
-            "new_task.html", {"request": request, "task": task}
+
+# Роутер для массового создания задач
+@router.post("/bulk_create")
+async def bulk_create_tasks(
+    request: Request,  # Объект запроса
+    session: Annotated[
+        AsyncSession, Depends(db_helper.session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> dict:
+    """
+    Массовое создание задач:
+    - Принимает JSON-массив или NDJSON (Content-Type: application/x-ndjson) с задачами
+      в формате STaskCreateForm.
+    - Все задачи валидируются за один проход и вставляются одним запросом.
+    - Каждому исполнителю в той же транзакции записывается в outbox одно письмо
+      со списком его новых задач.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+
+    try:
+        data_tasks = parse_tasks_payload(
+            await request.body(), request.headers.get("content-type", "")
         )
-    else:
-        projects = await get_all_projects(session)
-        users = await get_users(session)
-        return templates_admin.TemplateResponse(
-            "create_task_admin.html",
-            {
-                "request": request,
-                "message": "У вас нет прав для создания задач",
-                "projects": projects,
-                "users": users,
-            },
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_url=False, include_context=False)
         )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный JSON/NDJSON")
+
+    if not data_tasks:
+        return {"created": 0, "ids": []}
+    if len(data_tasks) > settings.bulk_tasks_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не более {settings.bulk_tasks_max} задач в одном запросе",
+        )
+
+    try:
+        tasks = await add_tasks_bulk(data_tasks, session)
+    except ProjectUnavailableError:
+        raise HTTPException(
+            status_code=422, detail="Указан несуществующий или удаляемый проект"
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=422, detail="Указан несуществующий проект или исполнитель"
+        )
+
+    # Уведомления исполнителям записаны в outbox вместе с задачами
+    await flush_outbox()
+
+    return {"created": len(tasks), "ids": [task["id"] for task in tasks]}
 
 
 # Роутер для получения всех задач
@@ -94,40 +187,206 @@ async def create_task(
 async def get_tasks(
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    cursor: Optional[str] = None,  # Курсор страницы
+    limit: int = Query(
+        settings.page_size, ge=1, le=settings.page_size_max
+    ),  # Размер страницы
+    include_archive: bool = False,  # Включать архивные задачи
 ) -> List[SBaseTask]:
     """
-    Получение всех задач:
+    Получение всех задач постранично:
     - Если пользователь является директором, возвращает админскую версию страницы задач.
     """
-    tasks = await get_all_tasks(session)
     if current_user.is_director:
+        try:
+            page = await get_tasks_page(session, cursor, limit, include_archive)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
         return templates_admin.TemplateResponse(
-            "task_admin.html", {"request": request, "tasks": tasks}
+            "task_admin.html", {"request": request, "tasks": page.items, "page": page}
         )
 
 
+# Роутер для полнотекстового поиска задач
+@router.get("/search")
+async def search_tasks_view(
+    session: Annotated[
+        AsyncSession, Depends(db_helper.read_session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+    q: str = Query(..., min_length=1, max_length=200),  # Строка поиска
+    status: Optional[TaskStatus] = None,  # Фильтр по статусу
+    type_task: Optional[TypeTask] = None,  # Фильтр по типу задачи
+    contractor: Optional[int] = None,  # Фильтр по исполнителю
+    project_id: Optional[int] = None,  # Фильтр по проекту
+    cursor: Optional[str] = None,  # Курсор страницы
+    limit: int = Query(
+        settings.page_size, ge=1, le=settings.page_size_max
+    ),  # Размер страницы
+    include_archive: bool = False,  # Включать архивные задачи
+) -> SPage:
+    """
+    Поиск задач по имени и описанию:
+    - Поддерживает синтаксис веб-поиска: слова, "точная фраза", or, -исключение.
+    - Результаты упорядочены по релевантности и отдаются постранично.
+    - Директор ищет по всем задачам, остальные пользователи - только по своим.
+    """
+    if not current_user.is_director:
+        contractor = current_user.id
+    try:
+        return await search_tasks(
+            session,
+            q,
+            status=status,
+            type_task=type_task,
+            contractor=contractor,
+            project_id=project_id,
+            cursor=cursor,
+            limit=limit,
+            include_archive=include_archive,
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
+
+
+# Роутер для статистики задач
+@router.get("/stats")
+async def task_stats(
+    session: Annotated[
+        AsyncSession, Depends(db_helper.read_session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> STaskStats:
+    """
+    Количество задач по статусам в целом, по проектам и по исполнителям:
+    - Доступно только директору.
+    - Читается из счетчиков, которые обновляются вместе с задачами.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+    return await get_task_stats(session)
+
+
+# Роутер для сводки директора
+@router.get("/dashboard")
+async def dashboard(
+    response: Response,  # Ответ (для заголовков кэширования)
+    session: Annotated[
+        AsyncSession, Depends(db_helper.read_session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> SDashboard:
+    """
+    Сводка директора одним запросом к базе данных:
+    - Просроченные задачи и их общее количество.
+    - Задачи с ближайшими сроками.
+    - Статусы задач по проектам и загрузка исполнителей.
+    Сводка кэшируется на settings.dashboard_cache_ttl секунд.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+
+    today = date.today()
+    data = dashboard_cache.get(today)
+    if data is None:
+        data = await get_dashboard(
+            session,
+            today,
+            settings.dashboard_list_size,
+            settings.dashboard_upcoming_days,
+        )
+        dashboard_cache.set(today, data)
+
+    response.headers["Cache-Control"] = (
+        f"private, max-age={int(settings.dashboard_cache_ttl)}"
+    )
+    return data
+
+
+async def _export_chunks(request: Request, **filters):
+    """
+    Читает задачи для выгрузки в собственной сессии чтения, которая живет,
+    пока отправляется потоковый ответ.
+    """
+    async for session in db_helper.read_session_getter(request):
+        async for rows in stream_tasks(session, settings.export_chunk_size, **filters):
+            yield rows
+
+
+# Роутер для потоковой выгрузки задач
+@router.get("/export")
+async def export_tasks(
+    request: Request,  # Объект запроса
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format"
+    ),  # Формат выгрузки
+    project_id: Optional[int] = None,  # Фильтр по проекту
+    contractor: Optional[int] = None,  # Фильтр по исполнителю
+    status: Optional[TaskStatus] = None,  # Фильтр по статусу
+    date_from: Optional[date] = None,  # Задачи, начинающиеся не раньше этой даты
+    date_to: Optional[date] = None,  # Задачи, завершающиеся не позже этой даты
+    include_archive: bool = False,  # Включать архивные задачи
+):
+    """
+    Потоковая выгрузка задач в NDJSON или CSV:
+    - Доступна только директору.
+    - Строки читаются из базы серверным курсором и отправляются по мере чтения,
+      поэтому потребление памяти не зависит от размера таблицы.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+
+    chunks = _export_chunks(
+        request,
+        project_id=project_id,
+        contractor=contractor,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        include_archive=include_archive,
+    )
+    body = tasks_to_csv(chunks) if export_format == "csv" else tasks_to_ndjson(chunks)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
 # Роутер для получения задач текущего пользователя
 @router.get("/my_tasks")
 async def view_my_tasks(
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    include_archive: bool = False,  # Включать архивные задачи
 ) -> List[SMyTask]:
     """
     Просмотр задач текущего пользователя:
     - Возвращает страницу с задачами, назначенными текущему пользователю.
     """
     user_id = current_user.id
-    tasks = await get_my_tasks(user_id, session)
+    tasks = await get_my_tasks(user_id, session, include_archive)
     return templates.TemplateResponse(
         "my_tasks.html", {"request": request, "tasks": tasks}
     )
@@ -139,17 +398,18 @@ async def view_task(
     task_id: int,  # Идентификатор задачи
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    include_archive: bool = False,  # Включать архивные задачи
 ) -> SMyTask:
     """
     Просмотр конкретной задачи по ID:
     - Возвращает страницу с деталями задачи.
     """
-    task = await get_task_by_id(task_id, session)
+    task = await get_task_by_id(task_id, session, include_archive)
     return templates.TemplateResponse(
         "task_details.html", {"request": request, "task": task}
     )
@@ -161,17 +421,18 @@ async def view_task_by_project(
     project_id: int,  # Идентификатор проекта
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    include_archive: bool = False,  # Включать архивные задачи
 ) -> List[SBaseTask]:
     """
     Просмотр задач по проекту:
     - Возвращает задачи, связанные с выбранным проектом.
     """
-    tasks = await get_tasks_by_project(project_id, session)
+    tasks = await get_tasks_by_project(project_id, session, include_archive)
     return templates.TemplateResponse(
         "task_by_project.html", {"request": request, "tasks": tasks}
     )
@@ -196,49 +457,114 @@ async def accepted_task(
     form_data = await request.form()
     task_id = int(form_data.get("task_id"))  # Получение ID задачи из формы
 
-    task = await get_task(session, id=task_id)
-    if task.contractor == current_user.id:
-        up_task = await change_status_task(
-            task_id, current_user.id, session, status=TaskStatus.IN_PROGRESS
-        )
-        task = await get_task_by_id(up_task.id, session)
-        send_email_accept_task(task.contractor_email, task)
-        tasks = await get_my_tasks(current_user.id, session)
+    # Проверка исполнителя, смена статуса и обновленный список задач за один запрос
+    task, tasks = await accept_task(task_id, current_user.id, session)
+    if task:
+        await flush_outbox()
         return templates.TemplateResponse(
             "my_tasks.html", {"request": request, "tasks": tasks}
         )
     return {"message": "Вы не являетесь исполнителем этой задачи"}
 
 
+# Роутер для пакетного изменения статуса задач
+@router.post("/change_status_batch")
+async def change_status_batch(
+    data: STaskStatusBatch,  # Список задач и новый статус
+    session: Annotated[
+        AsyncSession, Depends(db_helper.session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> STaskStatusBatchResult:
+    """
+    Пакетное изменение статуса задач:
+    - Изменяет статус только тех задач, исполнителем которых является текущий пользователь.
+    - Возвращает списки задач, для которых статус изменен и для которых отклонен.
+    """
+    task_ids = list(dict.fromkeys(data.task_ids))
+    if len(task_ids) > settings.bulk_tasks_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не более {settings.bulk_tasks_max} задач в одном запросе",
+        )
+
+    applied = await change_status_tasks(task_ids, current_user.id, data.status, session)
+    if applied:
+        await flush_outbox()
+    applied_ids = set(applied)
+    return STaskStatusBatchResult(
+        applied=[task_id for task_id in task_ids if task_id in applied_ids],
+        rejected=[task_id for task_id in task_ids if task_id not in applied_ids],
+    )
+
+
 # Роутер для изменения задачи
 @router.patch("/change")
 async def change_task(
     task_id: int,  # Идентификатор задачи
     data_task: SChangeTask,  # Данные для изменения задачи
+    response: Response,  # Ответ (для заголовка ETag)
     session: Annotated[
         AsyncSession, Depends(db_helper.session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    if_match: Optional[str] = Header(None),  # Ожидаемая версия задачи (ETag)
 ) -> SBaseTask | dict:
     """
     Изменение существующей задачи:
-    - Если пользователь является директором, задача обновляется.
+    - Если пользователь является директором, в задаче обновляются только изменившиеся поля.
+      Если ничего не изменилось, запись в базу не выполняется.
+    - С заголовком If-Match задача изменяется одним запросом без предварительного
+      чтения и только если ее версия совпадает (иначе 412).
     - Если поля изменены, отправляется email уведомление исполнителю.
+    - Текущая версия задачи возвращается в заголовке ETag.
     """
-    if current_user.is_director:
-        current_task = await get_task_by_id(task_id, session)
-        changed_fields = detect_changes(current_task, data_task)
-        up_task = await update_task(task_id, data_task, session)
-        if changed_fields:
-            send_email_change_task_for_you(
-                current_task.contractor_email, changed_fields
-            )
-        return up_task
-    else:
+    if not current_user.is_director:
         return {"message": "У пользователя нет прав доступа"}
 
+    try:
+        version = parse_if_match(if_match)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный заголовок If-Match")
+
+    changes = data_task.model_dump(exclude_none=True)
+    task = None
+    try:
+        if version is not None:
+            task = await update_task_if_match(task_id, changes, version, session)
+
+        if task is None:
+            # Без If-Match, а также если условное изменение не выполнено
+            current_task = await get_task_by_id(task_id, session)
+            if current_task is None:
+                raise HTTPException(status_code=404, detail="Такой задачи не существует")
+            if version is not None and current_task.version != version:
+                raise HTTPException(status_code=412, detail="Задача была изменена")
+
+            changed_fields = {}
+            task = current_task
+            if version is None:
+                changed_fields = detect_changes(current_task._mapping, data_task)
+            if changed_fields:
+                task = await update_task(
+                    task_id, changed_fields, session, version=current_task.version
+                )
+                if task is None:
+                    raise HTTPException(status_code=409, detail="Задача была изменена")
+    except ProjectUnavailableError:
+        # Задачу нельзя перенести в несуществующий или удаляемый проект
+        raise HTTPException(
+            status_code=422, detail="Указан несуществующий или удаляемый проект"
+        )
+
+    await flush_outbox()
+    response.headers["ETag"] = version_etag(task.version)
+    return task
+
 
 # Роутер для удаления задачи
 @router.post("/delete")
@@ -258,10 +584,15 @@ async def del_task(
         raise HTTPException(status_code=404, detail="Task not found")
 
     await remove_task(task_id, session)
-    tasks = await get_all_tasks(session)
+    page = await get_tasks_page(session)
 
     # После удаления возвращаем шаблон с сообщением об успехе
     return templates_admin.TemplateResponse(
         "task_admin.html",
-        {"request": request, "tasks": tasks, "message": "Задача была успешно удалена"},
+        {
+            "request": request,
+            "tasks": page.items,
+            "page": page,
+            "message": "Задача была успешно удалена",
+        },
     )
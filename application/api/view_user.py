@@ -1,12 +1,19 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.core.config import settings
+from application.core.exception.base_exception import InvalidCursorError
 from application.core.models.db_helper import db_helper
 from application.core.models.user import User
-from application.core.schemas.user import SUser
-from application.crud.users import get_my_profile, get_users
+from application.core.schemas.user import SNotificationSettings, SUser
+from application.crud.users import (
+    get_my_profile,
+    get_users_page,
+    set_notification_mode,
+    user_cache,
+)
 from application.pages.router_admin import templates_admin
 from application.pages.router_base import templates
 from application.utils.dependencies import get_current_user
@@ -45,25 +52,69 @@ async def get_profile(
 async def get_all_users(
     request: Request,  # Объект запроса
     session: Annotated[
-        AsyncSession, Depends(db_helper.session_getter)
+        AsyncSession, Depends(db_helper.read_session_getter)
     ],  # Сессия базы данных
     current_user: User = Depends(
         get_current_user
     ),  # Текущий авторизованный пользователь
+    cursor: Optional[str] = None,  # Курсор страницы
+    limit: int = Query(
+        settings.page_size, ge=1, le=settings.page_size_max
+    ),  # Размер страницы
 ):
     """
-    Получение списка всех пользователей:
+    Получение списка всех пользователей постранично:
     - Доступно только для пользователей с правами директора.
-    - Возвращает список всех пользователей на странице администратора.
+    - Возвращает страницу пользователей на странице администратора.
     """
     if current_user.is_director:
-        # Получаем всех пользователей
-        users = await get_users(session)
+        # Получаем страницу пользователей
+        try:
+            page = await get_users_page(session, cursor, limit)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор страницы")
 
         # Возвращаем админский шаблон с пользователями
         return templates_admin.TemplateResponse(
-            "view_user_admin.html", {"request": request, "users": users}
+            "view_user_admin.html",
+            {"request": request, "users": page.items, "page": page},
         )
     else:
         # Если у пользователя нет прав директора, возвращаем сообщение об отказе в доступе
         return {"message": "У вас нет прав для доступа"}
+
+
+# Роутер для статистики кэша пользователей
+@router.get("/cache_stats")
+async def get_user_cache_stats(
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> dict:
+    """
+    Статистика кэша пользователей текущего процесса (попадания и промахи).
+    Доступно только директору.
+    """
+    if not current_user.is_director:
+        raise HTTPException(status_code=403, detail="У пользователя нет прав доступа")
+    return user_cache.stats()
+
+
+# Роутер для изменения режима email уведомлений
+@router.post("/notification_mode")
+async def change_notification_mode(
+    data: SNotificationSettings,  # Новый режим уведомлений
+    session: Annotated[
+        AsyncSession, Depends(db_helper.session_getter)
+    ],  # Сессия базы данных
+    current_user: User = Depends(
+        get_current_user
+    ),  # Текущий авторизованный пользователь
+) -> SNotificationSettings:
+    """
+    Изменение режима email уведомлений текущего пользователя:
+    - instant: уведомления отправляются сразу, близкие по времени объединяются в одно письмо.
+    - hourly / daily: уведомления приходят одной сводкой не чаще раза в час / в сутки.
+    """
+    await set_notification_mode(current_user.id, data.notification_mode, session)
+    return data
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+from typing import Awaitable, Callable, List, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from application.core.config import settings
+from application.core.models.db_helper import DB_URL
+
+T = TypeVar("T")
+
+
+async def run_in_session(
+    func: Callable[..., Awaitable[T]], *args, **kwargs
+) -> T:
+    """
+    Выполняет CRUD-функцию в отдельном движке без пула соединений.
+
+    Задачи Celery запускают собственный цикл событий через asyncio.run,
+    поэтому общий пул db_helper, привязанный к другому циклу, использовать нельзя.
+
+    :param func: Асинхронная функция, первым аргументом принимающая сессию.
+    :return: Результат функции.
+    """
+    engine = create_async_engine(str(DB_URL), poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            return await func(session, *args, **kwargs)
+    finally:
+        await engine.dispose()
+
+
+# Небольшой пул соединений процесса воркера для частых задач (уведомления)
+class WorkerDatabase:
+    def __init__(self, url: str, pool_size: int) -> None:
+        """
+        Держит в каждом потоке воркера свой цикл событий и движок с пулом
+        из pool_size соединений: соединения asyncpg привязаны к циклу событий,
+        поэтому пул не переживает asyncio.run и переиспользуется только
+        в постоянном цикле потока.
+
+        :param url: URL подключения к базе данных.
+        :param pool_size: Размер пула соединений потока.
+        """
+        self.url = url
+        self.pool_size = pool_size
+        self._local = threading.local()
+        # Состояния всех потоков процесса, чтобы close() закрыл каждое из них
+        self._states: List[SimpleNamespace] = []
+        self._lock = threading.Lock()
+
+    def _state(self) -> SimpleNamespace:
+        state = getattr(self._local, "state", None)
+        # Соединения родительского процесса не используются после fork
+        if state is None or state.pid != os.getpid():
+            engine = create_async_engine(self.url, pool_size=self.pool_size, max_overflow=0)
+            state = SimpleNamespace(
+                pid=os.getpid(),
+                loop=asyncio.new_event_loop(),
+                engine=engine,
+                session_factory=async_sessionmaker(
+                    engine, class_=AsyncSession, expire_on_commit=False
+                ),
+            )
+            self._local.state = state
+            with self._lock:
+                self._states.append(state)
+        return state
+
+    def run(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """
+        Выполняет CRUD-функцию в сессии из пула потока и ждет результат.
+
+        :param func: Асинхронная функция, первым аргументом принимающая сессию.
+        :return: Результат функции.
+        """
+        state = self._state()
+
+        async def run_session() -> T:
+            async with state.session_factory() as session:
+                return await func(session, *args, **kwargs)
+
+        return state.loop.run_until_complete(run_session())
+
+    def close(self) -> None:
+        """
+        Закрывает соединения и циклы событий всех потоков процесса.
+        Вызывается при остановке процесса воркера, когда задачи уже не выполняются.
+        """
+        with self._lock:
+            states, self._states = self._states, []
+        for state in states:
+            # Состояния родительского процесса, унаследованные при fork, не трогаем
+            if state.pid != os.getpid():
+                continue
+            state.loop.run_until_complete(state.engine.dispose())
+            state.loop.close()
+            # Поток, вызвавший run после close, создаст новое состояние
+            state.pid = None
+
+
+worker_db = WorkerDatabase(str(DB_URL), settings.celery_db_pool_size)
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import timedelta
+from typing import List
+
+from application.background_tasks.send_message import dispatch_email, send_email_digest
+from application.core.config import settings
+from application.core.models.db_helper import db_helper
+from application.crud.outbox import digest_windows, drain_outbox
+from application.utils.emun_types import NotificationMode
+
+
+async def publish_digest(recipient: int, events: List[list]) -> None:
+    """
+    Передает накопленные уведомления получателя задаче Celery send_email_digest.
+
+    :param recipient: ID получателя.
+    :param events: Список [событие, аргументы] в порядке записи.
+    """
+    await dispatch_email(send_email_digest, recipient, events)
+
+
+async def flush_outbox() -> None:
+    """
+    В режиме settings.email_dispatch_mode == "sync" сразу, без окон объединения,
+    отправляет сообщения outbox, записанные запросом. В режиме broker их передает
+    в очередь диспетчер (run_dispatcher), и запрос не ждет ни брокер, ни SMTP.
+    """
+    if settings.email_dispatch_mode == "sync":
+        async with db_helper.session_factory() as session:
+            await drain_outbox(
+                session,
+                publish_digest,
+                settings.outbox_batch_size,
+                dict.fromkeys(NotificationMode, timedelta(0)),
+            )
+
+
+async def run_dispatcher() -> None:
+    """
+    Диспетчер outbox: в цикле передает в очередь Celery сводки получателей,
+    у которых истекло окно объединения (settings.notification_coalesce_window
+    или час / сутки по режиму уведомлений пользователя), пачками по
+    settings.outbox_batch_size сообщений. Если отправлять нечего, ждет
+    settings.outbox_poll_interval секунд. Можно запускать несколько диспетчеров.
+    """
+    windows = digest_windows(settings.notification_coalesce_window)
+    while True:
+        async with db_helper.session_factory() as session:
+            sent = await drain_outbox(
+                session, publish_digest, settings.outbox_batch_size, windows
+            )
+        if not sent:
+            await asyncio.sleep(settings.outbox_poll_interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_dispatcher())
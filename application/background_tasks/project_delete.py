@@ -0,0 +1,23 @@
+import asyncio
+
+from application.background_tasks.db import run_in_session
+from application.background_tasks.send_message import celery
+from application.core.config import settings
+from application.crud.projects import delete_project_tasks
+
+
+# Задача Celery для фонового удаления проекта
+@celery.task()
+def delete_project_job(project_id: int) -> int:
+    """
+    Удаляет задачи проекта пачками по settings.project_delete_batch_size,
+    а затем сам проект. Повторный запуск продолжает прерванное удаление.
+
+    :param project_id: ID проекта, помеченного как удаляемый.
+    :return: Количество удаленных задач.
+    """
+    return asyncio.run(
+        run_in_session(
+            delete_project_tasks, project_id, settings.project_delete_batch_size
+        )
+    )
@@ -1,19 +1,177 @@
-import smtplib
-
-from celery import Celery
+import asyncio
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from celery import Celery, Task as CeleryTask
+from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
+from fastapi.encoders import jsonable_encoder
+from kombu import Queue
 from pydantic import EmailStr
+from sqlalchemy.engine import Row
 
+from application.background_tasks.db import worker_db
 from application.core.config import settings
-from application.core.schemas.task import SMyTask
+from application.crud.tasks import get_tasks_by_ids
 from application.utils.create_message_for_email import (
     create_message_add_new_task,
+    create_message_add_new_tasks,
     create_message_change_task,
     create_message_confirmation_code,
     create_message_accept_task,
+    create_message_digest,
 )
+from application.utils.emun_types import CeleryQueue, OutboxEvent
+from application.utils.smtp_pool import smtp_pool
 
 # Инициализация объекта Celery с брокером Redis
-celery = Celery("task", broker=settings.REDIS_URL)
+celery = Celery(
+    "task",
+    broker=settings.REDIS_URL,
+    include=[
+        "application.background_tasks.task_counters",
+        "application.background_tasks.task_archive",
+        "application.background_tasks.project_delete",
+    ],
+)
+
+# Очереди задач: у каждой свой воркер (application.background_tasks.worker),
+# поэтому коды подтверждения не ждут за массовыми уведомлениями
+celery.conf.task_queues = [Queue(queue.value) for queue in CeleryQueue]
+celery.conf.task_default_queue = CeleryQueue.DEFAULT.value
+celery.conf.task_routes = {
+    "application.background_tasks.send_message.send_email_confirmation_code": {
+        "queue": CeleryQueue.AUTH.value
+    },
+    "application.background_tasks.send_message.send_email_*": {
+        "queue": CeleryQueue.NOTIFICATIONS.value
+    },
+}
+# Воркер, слушающий несколько очередей, выбирает сообщения в порядке task_queues
+celery.conf.broker_transport_options = {"queue_order_strategy": "priority"}
+
+# Периодические задачи (выполняются при запущенном celery beat)
+celery.conf.beat_schedule = {
+    "reconcile-task-counters": {
+        "task": "application.background_tasks.task_counters.reconcile_task_counters_job",
+        "schedule": crontab(
+            hour=settings.task_counters_reconcile_hour,
+            minute=settings.task_counters_reconcile_minute,
+        ),
+    },
+    "archive-completed-tasks": {
+        "task": "application.background_tasks.task_archive.archive_completed_tasks_job",
+        "schedule": crontab(hour=settings.tasks_archive_hour, minute=0),
+    },
+}
+
+
+@worker_process_shutdown.connect
+def close_worker_connections(**kwargs) -> None:
+    """
+    Закрывает SMTP-соединения и соединения с БД процесса воркера при его завершении.
+    """
+    smtp_pool.close()
+    worker_db.close()
+
+
+async def dispatch_email(task: CeleryTask, *args) -> None:
+    """
+    Ставит отправку письма в очередь брокера, не дожидаясь SMTP-сервера.
+
+    В режиме settings.email_dispatch_mode == "sync" (тесты, запуск без брокера)
+    задача выполняется сразу в отдельном потоке, чтобы не блокировать цикл событий.
+
+    :param task: Задача Celery для отправки письма.
+    :param args: Аргументы задачи (только идентификаторы).
+    """
+    if settings.email_dispatch_mode == "sync":
+        await asyncio.to_thread(task.apply, args=args, throw=True)
+    else:
+        task.delay(*args)
+
+
+def _load_tasks(task_ids: List[int]) -> list:
+    """
+    Загружает задачи по ID одним запросом (WHERE id = ANY) на стороне воркера
+    через пул соединений процесса, а не новое соединение на каждое письмо.
+
+    :param task_ids: Список ID задач.
+    :return: Найденные задачи; удаленные к моменту отправки пропускаются.
+    """
+    return worker_db.run(lambda session: get_tasks_by_ids(task_ids, session))
+
+
+def _event_task_ids(event: OutboxEvent, payload: list) -> List[int]:
+    """
+    Возвращает ID задач, упомянутых в аргументах события.
+    """
+    return payload[0] if event == OutboxEvent.TASKS_CREATED else [payload[0]]
+
+
+def _create_event_message(
+    event: OutboxEvent, payload: list, tasks: Dict[int, Row]
+) -> Optional[EmailMessage]:
+    """
+    Строит письмо для одного события из загруженных задач.
+
+    :param event: Событие outbox.
+    :param payload: Аргументы события.
+    :param tasks: Загруженные задачи по ID.
+    :return: Письмо или None, если задач события уже нет.
+    """
+    task_ids = _event_task_ids(event, payload)
+    found = [tasks[task_id] for task_id in task_ids if task_id in tasks]
+    if not found:
+        return None
+
+    task = found[0]
+    if event == OutboxEvent.TASK_CREATED:
+        return create_message_add_new_task(task.contractor_email, task)
+    if event == OutboxEvent.TASKS_CREATED:
+        data_tasks = jsonable_encoder([dict(task._mapping) for task in found])
+        return create_message_add_new_tasks(task.contractor_email, data_tasks)
+    if event == OutboxEvent.TASK_CHANGED:
+        changes = jsonable_encoder(
+            {field: task._mapping[field] for field in payload[1]}
+        )
+        return create_message_change_task(task.contractor_email, changes)
+    return create_message_accept_task(task.contractor_email, task)
+
+
+def _send_events(events: List[list], recipient_id: Optional[int] = None) -> None:
+    """
+    Загружает задачи всех событий одним запросом и отправляет одно письмо:
+    само уведомление, если оно одно, или сводку из нескольких.
+
+    :param events: Список [событие, аргументы] в порядке записи.
+    :param recipient_id: ID получателя: задачи, переданные другому исполнителю,
+                         в письмо не попадают.
+    """
+    events = [(OutboxEvent(event), payload) for event, payload in events]
+    task_ids = sorted(
+        {
+            task_id
+            for event, payload in events
+            for task_id in _event_task_ids(event, payload)
+        }
+    )
+    tasks = {
+        task.id: task
+        for task in _load_tasks(task_ids)
+        if recipient_id is None or task.contractor == recipient_id
+    }
+    messages = [
+        message
+        for message in (
+            _create_event_message(event, payload, tasks) for event, payload in events
+        )
+        if message is not None
+    ]
+    if len(messages) == 1:
+        smtp_pool.send(messages[0])
+    elif messages:
+        smtp_pool.send(create_message_digest(messages[0]["To"], messages))
 
 
 # Задача Celery для отправки email с кодом подтверждения
@@ -25,72 +183,65 @@ def send_email_confirmation_code(email_to: EmailStr, code: int):
     :param email_to: Email-адрес получателя.
     :param code: Код подтверждения, который будет отправлен.
     """
-    # Формируем содержимое письма
-    msg_content = create_message_confirmation_code(email_to, code)
+    smtp_pool.send(create_message_confirmation_code(email_to, code))
+
+
+# Задача Celery для отправки уведомлений одному получателю одним письмом
+@celery.task()
+def send_email_digest(recipient_id: int, events: List[list]):
+    """
+    Отправляет накопленные уведомления получателю одним письмом-сводкой
+    (одно уведомление отправляется как обычное письмо).
+
+    :param recipient_id: ID получателя.
+    :param events: Список [событие, аргументы] в порядке записи (см. OutboxEvent).
+    """
+    _send_events(events, recipient_id)
 
-    # Настраиваем SMTP-соединение и отправляем письмо
-    with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        # Авторизация на SMTP-сервере
-        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        # Отправка письма
-        server.send_message(msg_content)
 
+# Задачи для отдельных уведомлений: диспетчер outbox отправляет сводки
+# (send_email_digest), эти задачи обрабатывают уже поставленные в очередь сообщения
 
 # Задача Celery для отправки email с информацией о новой задаче
 @celery.task()
-def send_email_add_new_task_for_you(email_to: EmailStr, data_task: SMyTask):
+def send_email_add_new_task_for_you(task_id: int):
     """
-    Отправляет уведомление о создании новой задачи на email пользователя.
+    Отправляет уведомление о создании новой задачи на email исполнителя.
 
-    :param email_to: Email-адрес получателя.
-    :param data_task: Объект задачи с информацией о новой задаче.
+    :param task_id: ID новой задачи.
     """
-    # Формируем содержимое письма
-    msg_content = create_message_add_new_task(email_to, data_task)
+    _send_events([[OutboxEvent.TASK_CREATED.value, [task_id]]])
+
 
-    # Настраиваем SMTP-соединение и отправляем письмо
-    with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        # Авторизация на SMTP-сервере
-        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        # Отправка письма
-        server.send_message(msg_content)
+# Задача Celery для отправки одного email со списком новых задач
+@celery.task()
+def send_email_add_new_tasks_for_you(task_ids: List[int]):
+    """
+    Отправляет одно уведомление о нескольких новых задачах на email исполнителя.
+
+    :param task_ids: Список ID новых задач одного исполнителя.
+    """
+    _send_events([[OutboxEvent.TASKS_CREATED.value, [task_ids]]])
 
 
 # Задача Celery для отправки email при изменении задачи
 @celery.task()
-def send_email_change_task_for_you(email_to: EmailStr, data_task: dict):
+def send_email_change_task_for_you(task_id: int, fields: List[str]):
     """
-    Отправляет уведомление об изменении задачи на email пользователя.
+    Отправляет уведомление об изменении задачи на email исполнителя.
 
-    :param email_to: Email-адрес получателя.
-    :param data_task: Словарь с информацией о изменениях в задаче.
+    :param task_id: ID измененной задачи.
+    :param fields: Названия измененных полей; значения читаются из базы данных.
     """
-    # Формируем содержимое письма
-    msg_content = create_message_change_task(email_to, data_task)
-
-    # Настраиваем SMTP-соединение и отправляем письмо
-    with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        # Авторизация на SMTP-сервере
-        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        # Отправка письма
-        server.send_message(msg_content)
+    _send_events([[OutboxEvent.TASK_CHANGED.value, [task_id, fields]]])
 
 
 # Задача Celery для отправки email при принятии задачи в работу
 @celery.task()
-def send_email_accept_task(email_to: EmailStr, data_task: dict):
+def send_email_accept_task(task_id: int):
     """
-    Отправляет уведомление о принятии задачи в работу на email пользователя.
+    Отправляет уведомление о принятии задачи в работу на email исполнителя.
 
-    :param email_to: Email-адрес получателя.
-    :param data_task: Словарь с информацией о принятой задаче.
+    :param task_id: ID принятой задачи.
     """
-    # Формируем содержимое письма
-    msg_content = create_message_accept_task(email_to, data_task)
-
-    # Настраиваем SMTP-соединение и отправляем письмо
-    with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        # Авторизация на SMTP-сервере
-        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        # Отправка письма
-        server.send_message(msg_content)
+    _send_events([[OutboxEvent.TASK_ACCEPTED.value, [task_id]]])
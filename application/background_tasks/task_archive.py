@@ -0,0 +1,24 @@
+import asyncio
+from datetime import date, timedelta
+
+from application.background_tasks.db import run_in_session
+from application.background_tasks.send_message import celery
+from application.core.config import settings
+from application.crud.task_archive import archive_completed_tasks
+
+
+# Задача Celery для ежедневной архивации завершенных задач
+@celery.task()
+def archive_completed_tasks_job() -> int:
+    """
+    Переносит в архив завершенные задачи, срок которых прошел
+    более settings.tasks_archive_after_days дней назад.
+
+    :return: Количество перенесенных задач.
+    """
+    before = date.today() - timedelta(days=settings.tasks_archive_after_days)
+    return asyncio.run(
+        run_in_session(
+            archive_completed_tasks, before, settings.tasks_archive_batch_size
+        )
+    )
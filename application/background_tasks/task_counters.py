@@ -0,0 +1,16 @@
+import asyncio
+
+from application.background_tasks.db import run_in_session
+from application.background_tasks.send_message import celery
+from application.crud.task_counters import reconcile_task_counters
+
+
+# Задача Celery для ежедневной сверки счетчиков задач
+@celery.task()
+def reconcile_task_counters_job() -> int:
+    """
+    Исправляет расхождения счетчиков задач с таблицей tasks.
+
+    :return: Количество исправленных счетчиков.
+    """
+    return asyncio.run(run_in_session(reconcile_task_counters))
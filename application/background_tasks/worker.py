@@ -0,0 +1,43 @@
+import sys
+from typing import Dict, List, Tuple
+
+from application.background_tasks.send_message import celery
+from application.core.config import settings
+from application.utils.emun_types import CeleryQueue
+
+# Количество процессов и множитель предвыборки воркера каждой очереди:
+# коды подтверждения берутся по одному, чтобы не ждать в буфере занятого процесса
+WORKER_SETTINGS: Dict[CeleryQueue, Tuple[int, int]] = {
+    CeleryQueue.AUTH: (settings.celery_auth_concurrency, settings.celery_auth_prefetch),
+    CeleryQueue.NOTIFICATIONS: (
+        settings.celery_notifications_concurrency,
+        settings.celery_notifications_prefetch,
+    ),
+    CeleryQueue.DEFAULT: (
+        settings.celery_default_concurrency,
+        settings.celery_default_prefetch,
+    ),
+}
+
+
+def worker_argv(queue: CeleryQueue) -> List[str]:
+    """
+    Формирует аргументы запуска воркера Celery для одной очереди.
+
+    :param queue: Очередь, которую обслуживает воркер.
+    :return: Аргументы командной строки celery worker.
+    """
+    concurrency, prefetch = WORKER_SETTINGS[queue]
+    return [
+        "worker",
+        "--loglevel=INFO",
+        f"--queues={queue.value}",
+        f"--hostname={queue.value}@%h",
+        f"--concurrency={concurrency}",
+        f"--prefetch-multiplier={prefetch}",
+    ]
+
+
+if __name__ == "__main__":
+    # Запуск: python -m application.background_tasks.worker <auth|notifications|default>
+    celery.worker_main(worker_argv(CeleryQueue(sys.argv[1])))
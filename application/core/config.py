@@ -1,5 +1,5 @@
 import os
-from typing import Literal
+from typing import List, Literal
 
 import dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -31,6 +31,53 @@ class Settings(BaseSettings):
     db_echo_pool: bool = False  # Логирование действий с пулом соединений
     db_pool_size: int = 50  # Размер пула соединений
     db_max_overflow: int = 10  # Максимальное количество дополнительных соединений
+    db_query_cache_size: int = 500  # Размер кэша скомпилированных запросов SQLAlchemy
+    db_prepared_statement_cache_size: int = 500  # Размер кэша подготовленных запросов asyncpg на соединение
+
+    # Параметры реплик для чтения (в окружении задается JSON-списком URL)
+    DB_REPLICA_URLS: List[str] = []  # URL реплик; пустой список - все запросы идут в основную БД
+    db_replica_strategy: Literal["round_robin", "least_connections"] = "round_robin"  # Выбор реплики
+    db_replica_pool_size: int = 10  # Размер пула соединений каждой реплики
+    db_replica_connect_timeout: float = 2.0  # Таймаут подключения к реплике (сек.)
+    db_replica_retry_after: float = 30.0  # Время исключения недоступной реплики (сек.)
+    db_read_after_write_window: float = 2.0  # Время чтения из основной БД после записи клиента (сек.)
+
+    # Параметры пагинации списков
+    page_size: int = 50  # Размер страницы по умолчанию
+    page_size_max: int = 200  # Максимально допустимый размер страницы
+
+    # Максимальное количество задач в одном запросе массового создания
+    bulk_tasks_max: int = 10_000
+
+    # Количество строк, читаемых из серверного курсора за раз при выгрузке задач
+    export_chunk_size: int = 1000
+
+    # Параметры сводки директора
+    dashboard_cache_ttl: float = 30.0  # Время кэширования сводки (сек.)
+    dashboard_list_size: int = 20  # Количество задач в списках просроченных и ближайших
+    dashboard_upcoming_days: int = 7  # Горизонт ближайших сроков (дни)
+
+    # Время ежедневной сверки счетчиков задач (час и минута по времени Celery)
+    task_counters_reconcile_hour: int = 3
+    task_counters_reconcile_minute: int = 0
+
+    # Параметры архивации завершенных задач
+    tasks_archive_after_days: int = 365  # Возраст срока выполнения для переноса в архив (дни)
+    tasks_archive_batch_size: int = 5000  # Количество задач, переносимых за одну транзакцию
+    tasks_archive_hour: int = 4  # Время ежедневной архивации (час по времени Celery)
+
+    # Параметры фонового удаления проектов
+    project_delete_batch_size: int = 1000  # Количество задач, удаляемых за одну транзакцию
+
+    # Параметры воркеров Celery по очередям (см. CeleryQueue):
+    # количество процессов и множитель предвыборки сообщений на процесс
+    celery_auth_concurrency: int = 2  # Коды подтверждения
+    celery_auth_prefetch: int = 1
+    celery_notifications_concurrency: int = 4  # Уведомления о задачах
+    celery_notifications_prefetch: int = 4
+    celery_default_concurrency: int = 1  # Обслуживание базы данных
+    celery_default_prefetch: int = 1
+    celery_db_pool_size: int = 2  # Размер пула соединений с БД в потоке воркера уведомлений
 
     # Параметры администратора
     ADMIN_EMAIL: str  # Email администратора системы
@@ -39,11 +86,34 @@ class Settings(BaseSettings):
     SECRET_KEY: str  # Секретный ключ для генерации токенов
     ALGORITHM: str  # Алгоритм шифрования для токенов
 
+    # Параметры хеширования паролей
+    bcrypt_rounds: int = 12  # Стоимость bcrypt (log2 количества раундов)
+    password_hash_workers: int = 4  # Количество потоков для bcrypt
+    password_hash_queue_size: int = 64  # Максимум ожидающих хеширования запросов сверх потоков
+
+    # Параметры сессий
+    auth_stateless_sessions: bool = True  # Пользователь берется из данных токена без запроса к БД
+    access_token_expire_minutes: int = 15  # Время жизни access-токена (мин.)
+    refresh_token_expire_days: int = 7  # Время жизни refresh-токена (дни)
+    auth_revocation_backend: Literal["redis", "memory"] = "redis"  # Хранилище отозванных токенов
+    auth_user_cache_ttl: float = 5.0  # Время хранения пользователя в кэше get_current_user (сек.)
+    auth_user_cache_size: int = 10000  # Максимальное количество пользователей в кэше
+    verification_code_ttl: int = 300  # Время жизни кода подтверждения регистрации (сек.)
+    verification_code_backend: Literal["redis", "memory"] = "redis"  # Хранилище кодов подтверждения
+
     # Параметры SMTP (почтового сервера)
     SMTP_USERNAME: str  # Логин для подключения к SMTP-серверу
     SMTP_PASSWORD: str  # Пароль для подключения к SMTP-серверу
     SMTP_HOST: str  # Адрес SMTP-сервера
     SMTP_PORT: int  # Порт SMTP-сервера
+    smtp_use_ssl: bool = True  # Подключение к SMTP-серверу через SSL (SMTP_SSL)
+    smtp_timeout: float = 30.0  # Таймаут операций SMTP (сек.)
+    smtp_pool_size: int = 2  # Количество открытых SMTP-соединений в процессе воркера
+    smtp_idle_timeout: float = 60.0  # Время простоя, после которого SMTP-соединение открывается заново (сек.)
+    email_dispatch_mode: Literal["broker", "sync"] = "broker"  # Отправка писем через брокер или сразу (тесты)
+    outbox_batch_size: int = 100  # Количество сообщений outbox, передаваемых за одну транзакцию
+    outbox_poll_interval: float = 1.0  # Пауза диспетчера outbox, если сообщений нет (сек.)
+    notification_coalesce_window: float = 60.0  # Окно объединения уведомлений получателя в одно письмо (сек.)
 
     # Используем SettingsConfigDict для указания нужного env-файла
     model_config = SettingsConfigDict(env_file="/.env")
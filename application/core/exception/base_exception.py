@@ -6,3 +6,15 @@ class DataBaseError(CustomError):
     """Ошибка для случаев, связанных с базой данных."""
 
     pass
+
+
+class InvalidCursorError(CustomError):
+    """Ошибка для случая, когда курсор пагинации поврежден или не подходит к запросу."""
+
+    pass
+
+
+class ProjectUnavailableError(CustomError):
+    """Ошибка для случая, когда проект не существует или удаляется в фоне."""
+
+    pass
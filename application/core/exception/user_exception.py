@@ -17,3 +17,9 @@ class TokenNotFound(CustomError):
     """Ошибка для случая, когда токен не найден."""
 
     pass
+
+
+class PasswordHashingBusy(CustomError):
+    """Ошибка для случая, когда очередь хеширования паролей переполнена."""
+
+    pass
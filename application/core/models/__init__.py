@@ -1,5 +1,17 @@
-__all__ = ("User", "Project", "Task")
+__all__ = (
+    "User",
+    "Project",
+    "Task",
+    "ProjectTaskCounter",
+    "ContractorTaskCounter",
+    "OutboxMessage",
+)
 
 from application.core.models.project import Project
 from application.core.models.user import User
 from application.core.models.task import Task
+from application.core.models.task_counter import (
+    ProjectTaskCounter,
+    ContractorTaskCounter,
+)
+from application.core.models.outbox import OutboxMessage
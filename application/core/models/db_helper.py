@@ -1,5 +1,11 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+from typing import AsyncGenerator, List, Optional, Sequence
 
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
@@ -9,6 +15,35 @@ from sqlalchemy.ext.asyncio import (
 
 from application.core.config import settings
 
+# Cookie со временем последней записи клиента (Unix-время) для окна read-after-write
+LAST_WRITE_COOKIE = "last_write"
+
+
+# Реплика базы данных для чтения с собственным пулом соединений
+class ReplicaEngine:
+    def __init__(self, engine: AsyncEngine) -> None:
+        """
+        Хранит движок реплики, фабрику сессий для него и время,
+        до которого реплика считается недоступной.
+        """
+        self.engine: AsyncEngine = engine
+        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
+        )
+        self.unhealthy_until: float = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        """
+        Проверяет, можно ли направлять запросы в реплику.
+        """
+        return self.unhealthy_until <= now
+
+    def checked_out(self) -> int:
+        """
+        Возвращает количество соединений реплики, выданных из пула.
+        """
+        return self.engine.pool.checkedout()
+
 
 # Класс помощника для управления соединениями с базой данных и сессиями.
 class DatabaseHelper:
@@ -19,10 +54,18 @@ class DatabaseHelper:
         echo_pool: bool = False,  # Логгирование операций пула
         pool_size: int = 5,  # Размер пула подключений
         max_overflow: int = 10,  # Максимальное количество дополнительных подключений
+        query_cache_size: int = 500,  # Размер кэша скомпилированных запросов
+        prepared_statement_cache_size: int = 100,  # Размер кэша подготовленных запросов asyncpg
+        replica_urls: Sequence[str] = (),  # URL реплик для чтения
+        replica_strategy: str = "round_robin",  # Выбор реплики: round_robin или least_connections
+        replica_pool_size: int = 5,  # Размер пула подключений каждой реплики
+        replica_connect_timeout: float = 2.0,  # Таймаут подключения к реплике (сек.)
+        replica_retry_after: float = 30.0,  # Время исключения недоступной реплики (сек.)
+        read_after_write_window: float = 0.0,  # Время чтения из основной БД после коммита (сек.)
     ) -> None:
         """
         Инициализирует экземпляр DatabaseHelper, создавая асинхронный движок базы данных
-        и фабрику сессий с настраиваемыми параметрами.
+        и фабрику сессий с настраиваемыми параметрами, а также движки реплик для чтения.
         """
         # Создание асинхронного движка для подключения к базе данных
         self.engine: AsyncEngine = create_async_engine(
@@ -31,6 +74,8 @@ class DatabaseHelper:
             echo_pool=echo_pool,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            query_cache_size=query_cache_size,
+            connect_args={"prepared_statement_cache_size": prepared_statement_cache_size},
         )
 
         # Создание фабрики для сессий базы данных
@@ -38,25 +83,132 @@ class DatabaseHelper:
             bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False
         )
 
+        # Реплики для чтения: отдельный пул на каждую, с проверкой соединения при выдаче
+        self.replicas: List[ReplicaEngine] = [
+            ReplicaEngine(
+                create_async_engine(
+                    url=replica_url,
+                    echo=echo,
+                    echo_pool=echo_pool,
+                    pool_size=replica_pool_size,
+                    max_overflow=max_overflow,
+                    pool_pre_ping=True,
+                    query_cache_size=query_cache_size,
+                    connect_args={
+                        "timeout": replica_connect_timeout,
+                        "prepared_statement_cache_size": prepared_statement_cache_size,
+                    },
+                )
+            )
+            for replica_url in replica_urls
+        ]
+        self.replica_strategy = replica_strategy
+        self.replica_retry_after = replica_retry_after
+        self.read_after_write_window = read_after_write_window
+        self._round_robin = itertools.count()
+
+    def pick_replica(self, last_write: Optional[float] = None) -> Optional[ReplicaEngine]:
+        """
+        Выбирает реплику для чтения.
+
+        :param last_write: Время последней записи клиента (Unix-время) или None.
+        :return: Реплика или None, если чтение должно идти в основную БД
+                 (реплик нет, все недоступны или не истекло окно после записи клиента).
+        """
+        if (
+            last_write is not None
+            and time.time() - last_write < self.read_after_write_window
+        ):
+            return None
+
+        now = time.monotonic()
+
+        healthy = [replica for replica in self.replicas if replica.is_healthy(now)]
+        if not healthy:
+            return None
+        if self.replica_strategy == "least_connections":
+            return min(healthy, key=ReplicaEngine.checked_out)
+        return healthy[next(self._round_robin) % len(healthy)]
+
     async def dispose(self) -> None:
         """
-        Закрывает все подключения движка к базе данных, очищая пул.
+        Закрывает все подключения движка к базе данных и к репликам, очищая пулы.
         """
         await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.engine.dispose()
 
-    async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session_getter(
+        self, request: Request = None
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         Асинхронный генератор для получения сессии базы данных.
         Используйте его в зависимостях FastAPI для работы с базой данных.
+
+        Если есть реплики, время коммита запоминается в request.state.last_write,
+        а middleware передает его клиенту в cookie LAST_WRITE_COOKIE.
         """
+        async with self.session_factory() as session:
+            if request is not None and self.replicas:
+                event.listen(
+                    session.sync_session,
+                    "after_commit",
+                    lambda _: setattr(request.state, "last_write", time.time()),
+                )
+            yield session
+
+    @staticmethod
+    def last_write(request: Optional[Request]) -> Optional[float]:
+        """
+        Возвращает время последней записи клиента: из текущего запроса
+        или из cookie LAST_WRITE_COOKIE, выставленной предыдущим ответом.
+
+        :param request: Запрос или None (чтение вне запроса).
+        :return: Unix-время последней записи или None.
+        """
+        if request is None:
+            return None
+        last_write = getattr(request.state, "last_write", None)
+        if last_write is not None:
+            return last_write
+        try:
+            return float(request.cookies[LAST_WRITE_COOKIE])
+        except (KeyError, ValueError):
+            return None
+
+    async def read_session_getter(
+        self, request: Request = None
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Асинхронный генератор сессии только для чтения.
+        Направляет запросы в одну из реплик, а если реплик нет, выбранная реплика
+        недоступна или этот клиент недавно записывал данные, - в основную базу данных.
+        Используйте его в зависимостях FastAPI маршрутов, которые не изменяют данные.
+        """
+        replica = self.pick_replica(self.last_write(request))
+        if replica is not None:
+            session = replica.session_factory()
+            try:
+                # Соединение берется сразу, чтобы недоступная реплика была замечена до запроса
+                await session.connection()
+            except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+                await session.close()
+                replica.unhealthy_until = time.monotonic() + self.replica_retry_after
+            else:
+                async with session:
+                    yield session
+                return
+
         async with self.session_factory() as session:
             yield session
 
 
 if settings.MODE == "TEST":
     DB_URL = settings.TEST_DB_URL
+    DB_REPLICA_URLS = []
 else:
     DB_URL = settings.DB_URL
+    DB_REPLICA_URLS = settings.DB_REPLICA_URLS
 
 print(f"DB_URL: {DB_URL}")
 
@@ -67,4 +219,12 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db_echo_pool,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
+    query_cache_size=settings.db_query_cache_size,
+    prepared_statement_cache_size=settings.db_prepared_statement_cache_size,
+    replica_urls=DB_REPLICA_URLS,
+    replica_strategy=settings.db_replica_strategy,
+    replica_pool_size=settings.db_replica_pool_size,
+    replica_connect_timeout=settings.db_replica_connect_timeout,
+    replica_retry_after=settings.db_replica_retry_after,
+    read_after_write_window=settings.db_read_after_write_window,
 )
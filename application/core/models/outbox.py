@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum as SQLEnum, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.core.models.base import Base
+from application.utils.emun_types import OutboxEvent
+
+
+# Сообщение транзакционного outbox
+class OutboxMessage(Base):
+    """
+    Класс модели OutboxMessage хранит уведомление, записанное в той же транзакции,
+    что и изменение задачи. Диспетчер outbox объединяет сообщения одного получателя
+    в сводку, передает ее в очередь Celery и удаляет сообщения, поэтому
+    уведомление не теряется при сбое после коммита.
+    """
+
+    __tablename__ = "outbox"
+    # Диспетчер выбирает сообщения по получателю для объединения в сводку
+    __table_args__ = (Index("ix_outbox_recipient_id", "recipient", "id"),)
+
+    # ID пользователя-получателя уведомления
+    recipient: Mapped[int] = mapped_column(nullable=False)
+
+    # Событие, по которому строится письмо
+    event: Mapped[OutboxEvent] = mapped_column(SQLEnum(OutboxEvent), nullable=False)
+
+    # Аргументы события (только идентификаторы)
+    payload: Mapped[list] = mapped_column(JSONB, nullable=False)
+
+    # Время записи сообщения
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
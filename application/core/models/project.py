@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import String, Index, Computed, false, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.core.models.base import Base
@@ -16,11 +17,38 @@ class Project(Base):
     установкой связи с задачами (Task).
     """
 
+    # GIN-индекс для полнотекстового поиска по проектам
+    __table_args__ = (
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     # Поле для хранения имени проекта, длина строки ограничена 50 символами
     name: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # Поле для хранения описания проекта, длина строки ограничена 255 символами
     description: Mapped[str] = mapped_column(String(255), nullable=True)
 
+    # Поисковый вектор по имени (вес A) и описанию (вес B), вычисляется самой БД.
+    # Не загружается вместе с проектом и не входит в ответы (см. PROJECT_COLUMNS в crud.projects)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Проект удаляется в фоне: скрыт из списков, его задачи удаляются пачками
+    deleting: Mapped[bool] = mapped_column(
+        default=False, server_default=false(), nullable=False
+    )
+
+    # Количество задач, уже удаленных при фоновом удалении проекта
+    tasks_deleted: Mapped[int] = mapped_column(
+        default=0, server_default=text("0"), nullable=False
+    )
+
     # Связь один ко многим с таблицей Task, обратная связь на поле "project" в модели Task
     task: Mapped["Task"] = relationship(back_populates="project")
@@ -1,7 +1,19 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Date, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    String,
+    Date,
+    ForeignKey,
+    Index,
+    Computed,
+    event,
+    false,
+    text,
+    Enum as SQLEnum,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
 from datetime import date
 
 from application.core.models.base import Base
@@ -18,6 +30,36 @@ class Task(Base):
     дат начала и завершения, назначенного пользователя и связанного проекта.
     """
 
+    # Таблица секционирована по признаку архивации (см. TASK_PARTITIONS):
+    # рабочие запросы читают только оперативную секцию tasks_hot, а архив
+    # завершенных задач разбит по годам срока выполнения.
+    # Составные индексы под основные пути доступа к задачам:
+    # выборка по исполнителю, по проекту, по статусу и постраничная сортировка по сроку
+    __table_args__ = (
+        Index("ix_tasks_contractor_date_to", "contractor", "date_to"),
+        Index("ix_tasks_project_id_date_to", "project_id", "date_to"),
+        Index("ix_tasks_status_date_to", "status", "date_to"),
+        Index("ix_tasks_date_to_id", "date_to", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Незавершенные задачи по сроку: просроченные и ближайшие сроки в сводке директора
+        Index(
+            "ix_tasks_open_date_to",
+            "date_to",
+            "id",
+            postgresql_where=text("status <> 'COMPLETED'"),
+        ),
+        {"postgresql_partition_by": "LIST (archived)"},
+    )
+
+    # Первичный ключ таблицы должен включать ключи секционирования (archived, date_to),
+    # для ORM задача по-прежнему идентифицируется только id
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:
+        return {"primary_key": [cls.__table__.c.id]}
+
+    # В составном первичном ключе автоинкремент для id нужно указать явно
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
     # Поле для хранения имени задачи, длина строки ограничена 60 символами
     name: Mapped[str] = mapped_column(String(60), nullable=False)
 
@@ -30,8 +72,8 @@ class Task(Base):
     # Поле для даты начала задачи
     date_from: Mapped[date] = mapped_column(Date, nullable=False)
 
-    # Поле для даты завершения задачи
-    date_to: Mapped[date] = mapped_column(Date, nullable=False)
+    # Поле для даты завершения задачи (ключ секционирования архива)
+    date_to: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
 
     # Внешний ключ, указывающий на ID исполнителя задачи (пользователь)
     contractor: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -44,8 +86,43 @@ class Task(Base):
         SQLEnum(TaskStatus), default=TaskStatus.PENDING, nullable=False
     )
 
+    # Поисковый вектор по имени (вес A) и описанию (вес B), вычисляется самой БД.
+    # Не загружается вместе с задачей и не входит в ответы (см. TASK_COLUMNS в crud.tasks)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Признак архивной задачи (ключ секционирования): завершенные задачи старше
+    # settings.tasks_archive_after_days переносятся в архив фоновой задачей
+    archived: Mapped[bool] = mapped_column(
+        primary_key=True, default=False, server_default=false(), nullable=False
+    )
+
+    # Версия задачи для условных изменений (ETag / If-Match), увеличивается при каждом изменении
+    version: Mapped[int] = mapped_column(
+        default=1, server_default=text("1"), nullable=False
+    )
+
     # Связь с моделью пользователя через отношение "многие ко многим"
     user: Mapped["User"] = relationship(back_populates="task")
 
     # Связь с моделью проекта через отношение "многие ко многим"
     project: Mapped["Project"] = relationship(back_populates="task")
+
+
+# Секции таблицы tasks: оперативная и архивная (годовые секции архива создаются
+# при архивации, см. application.crud.task_archive)
+TASK_PARTITIONS = (
+    "CREATE TABLE tasks_hot PARTITION OF tasks FOR VALUES IN (false)",
+    "CREATE TABLE tasks_archive PARTITION OF tasks FOR VALUES IN (true) "
+    "PARTITION BY RANGE (date_to)",
+)
+
+for _partition in TASK_PARTITIONS:
+    event.listen(Task.__table__, "after_create", DDL(_partition))
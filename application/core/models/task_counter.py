@@ -0,0 +1,111 @@
+from sqlalchemy import DDL, UniqueConstraint, Enum as SQLEnum, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from application.core.models.base import Base
+from application.core.models.task import Task
+from application.utils.emun_types import TaskStatus
+
+
+# Счетчик задач проекта в одном статусе
+class ProjectTaskCounter(Base):
+    """
+    Класс модели ProjectTaskCounter хранит количество задач проекта в каждом статусе.
+    Поддерживается триггерами таблицы tasks в той же транзакции, что и изменение задач.
+    """
+
+    __tablename__ = "project_task_counters"
+    __table_args__ = (UniqueConstraint("project_id", "status"),)
+
+    # ID проекта (без внешнего ключа, чтобы счетчики не блокировали удаление проектов)
+    project_id: Mapped[int] = mapped_column(nullable=False)
+
+    # Статус задач
+    status: Mapped[TaskStatus] = mapped_column(SQLEnum(TaskStatus), nullable=False)
+
+    # Количество задач проекта в этом статусе
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
+# Счетчик задач исполнителя в одном статусе
+class ContractorTaskCounter(Base):
+    """
+    Класс модели ContractorTaskCounter хранит количество задач исполнителя в каждом статусе.
+    Поддерживается триггерами таблицы tasks в той же транзакции, что и изменение задач.
+    """
+
+    __tablename__ = "contractor_task_counters"
+    __table_args__ = (UniqueConstraint("contractor", "status"),)
+
+    # ID исполнителя
+    contractor: Mapped[int] = mapped_column(nullable=False)
+
+    # Статус задач
+    status: Mapped[TaskStatus] = mapped_column(SQLEnum(TaskStatus), nullable=False)
+
+    # Количество задач исполнителя в этом статусе
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
+# Изменения счетчиков для каждой операции: строки переходных таблиц со знаком +1/-1
+TASK_COUNTER_DELTAS = {
+    "insert": "SELECT project_id, contractor, status, 1 AS delta FROM new_rows",
+    "update": (
+        "SELECT project_id, contractor, status, 1 AS delta FROM new_rows "
+        "UNION ALL SELECT project_id, contractor, status, -1 FROM old_rows"
+    ),
+    "delete": "SELECT project_id, contractor, status, -1 AS delta FROM old_rows",
+}
+
+# Функция триггера: изменения всего оператора сворачиваются в одно обновление
+# на пару (проект, статус) и (исполнитель, статус). Строки счетчиков блокируются
+# в порядке ключа, чтобы параллельные транзакции не взаимоблокировались
+TASK_COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_counters_{op}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    WITH delta AS ({source}),
+    by_project AS (
+        INSERT INTO project_task_counters AS c (project_id, status, count)
+        SELECT project_id, status, sum(delta) FROM delta
+        GROUP BY project_id, status HAVING sum(delta) <> 0
+        ORDER BY project_id, status
+        ON CONFLICT (project_id, status) DO UPDATE SET count = c.count + EXCLUDED.count
+    )
+    INSERT INTO contractor_task_counters AS c (contractor, status, count)
+    SELECT contractor, status, sum(delta) FROM delta
+    GROUP BY contractor, status HAVING sum(delta) <> 0
+    ORDER BY contractor, status
+    ON CONFLICT (contractor, status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    RETURN NULL;
+END $$
+"""
+
+# Триггеры уровня оператора: массовые вставки и обновления дают одно обновление счетчиков
+TASK_COUNTER_TRIGGER = """
+CREATE TRIGGER task_counters_{op} AFTER {event} ON tasks
+REFERENCING {transition}
+FOR EACH STATEMENT EXECUTE FUNCTION task_counters_{op}()
+"""
+
+TASK_COUNTER_TRANSITIONS = {
+    "insert": "NEW TABLE AS new_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+}
+
+# Триггеры создаются вместе с таблицей tasks (create_all в тестах и при разработке)
+for _op, _source in TASK_COUNTER_DELTAS.items():
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(TASK_COUNTER_FUNCTION.format(op=_op, source=_source)),
+    )
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(
+            TASK_COUNTER_TRIGGER.format(
+                op=_op, event=_op.upper(), transition=TASK_COUNTER_TRANSITIONS[_op]
+            )
+        ),
+    )
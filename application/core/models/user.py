@@ -4,7 +4,7 @@ from sqlalchemy import String, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.core.models.base import Base
-from application.utils.emun_types import PositionType
+from application.utils.emun_types import NotificationMode, PositionType
 
 if TYPE_CHECKING:
     from application.core.models import Task
@@ -35,5 +35,13 @@ class User(Base):
     # Поле для указания, является ли пользователь директором (по умолчанию False)
     is_director: Mapped[bool] = mapped_column(default=False, nullable=False)
 
+    # Режим email уведомлений: сразу или сводкой раз в час / раз в сутки
+    notification_mode: Mapped[NotificationMode] = mapped_column(
+        SQLEnum(NotificationMode),
+        default=NotificationMode.INSTANT,
+        server_default=NotificationMode.INSTANT.name,
+        nullable=False,
+    )
+
     # Отношение "многие ко многим" с задачами, созданными пользователем
     task: Mapped["Task"] = relationship(back_populates="user")
@@ -0,0 +1,15 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+
+# Модель страницы результатов при курсорной (keyset) пагинации
+class SPage(BaseModel):
+    """
+    Класс SPage представляет одну страницу списка с курсорами для перехода
+    на следующую и предыдущую страницы.
+    """
+    items: List[Any]  # Элементы текущей страницы
+    limit: int  # Размер страницы
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (None, если страница последняя)
+    prev_cursor: Optional[str] = None  # Курсор предыдущей страницы (None, если страница первая)
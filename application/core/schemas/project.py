@@ -1,3 +1,5 @@
+from typing import Literal
+
 from fastapi import Form
 from pydantic import BaseModel
 
@@ -29,3 +31,14 @@ class SProjectCreateForm(BaseModel):
         Метод класса для создания объекта формы, используемого в маршрутах FastAPI.
         """
         return cls(name=name, description=description)
+
+
+# Модель данных для хода фонового удаления проекта
+class SProjectDeletion(BaseModel):
+    """
+    Класс SProjectDeletion используется для отображения хода удаления проекта.
+    """
+    project_id: int  # ID проекта
+    status: Literal["deleting", "deleted"]  # Проект удаляется или уже удален
+    tasks_deleted: int = 0  # Количество удаленных задач
+    tasks_left: int = 0  # Количество задач, которые еще предстоит удалить
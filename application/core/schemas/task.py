@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Dict, List, Optional
 
 from fastapi import Form
 from pydantic import BaseModel, EmailStr
@@ -24,11 +25,17 @@ class SBaseTask(BaseModel):
 # Модель для изменения информации о задаче
 class SChangeTask(BaseModel):
     """
-    Класс SChangeTask используется для изменения некоторых полей задачи.
+    Класс SChangeTask используется для изменения полей задачи.
+    Поля со значением None не изменяются.
     """
-    description: str  # Обновленное описание задачи
-    date_from: date  # Обновленная дата начала задачи
-    date_to: date  # Обновленная дата завершения задачи
+    name: Optional[str] = None  # Обновленное имя задачи
+    project_id: Optional[int] = None  # Обновленный идентификатор проекта
+    description: Optional[str] = None  # Обновленное описание задачи
+    date_from: Optional[date] = None  # Обновленная дата начала задачи
+    date_to: Optional[date] = None  # Обновленная дата завершения задачи
+    contractor: Optional[int] = None  # Обновленный идентификатор исполнителя
+    type_task: Optional[TypeTask] = None  # Обновленный тип задачи
+    status: Optional[TaskStatus] = None  # Обновленный статус задачи
 
 
 # Модель, представляющая основные данные задачи (без статуса)
@@ -97,3 +104,88 @@ class STaskCreateForm(BaseModel):
             type_task=type_task,
             status=status,
         )
+
+
+# Модель запроса на пакетное изменение статуса задач
+class STaskStatusBatch(BaseModel):
+    """
+    Класс STaskStatusBatch используется для изменения статуса нескольких задач одним запросом.
+    """
+    task_ids: List[int]  # Идентификаторы задач
+    status: TaskStatus  # Новый статус задач
+
+
+# Модель результата пакетного изменения статуса задач
+class STaskStatusBatchResult(BaseModel):
+    """
+    Класс STaskStatusBatchResult показывает, для каких задач статус изменен, а для каких нет.
+    """
+    applied: List[int]  # Задачи, статус которых изменен
+    rejected: List[int]  # Задачи, которые не найдены или не принадлежат пользователю
+
+
+# Количество задач по статусам
+class STaskCounts(BaseModel):
+    """
+    Класс STaskCounts представляет количество задач в каждом статусе и их общее число.
+    """
+    counts: Dict[str, int] = {}  # Статус -> количество задач
+    total: int = 0  # Общее количество задач
+
+
+# Статистика задач проекта
+class SProjectTaskStats(STaskCounts):
+    """
+    Класс SProjectTaskStats представляет количество задач проекта по статусам.
+    """
+    project_id: int  # Идентификатор проекта
+    project_name: str  # Название проекта
+
+
+# Статистика задач исполнителя
+class SContractorTaskStats(STaskCounts):
+    """
+    Класс SContractorTaskStats представляет количество задач исполнителя по статусам.
+    """
+    contractor: int  # Идентификатор исполнителя
+    name: str  # Имя исполнителя
+    email: EmailStr  # Email исполнителя
+
+
+# Сводная статистика задач для директора
+class STaskStats(STaskCounts):
+    """
+    Класс STaskStats представляет количество задач по статусам в целом,
+    по проектам и по исполнителям.
+    """
+    by_project: List[SProjectTaskStats] = []  # Статистика по проектам
+    by_contractor: List[SContractorTaskStats] = []  # Статистика по исполнителям
+
+
+# Задача в сводке директора
+class SDashboardTask(BaseModel):
+    """
+    Класс SDashboardTask представляет задачу в списках просроченных задач
+    и ближайших сроков.
+    """
+    id: int  # Идентификатор задачи
+    name: str  # Имя задачи
+    project_id: int  # Идентификатор проекта
+    project_name: str  # Название проекта
+    contractor: int  # Идентификатор исполнителя
+    contractor_name: str  # Имя исполнителя
+    date_to: date  # Срок выполнения
+    status: TaskStatus  # Статус задачи
+
+
+# Сводка директора
+class SDashboard(BaseModel):
+    """
+    Класс SDashboard объединяет данные главной страницы директора: просроченные задачи,
+    ближайшие сроки, загрузку исполнителей и статусы задач по проектам.
+    """
+    today: date  # Дата, на которую построена сводка
+    overdue_total: int  # Общее количество просроченных задач
+    overdue: List[SDashboardTask]  # Самые давно просроченные задачи
+    upcoming: List[SDashboardTask]  # Задачи с ближайшими сроками
+    stats: STaskStats  # Статусы задач по проектам и загрузка исполнителей
@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr
 from fastapi import Form
 
 from application.core.models.user import PositionType
+from application.utils.emun_types import NotificationMode
 
 
 # Модель для создания нового пользователя
@@ -26,6 +27,27 @@ class SUser(BaseModel):
     position: str  # Должность пользователя
 
 
+# Модель настроек email уведомлений пользователя
+class SNotificationSettings(BaseModel):
+    """
+    Класс SNotificationSettings задает режим email уведомлений:
+    сразу, сводкой раз в час или раз в сутки.
+    """
+    notification_mode: NotificationMode  # Режим уведомлений
+
+
+# Модель пользователя сессии, восстановленного из данных access-токена
+class SSessionUser(BaseModel):
+    """
+    Класс SSessionUser содержит поля пользователя, которые используют маршруты
+    (id, is_director, email, position). Создается из токена без запроса к базе данных.
+    """
+    id: int  # Идентификатор пользователя
+    email: str  # Email пользователя
+    is_director: bool  # Является ли пользователь директором
+    position: PositionType  # Должность пользователя
+
+
 # Модель для авторизации пользователя (логин)
 class SUserLog(BaseModel):
     """
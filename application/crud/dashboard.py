@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+
+from sqlalchemy import and_, bindparam, select, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.models import Task, Project, User
+from application.core.models.task import TaskStatus
+from application.core.schemas.task import SDashboard, SDashboardTask
+from application.crud.tasks import HOT_TASKS
+from application.crud.task_counters import (
+    PROJECT_COUNTS,
+    CONTRACTOR_COUNTS,
+    build_task_stats,
+)
+
+# Пустой JSON-массив для агрегатов без строк
+EMPTY_JSON = literal_column("'[]'::json")
+
+
+def _tasks_json(*criteria, limit: int):
+    """
+    Подзапрос: JSON-массив задач, отобранных по условиям и упорядоченных по сроку.
+    """
+    rows = (
+        select(
+            Task.id,
+            Task.name,
+            Task.project_id,
+            Project.name.label("project_name"),
+            Task.contractor,
+            User.name.label("contractor_name"),
+            Task.date_to,
+            Task.status,
+        )
+        .join(Project, Task.project_id == Project.id)
+        .join(User, Task.contractor == User.id)
+        .where(*criteria)
+        .order_by(Task.date_to, Task.id)
+        .limit(limit)
+        .subquery()
+    )
+    return select(
+        func.coalesce(
+            func.json_agg(
+                aggregate_order_by(rows.table_valued(), rows.c.date_to, rows.c.id)
+            ),
+            EMPTY_JSON,
+        )
+    ).scalar_subquery()
+
+
+def _rows_json(stmt):
+    """
+    Подзапрос: JSON-массив строк запроса, каждая строка - массив значений колонок.
+    """
+    rows = stmt.subquery()
+    return select(
+        func.coalesce(
+            func.json_agg(func.json_build_array(*rows.c)), EMPTY_JSON
+        )
+    ).scalar_subquery()
+
+
+def _json_task(task: dict) -> SDashboardTask:
+    """
+    Преобразует задачу из JSON (статус хранится именем перечисления) в схему.
+    """
+    return SDashboardTask(**{**task, "status": TaskStatus[task["status"]]})
+
+
+# Получение сводки директора
+async def get_dashboard(
+    session: AsyncSession, today: date, list_size: int, upcoming_days: int
+) -> SDashboard:
+    """
+    Возвращает сводку директора одним запросом к базе данных: каждая часть сводки
+    собирается в JSON скалярным подзапросом одного SELECT.
+
+    Количество задач по проектам и исполнителям читается из счетчиков задач,
+    списки задач ограничены list_size и используют индекс по сроку.
+
+    :param session: Асинхронная сессия базы данных.
+    :param today: Текущая дата.
+    :param list_size: Максимальное количество задач в списках.
+    :param upcoming_days: Горизонт ближайших сроков в днях.
+    :return: Схема SDashboard.
+    """
+    # Архивируются только завершенные задачи, поэтому достаточно оперативной секции.
+    # Статус подставляется в текст запроса, как false() в HOT_TASKS: с параметром
+    # обобщенный план подготовленного запроса не может использовать частичный
+    # индекс ix_tasks_open_date_to (WHERE status <> 'COMPLETED')
+    completed = bindparam(
+        "completed", TaskStatus.COMPLETED, type_=Task.status.type, literal_execute=True
+    )
+    not_completed = and_(HOT_TASKS, Task.status != completed)
+    overdue = Task.date_to < today
+    upcoming = Task.date_to.between(today, today + timedelta(days=upcoming_days))
+
+    stmt = select(
+        select(func.count())
+        .where(overdue, not_completed)
+        .select_from(Task)
+        .scalar_subquery()
+        .label("overdue_total"),
+        _tasks_json(overdue, not_completed, limit=list_size).label("overdue"),
+        _tasks_json(upcoming, not_completed, limit=list_size).label("upcoming"),
+        _rows_json(PROJECT_COUNTS).label("by_project"),
+        _rows_json(CONTRACTOR_COUNTS).label("by_contractor"),
+    )
+    row = (await session.execute(stmt)).one()
+
+    stats = build_task_stats(
+        (
+            (project_id, name, TaskStatus[status], count)
+            for project_id, name, status, count in row.by_project
+        ),
+        (
+            (contractor, name, email, TaskStatus[status], count)
+            for contractor, name, email, status, count in row.by_contractor
+        ),
+    )
+    return SDashboard(
+        today=today,
+        overdue_total=row.overdue_total,
+        overdue=[_json_task(task) for task in row.overdue],
+        upcoming=[_json_task(task) for task in row.upcoming],
+        stats=stats,
+    )
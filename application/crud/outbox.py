@@ -0,0 +1,147 @@
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import Integer, and_, any_, bindparam, delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.models import OutboxMessage, User
+from application.utils.emun_types import NotificationMode, OutboxEvent
+
+# Периодичность писем-сводок для режимов уведомлений
+DIGEST_INTERVALS = {
+    NotificationMode.HOURLY: timedelta(hours=1),
+    NotificationMode.DAILY: timedelta(days=1),
+}
+
+
+def digest_windows(coalesce_window: float) -> Dict[NotificationMode, timedelta]:
+    """
+    Окна объединения уведомлений для каждого режима: сообщения получателя
+    отправляются одной сводкой, когда самому раннему из них исполняется окно.
+
+    :param coalesce_window: Окно объединения для режима INSTANT (сек.).
+    :return: Словарь режим -> окно.
+    """
+    return {
+        NotificationMode.INSTANT: timedelta(seconds=coalesce_window),
+        **DIGEST_INTERVALS,
+    }
+
+
+# Запись сообщений в outbox
+async def add_outbox_messages(
+    session: AsyncSession, messages: List[Tuple[int, OutboxEvent, list]]
+) -> None:
+    """
+    Записывает сообщения в outbox одним запросом без коммита: сообщения
+    фиксируются той же транзакцией, что и изменение задачи.
+
+    :param session: Асинхронная сессия базы данных.
+    :param messages: Список троек (ID получателя, событие, аргументы события).
+    """
+    if messages:
+        await session.execute(
+            insert(OutboxMessage),
+            [
+                {"recipient": recipient, "event": event, "payload": payload}
+                for recipient, event, payload in messages
+            ],
+        )
+
+
+# Передача сводок outbox в очередь
+async def drain_outbox(
+    session: AsyncSession,
+    publish: Callable[[int, List[list]], Awaitable[None]],
+    batch_size: int,
+    windows: Dict[NotificationMode, timedelta],
+) -> int:
+    """
+    Объединяет сообщения outbox по получателю и передает в publish по одной
+    сводке на получателя, пачками примерно по batch_size сообщений.
+
+    Получатель готов к отправке, когда самому раннему его сообщению исполнилось
+    окно его режима уведомлений (windows). Сообщения блокируются через
+    SELECT ... FOR UPDATE SKIP LOCKED, поэтому несколько диспетчеров не получают
+    одни и те же сообщения; пачка дополняется остальными сообщениями ее получателей,
+    чтобы сводка не делилась на два письма. Сообщения удаляются в той же транзакции
+    после публикации: при сбое пачка будет отправлена повторно (доставка at-least-once).
+
+    :param session: Асинхронная сессия базы данных.
+    :param publish: Асинхронная функция публикации
+                    (ID получателя, список [событие, аргументы] в порядке записи).
+    :param batch_size: Количество сообщений в одной транзакции.
+    :param windows: Окна объединения по режимам уведомлений (см. digest_windows).
+    :return: Количество переданных сообщений.
+    """
+    due_recipients = (
+        select(OutboxMessage.recipient)
+        .join(User, User.id == OutboxMessage.recipient)
+        .group_by(OutboxMessage.recipient, User.notification_mode)
+        .having(
+            or_(
+                *[
+                    and_(
+                        User.notification_mode == mode,
+                        func.min(OutboxMessage.created_at) <= func.now() - window,
+                    )
+                    for mode, window in windows.items()
+                ]
+            )
+        )
+    )
+    columns = (
+        OutboxMessage.id,
+        OutboxMessage.recipient,
+        OutboxMessage.event,
+        OutboxMessage.payload,
+    )
+    batch = (
+        select(*columns)
+        .where(OutboxMessage.recipient.in_(due_recipients.scalar_subquery()))
+        .order_by(OutboxMessage.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    total = 0
+    while True:
+        rows = (await session.execute(batch)).all()
+        if not rows:
+            await session.commit()
+            return total
+
+        # Остальные сообщения получателей пачки, записанные позже ее последнего сообщения
+        rest = await session.execute(
+            select(*columns)
+            .where(
+                OutboxMessage.recipient
+                == any_(
+                    bindparam(
+                        "recipients",
+                        list({row.recipient for row in rows}),
+                        type_=ARRAY(Integer),
+                    )
+                ),
+                OutboxMessage.id > rows[-1].id,
+            )
+            .order_by(OutboxMessage.id)
+            .with_for_update(skip_locked=True)
+        )
+        rows += rest.all()
+
+        digests: Dict[int, List[list]] = {}
+        for row in rows:
+            digests.setdefault(row.recipient, []).append([row.event.value, row.payload])
+        for recipient, messages in digests.items():
+            await publish(recipient, messages)
+
+        ids = [row.id for row in rows]
+        await session.execute(
+            delete(OutboxMessage).where(
+                OutboxMessage.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+            )
+        )
+        await session.commit()
+        total += len(rows)
@@ -1,10 +1,26 @@
 from enum import Enum
+from typing import Optional
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, exists, false, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from application.core.models import Project
-from application.core.schemas.project import SProject
+from application.core.models import Project, Task, ProjectTaskCounter
+from application.core.schemas.pagination import SPage
+from application.core.schemas.project import SProject, SProjectDeletion
+from application.crud.statements import execute_filter_by
+from application.utils.pagination import paginate
+from application.utils.search import search_query, search_rank
+
+# Колонки проекта без служебного поискового вектора
+PROJECT_COLUMNS = [
+    column for column in Project.__table__.columns if column.key != "search_vector"
+]
+
+# Проекты, которые не удаляются в фоне
+ACTIVE_PROJECTS = Project.deleting == false()
+
+# Базовый запрос для поиска проекта по фильтрам
+PROJECT_SELECT = select(Project).where(ACTIVE_PROJECTS)
 
 
 # Добавление нового проекта в базу данных
@@ -35,8 +51,7 @@ async def get_project(session: AsyncSession, **data: dict):
     :param data: Словарь с фильтрами для поиска проекта (например, {'name': 'project_name'}).
     :return: Возвращает найденный проект или None, если проект не найден.
     """
-    stmt = select(Project).filter_by(**data)
-    project = await session.execute(stmt)
+    project = await execute_filter_by(session, PROJECT_SELECT, data)
 
     return project.one_or_none()
 
@@ -44,18 +59,62 @@ async def get_project(session: AsyncSession, **data: dict):
 # Получение всех проектов
 async def get_all_projects(session: AsyncSession):
     """
-    Возвращает список всех проектов в базе данных.
+    Возвращает список всех проектов в базе данных, кроме удаляемых.
 
     :param session: Асинхронная сессия базы данных.
     :return: Список всех проектов в виде отображений (mappings).
     """
-    stmt = select(Project.__table__.columns)
+    stmt = select(*PROJECT_COLUMNS).where(ACTIVE_PROJECTS)
     projects = await session.execute(stmt)
 
     # Возвращаем все проекты в виде списка отображений
     return projects.mappings().all()
 
 
+# Получение страницы проектов
+async def get_projects_page(
+    session: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> SPage:
+    """
+    Возвращает одну страницу проектов, отсортированных по id, кроме удаляемых.
+
+    :param session: Асинхронная сессия базы данных.
+    :param cursor: Курсор страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :return: Страница SPage с проектами в виде отображений (mappings).
+    """
+    stmt = select(*PROJECT_COLUMNS).where(ACTIVE_PROJECTS)
+    return await paginate(session, stmt, (Project.id,), cursor, limit)
+
+
+# Полнотекстовый поиск проектов
+async def search_projects(
+    session: AsyncSession,
+    text: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> SPage:
+    """
+    Ищет проекты по имени и описанию через GIN-индекс по search_vector.
+    Результаты упорядочены по убыванию релевантности (rank), при равенстве - по id.
+
+    :param session: Асинхронная сессия базы данных.
+    :param text: Строка поиска.
+    :param cursor: Курсор страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :return: Страница SPage с проектами и их релевантностью (поле rank).
+    """
+    query = search_query(text)
+    rank = search_rank(Project.search_vector, query)
+    # Ключ пагинации возрастает при убывании релевантности, в результат не попадает
+    rank_order = (-rank).label("rank_order")
+
+    stmt = select(*PROJECT_COLUMNS, rank.label("rank")).where(
+        Project.search_vector.bool_op("@@")(query), ACTIVE_PROJECTS
+    )
+    return await paginate(session, stmt, (rank_order, Project.id), cursor, limit)
+
+
 # Обновление проекта
 async def update_project(
     name_project: str, session: AsyncSession, date_update: SProject
@@ -82,19 +141,115 @@ async def update_project(
     return up_project.scalar_one_or_none()
 
 
-# Удаление проекта по id
-async def del_project(project_id: int, session: AsyncSession):
+# Запуск фонового удаления проекта
+async def mark_project_deleting(project_id: int, session: AsyncSession) -> bool:
     """
-    Удаляет проект по его идентификатору (id).
+    Помечает проект как удаляемый: он сразу пропадает из списков и поиска,
+    а задачи и сам проект удаляет фоновая задача (см. delete_project_tasks).
 
     :param project_id: ID проекта, который нужно удалить.
     :param session: Асинхронная сессия базы данных.
-    :return: Словарь с сообщением об успешном удалении.
+    :return: True, если проект существует (в том числе уже удаляется), иначе False.
     """
-    stmt = delete(Project).where(Project.id == project_id)
-
-    # Выполняем удаление и коммитим
-    await session.execute(stmt)
+    stmt = (
+        update(Project)
+        .where(Project.id == project_id)
+        .values(deleting=True)
+        .returning(Project.id)
+    )
+    result = await session.execute(stmt)
     await session.commit()
 
-    return {"message": "Проект успешно удален"}
+    return result.scalar_one_or_none() is not None
+
+
+# Удаление проекта с задачами пачками
+async def delete_project_tasks(
+    session: AsyncSession, project_id: int, batch_size: int
+) -> int:
+    """
+    Удаляет задачи проекта пачками по batch_size, каждую пачку в своей транзакции,
+    чтобы не держать блокировки на всех задачах проекта сразу. Счетчик
+    tasks_deleted проекта обновляется вместе с каждой пачкой. Когда задач
+    не остается, удаляются проект и его строки счетчиков задач. Новые задачи
+    в проект, помеченный на удаление, не добавляются (см. crud.tasks._active_projects).
+
+    :param session: Асинхронная сессия базы данных.
+    :param project_id: ID удаляемого проекта.
+    :param batch_size: Количество задач в одной пачке.
+    :return: Количество удаленных задач.
+    """
+    project_tasks = Task.project_id == project_id
+    deleted = 0
+    while True:
+        batch = select(Task.id).where(project_tasks).limit(batch_size)
+        stmt = (
+            delete(Task)
+            .where(project_tasks, Task.id.in_(batch.scalar_subquery()))
+            .returning(Task.id)
+        )
+        removed = len((await session.execute(stmt)).all())
+        if removed:
+            await session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(tasks_deleted=Project.tasks_deleted + removed)
+            )
+            await session.commit()
+            deleted += removed
+            continue
+
+        # Проект удаляется, только если за время удаления в него не добавили задач
+        removed_project = await session.execute(
+            delete(Project)
+            .where(Project.id == project_id, ~exists().where(project_tasks))
+            .returning(Project.id)
+        )
+        if removed_project.scalar_one_or_none() is None:
+            left = await session.execute(select(exists().where(project_tasks)))
+            if left.scalar():
+                await session.commit()
+                continue
+            # Задач нет, а проект не удален: его уже удалил предыдущий запуск задачи
+
+        # Строки счетчиков удаляются только вместе с проектом, иначе задачи,
+        # добавленные во время удаления, увели бы счетчики в минус
+        await session.execute(
+            delete(ProjectTaskCounter).where(ProjectTaskCounter.project_id == project_id)
+        )
+        await session.commit()
+        return deleted
+
+
+# Ход фонового удаления проекта
+async def get_project_deletion(
+    project_id: int, session: AsyncSession
+) -> Optional[SProjectDeletion]:
+    """
+    Возвращает ход удаления проекта. Оставшиеся задачи считаются по счетчикам задач.
+
+    :param project_id: ID проекта.
+    :param session: Асинхронная сессия базы данных.
+    :return: SProjectDeletion со статусом "deleting" или "deleted" (проекта нет),
+             или None, если проект существует и не удаляется.
+    """
+    tasks_left = (
+        select(func.coalesce(func.sum(ProjectTaskCounter.count), 0))
+        .where(ProjectTaskCounter.project_id == project_id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Project.deleting, Project.tasks_deleted, tasks_left.label("tasks_left")
+    ).where(Project.id == project_id)
+    project = (await session.execute(stmt)).one_or_none()
+
+    if project is None:
+        return SProjectDeletion(project_id=project_id, status="deleted")
+    if not project.deleting:
+        return None
+    return SProjectDeletion(
+        project_id=project_id,
+        status="deleting",
+        tasks_deleted=project.tasks_deleted,
+        tasks_left=project.tasks_left,
+    )
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import Select, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Кэш готовых запросов для универсальных CRUD-функций с фильтрами filter_by(**data)
+@lru_cache(maxsize=128)
+def filter_by_statement(base: Select, keys: Tuple[str, ...]) -> Select:
+    """
+    Возвращает запрос base.filter_by(...) с именованными параметрами вместо значений.
+
+    Запрос строится один раз для каждого набора полей фильтра, поэтому при
+    повторных вызовах SQLAlchemy не собирает выражение заново, а кэш компиляции
+    и кэш подготовленных запросов asyncpg получают один и тот же SQL.
+
+    :param base: Базовый запрос, объявленный на уровне модуля.
+    :param keys: Отсортированные имена полей фильтра.
+    :return: Запрос с параметрами, названными так же, как поля фильтра.
+    """
+    return base.filter_by(**{key: bindparam(key) for key in keys})
+
+
+async def execute_filter_by(session: AsyncSession, base: Select, data: dict):
+    """
+    Выполняет base.filter_by(**data) через закэшированный запрос.
+
+    Значения None не поддерживаются: сравнение с параметром не превращается в IS NULL.
+
+    :param session: Асинхронная сессия базы данных.
+    :param base: Базовый запрос, объявленный на уровне модуля.
+    :param data: Фильтры {поле: значение}.
+    :return: Результат выполнения запроса.
+    """
+    stmt = filter_by_statement(base, tuple(sorted(data)))
+    return await session.execute(stmt, data)
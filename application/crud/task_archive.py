@@ -0,0 +1,98 @@
+from datetime import date
+from typing import List, Set
+
+from sqlalchemy import select, update, func, text, false, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.models import Task
+from application.core.models.task import TaskStatus
+
+# Секция архива за год: имя и границы по сроку выполнения задачи
+ARCHIVE_PARTITION = (
+    "CREATE TABLE IF NOT EXISTS tasks_archive_{year} PARTITION OF tasks_archive "
+    "FOR VALUES FROM ('{year}-01-01') TO ('{next_year}-01-01')"
+)
+
+
+def _archivable(before: date) -> tuple:
+    """
+    Условия отбора задач для архивации: завершенные оперативные задачи со сроком до before.
+    """
+    return (
+        Task.archived == false(),
+        Task.status == TaskStatus.COMPLETED,
+        Task.date_to < before,
+    )
+
+
+# Создание годовых секций архива
+async def ensure_archive_partitions(session: AsyncSession, years: List[int]) -> None:
+    """
+    Создает секции архива для указанных лет, если их еще нет.
+
+    :param session: Асинхронная сессия базы данных.
+    :param years: Годы срока выполнения архивируемых задач.
+    """
+    for year in sorted(set(years)):
+        await session.execute(
+            text(ARCHIVE_PARTITION.format(year=int(year), next_year=int(year) + 1))
+        )
+    await session.commit()
+
+
+# Архивация завершенных задач
+async def archive_completed_tasks(
+    session: AsyncSession, before: date, batch_size: int
+) -> int:
+    """
+    Переносит завершенные задачи со сроком до before в архивные секции.
+
+    Задачи переносятся пачками по batch_size, каждая пачка в своей транзакции:
+    изменение archived перемещает строку в секцию архива, а строки, заблокированные
+    другими транзакциями, пропускаются до следующего запуска. Секции архива
+    создаются по годам заблокированной пачки перед ее переносом, поэтому задачи,
+    завершенные или измененные во время архивации, тоже попадают в свои секции.
+
+    :param session: Асинхронная сессия базы данных.
+    :param before: Архивируются задачи со сроком выполнения раньше этой даты.
+    :param batch_size: Количество задач в одной пачке.
+    :return: Количество перенесенных задач.
+    """
+    year = func.extract("year", Task.date_to).cast(Integer)
+    known_years: Set[int] = set()
+    archived = 0
+    while True:
+        batch = (
+            await session.execute(
+                select(Task.id, year)
+                .where(*_archivable(before))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+
+        # Новая секция создается в своей транзакции (блокировки пачки снимаются),
+        # после чего пачка выбирается заново
+        new_years = {task_year for _, task_year in batch} - known_years
+        if new_years:
+            await ensure_archive_partitions(session, list(new_years))
+            known_years |= new_years
+            continue
+
+        if batch:
+            task_ids = [task_id for task_id, _ in batch]
+            stmt = (
+                update(Task)
+                .where(
+                    Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+                    *_archivable(before),
+                )
+                .values(archived=True)
+                .returning(Task.id)
+            )
+            archived += len((await session.execute(stmt)).all())
+        await session.commit()
+
+        if len(batch) < batch_size:
+            return archived
@@ -0,0 +1,146 @@
+from typing import Iterable
+
+from sqlalchemy import select, delete, exists, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.models import (
+    Task,
+    Project,
+    User,
+    ProjectTaskCounter,
+    ContractorTaskCounter,
+)
+from application.core.models.task import TaskStatus
+from application.core.schemas.task import (
+    STaskCounts,
+    STaskStats,
+    SProjectTaskStats,
+    SContractorTaskStats,
+)
+
+
+def _add_count(stats: STaskCounts, status: TaskStatus, count: int) -> None:
+    """
+    Добавляет количество задач в статусе к статистике.
+    """
+    stats.counts[status.value] = stats.counts.get(status.value, 0) + count
+    stats.total += count
+
+
+# Ненулевые счетчики по проектам: (id проекта, название, статус, количество)
+PROJECT_COUNTS = (
+    select(
+        ProjectTaskCounter.project_id,
+        Project.name,
+        ProjectTaskCounter.status,
+        ProjectTaskCounter.count,
+    )
+    .join(Project, Project.id == ProjectTaskCounter.project_id)
+    .where(ProjectTaskCounter.count > 0)
+    .order_by(ProjectTaskCounter.project_id)
+)
+
+# Ненулевые счетчики по исполнителям: (id исполнителя, имя, email, статус, количество)
+CONTRACTOR_COUNTS = (
+    select(
+        ContractorTaskCounter.contractor,
+        User.name,
+        User.email,
+        ContractorTaskCounter.status,
+        ContractorTaskCounter.count,
+    )
+    .join(User, User.id == ContractorTaskCounter.contractor)
+    .where(ContractorTaskCounter.count > 0)
+    .order_by(ContractorTaskCounter.contractor)
+)
+
+
+def build_task_stats(project_rows: Iterable, contractor_rows: Iterable) -> STaskStats:
+    """
+    Собирает статистику задач из строк PROJECT_COUNTS и CONTRACTOR_COUNTS.
+
+    :param project_rows: Строки (id проекта, название, статус, количество).
+    :param contractor_rows: Строки (id исполнителя, имя, email, статус, количество).
+    :return: Схема STaskStats.
+    """
+    stats = STaskStats()
+
+    projects = {}
+    for project_id, name, status, count in project_rows:
+        project = projects.setdefault(
+            project_id, SProjectTaskStats(project_id=project_id, project_name=name)
+        )
+        _add_count(project, status, count)
+        _add_count(stats, status, count)
+    stats.by_project = list(projects.values())
+
+    contractors = {}
+    for contractor, name, email, status, count in contractor_rows:
+        contractor_stats = contractors.setdefault(
+            contractor,
+            SContractorTaskStats(contractor=contractor, name=name, email=email),
+        )
+        _add_count(contractor_stats, status, count)
+    stats.by_contractor = list(contractors.values())
+
+    return stats
+
+
+# Получение статистики задач
+async def get_task_stats(session: AsyncSession) -> STaskStats:
+    """
+    Возвращает количество задач по статусам: в целом, по проектам и по исполнителям.
+    Читает только таблицы счетчиков, поэтому стоимость зависит от количества
+    проектов и исполнителей, а не от количества задач.
+
+    :param session: Асинхронная сессия базы данных.
+    :return: Схема STaskStats.
+    """
+    project_rows = await session.execute(PROJECT_COUNTS)
+    contractor_rows = await session.execute(CONTRACTOR_COUNTS)
+    return build_task_stats(project_rows, contractor_rows)
+
+
+# Сверка счетчиков задач с таблицей tasks
+async def reconcile_task_counters(session: AsyncSession) -> int:
+    """
+    Пересчитывает счетчики задач по таблице tasks и исправляет расхождения.
+
+    На время пересчета таблица tasks блокируется от записи (чтение не блокируется),
+    чтобы изменения, сделанные триггерами параллельно с пересчетом, не были потеряны.
+
+    :param session: Асинхронная сессия базы данных.
+    :return: Количество исправленных счетчиков.
+    """
+    await session.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+
+    fixed = 0
+    for counter, key in (
+        (ProjectTaskCounter, Task.project_id),
+        (ContractorTaskCounter, Task.contractor),
+    ):
+        counter_key = getattr(counter, key.key)
+
+        # Фактическое количество задач: вставка недостающих и исправление неверных счетчиков
+        actual = select(key, Task.status, func.count()).group_by(key, Task.status)
+        upsert = insert(counter).from_select([key.key, "status", "count"], actual)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[key.key, "status"],
+            set_={"count": upsert.excluded.count},
+            where=counter.count != upsert.excluded.count,
+        ).returning(counter.id)
+        fixed += len((await session.execute(upsert)).all())
+
+        # Счетчики, для которых задач больше нет
+        stale = (
+            delete(counter)
+            .where(
+                ~exists().where(key == counter_key, Task.status == counter.status)
+            )
+            .returning(counter.count)
+        )
+        fixed += sum(1 for count in (await session.execute(stale)).scalars() if count)
+
+    await session.commit()
+    return fixed
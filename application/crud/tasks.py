@@ -1,108 +1,424 @@
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select, update, delete
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    insert,
+    func,
+    bindparam,
+    any_,
+    cast,
+    false,
+    or_,
+    Integer,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.core.exception.base_exception import ProjectUnavailableError
 from application.core.models import Task, User, Project
+from application.core.models.task import TaskStatus, TypeTask
+from application.core.schemas.pagination import SPage
 from application.core.schemas.task import (
-    SChangeTask,
     SMyTask,
     SBaseTask,
+    STaskCreateForm,
+)
+from application.crud.outbox import add_outbox_messages
+from application.crud.projects import ACTIVE_PROJECTS
+from application.crud.statements import execute_filter_by
+from application.utils.bulk_tasks import group_by_contractor
+from application.utils.emun_types import OutboxEvent
+from application.utils.pagination import paginate
+from application.utils.search import search_query, search_rank
+
+# Колонки задачи без служебного поискового вектора
+TASK_COLUMNS = [
+    column for column in Task.__table__.columns if column.key != "search_vector"
+]
+
+# Условие выборки только оперативных задач: планировщик исключает архивные секции
+HOT_TASKS = Task.archived == false()
+
+# Базовые запросы для поиска задачи по фильтрам: оперативные задачи и все задачи с архивом
+TASK_SELECT = select(*TASK_COLUMNS).where(HOT_TASKS).order_by(Task.date_to)
+TASK_SELECT_WITH_ARCHIVE = select(*TASK_COLUMNS).order_by(Task.date_to)
+
+# Задача с email исполнителя и названием проекта
+TASK_DETAILS_SELECT = (
+    select(
+        User.email.label("contractor_email"),
+        Project.name.label("project_name"),
+        Task.id,
+        Task.name,
+        Task.project_id,
+        Task.description,
+        Task.date_from,
+        Task.date_to,
+        Task.contractor,
+        Task.type_task,
+        Task.status,
+        Task.version,
+    )
+    .join(User, Task.contractor == User.id)
+    .join(Project, Task.project_id == Project.id)
 )
 
 
+def _archive_filter(include_archive: bool) -> tuple:
+    """
+    Возвращает условия WHERE, ограничивающие выборку оперативными задачами,
+    или пустой кортеж, если нужно читать и архив.
+    """
+    return () if include_archive else (HOT_TASKS,)
+
+
+def _active_projects(project_ids: List[int]):
+    """
+    Строит выборку проектов из project_ids, которые не удаляются в фоне,
+    с блокировкой FOR SHARE. Пометка проекта на удаление (mark_project_deleting)
+    ждет завершения транзакций, добавляющих в него задачи, а после пометки
+    задачи в проект не добавляются и не переносятся.
+    """
+    return (
+        select(Project.id)
+        .where(
+            Project.id == any_(bindparam("project_ids", project_ids, type_=ARRAY(Integer))),
+            ACTIVE_PROJECTS,
+        )
+        .with_for_update(read=True)
+    )
+
+
+def _select_inserted_with_details(inserted):
+    """
+    Строит выборку из CTE с INSERT ... RETURNING, дополняя созданные задачи
+    email исполнителя и названием проекта.
+    """
+    return (
+        select(
+            inserted,
+            User.email.label("contractor_email"),
+            Project.name.label("project_name"),
+        )
+        .join(User, inserted.c.contractor == User.id)
+        .join(Project, inserted.c.project_id == Project.id)
+        .order_by(inserted.c.id)
+    )
+
+
 # Функция для добавления новой задачи
-async def add_task(data_task: SBaseTask, session: AsyncSession) -> Task:
+async def add_task(data_task: SBaseTask, session: AsyncSession):
     """
-    Добавляет новую задачу в базу данных.
+    Добавляет новую задачу в базу данных и за тот же запрос возвращает ее
+    вместе с email исполнителя и названием проекта (INSERT ... RETURNING в CTE).
+    Задача вставляется, только если проект существует и не удаляется.
+    Уведомление исполнителю записывается в outbox в той же транзакции.
 
     :param data_task: Схема SBaseTask с данными задачи.
     :param session: Асинхронная сессия базы данных.
-    :return: Возвращает созданную задачу.
+    :return: Созданная задача с полями contractor_email и project_name.
+    :raises ProjectUnavailableError: Проект не существует или удаляется.
     """
-    task = Task(**data_task.model_dump())
-    session.add(task)
+    data = data_task.model_dump()
+    types = {column: Task.__table__.c[column].type for column in data}
+    values = select(
+        *[
+            cast(bindparam(column, value, type_=types[column]), types[column])
+            for column, value in data.items()
+        ]
+    ).where(_active_projects([data["project_id"]]).exists())
+    inserted = (
+        insert(Task)
+        .from_select(list(data), values)
+        .returning(*TASK_COLUMNS)
+        .cte("inserted")
+    )
+    result = await session.execute(_select_inserted_with_details(inserted))
+    task = result.one_or_none()
+    if task is None:
+        await session.rollback()
+        raise ProjectUnavailableError
+    await add_outbox_messages(
+        session, [(task.contractor, OutboxEvent.TASK_CREATED, [task.id])]
+    )
     await session.commit()
     return task
 
 
-# Получение всех задач
-async def get_all_tasks(session: AsyncSession) -> list:
+# Массовое добавление задач
+async def add_tasks_bulk(
+    data_tasks: List[STaskCreateForm], session: AsyncSession
+) -> list:
     """
-    Возвращает все задачи.
+    Добавляет список задач одним запросом INSERT ... SELECT FROM unnest(...) RETURNING.
 
+    Каждая колонка передается одним параметром-массивом, поэтому количество
+    параметров запроса не зависит от количества задач. Созданные задачи сразу
+    дополняются email исполнителя и названием проекта. В той же транзакции
+    в outbox записывается одно уведомление на исполнителя со всеми его задачами.
+    Если хотя бы один проект не существует или удаляется, задачи не добавляются.
+
+    :param data_tasks: Список схем STaskCreateForm с данными задач.
     :param session: Асинхронная сессия базы данных.
-    :return: Список задач в виде отображений (mappings).
+    :return: Список созданных задач в виде отображений (mappings)
+             с полями contractor_email и project_name.
+    :raises ProjectUnavailableError: Проект одной из задач не существует или удаляется.
     """
-    stmt = select(Task.__table__.columns)
-    tasks = await session.execute(stmt)
-    return tasks.mappings().all()
+    columns = list(STaskCreateForm.model_fields)
+    arrays = [
+        bindparam(
+            column,
+            [getattr(task, column) for task in data_tasks],
+            type_=ARRAY(Task.__table__.c[column].type),
+        )
+        for column in columns
+    ]
+    rows = func.unnest(*arrays).table_valued(*columns).render_derived()
+    active = _active_projects(
+        sorted({task.project_id for task in data_tasks})
+    ).subquery("active_projects")
+
+    inserted = (
+        insert(Task)
+        .from_select(
+            columns,
+            select(*rows.c).join(active, active.c.id == rows.c.project_id),
+        )
+        .returning(*TASK_COLUMNS)
+        .cte("inserted")
+    )
+    result = await session.execute(_select_inserted_with_details(inserted))
+    tasks = result.mappings().all()
+    if len(tasks) < len(data_tasks):
+        await session.rollback()
+        raise ProjectUnavailableError
+    await add_outbox_messages(
+        session,
+        [
+            (
+                contractor_tasks[0]["contractor"],
+                OutboxEvent.TASKS_CREATED,
+                [[task["id"] for task in contractor_tasks]],
+            )
+            for contractor_tasks in group_by_contractor(tasks).values()
+        ],
+    )
+    await session.commit()
+    return tasks
+
+
+# Получение страницы задач
+async def get_tasks_page(
+    session: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    include_archive: bool = False,
+) -> SPage:
+    """
+    Возвращает одну страницу задач, отсортированных по (date_to, id).
+
+    :param session: Асинхронная сессия базы данных.
+    :param cursor: Курсор страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :param include_archive: Включать архивные задачи.
+    :return: Страница SPage с задачами в виде отображений (mappings).
+    """
+    stmt = select(*TASK_COLUMNS).where(*_archive_filter(include_archive))
+    return await paginate(session, stmt, (Task.date_to, Task.id), cursor, limit)
+
+
+# Полнотекстовый поиск задач
+async def search_tasks(
+    session: AsyncSession,
+    text: str,
+    status: Optional[TaskStatus] = None,
+    type_task: Optional[TypeTask] = None,
+    contractor: Optional[int] = None,
+    project_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    include_archive: bool = False,
+) -> SPage:
+    """
+    Ищет задачи по имени и описанию через GIN-индекс по search_vector.
+    Результаты упорядочены по убыванию релевантности (rank), при равенстве - по id.
+
+    :param session: Асинхронная сессия базы данных.
+    :param text: Строка поиска.
+    :param status: Фильтр по статусу.
+    :param type_task: Фильтр по типу задачи.
+    :param contractor: Фильтр по исполнителю.
+    :param project_id: Фильтр по проекту.
+    :param cursor: Курсор страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :param include_archive: Включать архивные задачи.
+    :return: Страница SPage с задачами и их релевантностью (поле rank).
+    """
+    query = search_query(text)
+    rank = search_rank(Task.search_vector, query)
+    # Ключ пагинации возрастает при убывании релевантности, в результат не попадает
+    rank_order = (-rank).label("rank_order")
+
+    stmt = select(*TASK_COLUMNS, rank.label("rank")).where(
+        Task.search_vector.bool_op("@@")(query), *_archive_filter(include_archive)
+    )
+    filters = {
+        "status": status,
+        "type_task": type_task,
+        "contractor": contractor,
+        "project_id": project_id,
+    }
+    stmt = stmt.filter_by(
+        **{key: value for key, value in filters.items() if value is not None}
+    )
+    return await paginate(session, stmt, (rank_order, Task.id), cursor, limit)
+
+
+# Потоковая выгрузка задач
+async def stream_tasks(
+    session: AsyncSession,
+    chunk_size: int,
+    project_id: Optional[int] = None,
+    contractor: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_archive: bool = False,
+) -> AsyncIterator[list]:
+    """
+    Читает задачи через серверный курсор и отдает их частями,
+    не загружая всю выборку в память.
+
+    :param session: Асинхронная сессия базы данных.
+    :param chunk_size: Количество строк, получаемых из курсора за один раз.
+    :param project_id: Фильтр по проекту.
+    :param contractor: Фильтр по исполнителю.
+    :param status: Фильтр по статусу.
+    :param date_from: Задачи, начинающиеся не раньше этой даты.
+    :param date_to: Задачи, завершающиеся не позже этой даты.
+    :param include_archive: Включать архивные задачи.
+    :return: Асинхронный итератор списков задач в виде отображений (mappings)
+             с полями contractor_email и project_name.
+    """
+    stmt = (
+        select(
+            *TASK_COLUMNS,
+            User.email.label("contractor_email"),
+            Project.name.label("project_name"),
+        )
+        .join(User, Task.contractor == User.id)
+        .join(Project, Task.project_id == Project.id)
+        .where(*_archive_filter(include_archive))
+        .order_by(Task.date_to, Task.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    if contractor is not None:
+        stmt = stmt.where(Task.contractor == contractor)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if date_from is not None:
+        stmt = stmt.where(Task.date_from >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Task.date_to <= date_to)
+
+    result = await session.stream(stmt)
+    async for rows in result.mappings().partitions():
+        yield rows
 
 
 # Получение задачи по фильтрам
-async def get_task(session: AsyncSession, **data: dict) -> Task:
+async def get_task(
+    session: AsyncSession, include_archive: bool = False, **data: dict
+) -> Task:
     """
     Возвращает одну задачу по фильтрам (например, по id или другим параметрам).
 
     :param session: Асинхронная сессия базы данных.
+    :param include_archive: Искать и среди архивных задач.
     :param data: Фильтры для поиска задачи.
     :return: Найденная задача или None.
     """
-    stmt = select(Task.__table__.columns).filter_by(**data).order_by(Task.date_to)
-    task = await session.execute(stmt)
+    base = TASK_SELECT_WITH_ARCHIVE if include_archive else TASK_SELECT
+    task = await execute_filter_by(session, base, data)
     return task.mappings().one_or_none()
 
 
 # Получение задач по проекту
-async def get_tasks_by_project(project_id: int, session: AsyncSession) -> list:
+async def get_tasks_by_project(
+    project_id: int, session: AsyncSession, include_archive: bool = False
+) -> list:
     """
     Возвращает задачи по ID проекта.
 
     :param project_id: ID проекта.
     :param session: Асинхронная сессия базы данных.
+    :param include_archive: Включать архивные задачи.
     :return: Список задач проекта.
     """
-    stmt = select(Task.__table__.columns).where(Task.project_id == project_id)
+    stmt = (
+        select(*TASK_COLUMNS)
+        .where(Task.project_id == project_id, *_archive_filter(include_archive))
+        .order_by(Task.date_to)
+    )
     tasks = await session.execute(stmt)
     return tasks.mappings().all()
 
 
 # Получение задачи по ID
-async def get_task_by_id(task_id: int, session: AsyncSession) -> dict:
+async def get_task_by_id(
+    task_id: int, session: AsyncSession, include_archive: bool = False
+) -> dict:
     """
     Возвращает задачу по ее ID, включая информацию о проекте и исполнителе.
 
     :param task_id: ID задачи.
     :param session: Асинхронная сессия базы данных.
+    :param include_archive: Искать и среди архивных задач.
     :return: Словарь с данными задачи, проекта и исполнителя или None.
     """
-    stmt = (
-        select(
-            User.email.label("contractor_email"),
-            Project.name.label("project_name"),
-            Task.id,
-            Task.name,
-            Task.description,
-            Task.date_from,
-            Task.date_to,
-            Task.type_task,
-            Task.status,
-        )
-        .join(User, Task.contractor == User.id)
-        .join(Project, Task.project_id == Project.id)
-        .where(Task.id == task_id)
-        .order_by(Task.date_to)
-    )
+    stmt = TASK_DETAILS_SELECT.where(
+        Task.id == task_id, *_archive_filter(include_archive)
+    ).order_by(Task.date_to)
     result = await session.execute(stmt)
     return result.one_or_none()
 
 
+# Получение задач по списку ID
+async def get_tasks_by_ids(task_ids: List[int], session: AsyncSession) -> list:
+    """
+    Возвращает оперативные задачи по списку ID одним запросом (WHERE id = ANY(...)),
+    включая информацию о проекте и исполнителе. Используется фоновыми задачами,
+    которые получают через брокер только ID.
+
+    :param task_ids: Список ID задач.
+    :param session: Асинхронная сессия базы данных.
+    :return: Список найденных задач, упорядоченный по ID.
+    """
+    stmt = TASK_DETAILS_SELECT.where(
+        Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+        HOT_TASKS,
+    ).order_by(Task.id)
+    result = await session.execute(stmt)
+    return result.all()
+
+
 # Получение задач пользователя
-async def get_my_tasks(user_id: int, session: AsyncSession) -> list:
+async def get_my_tasks(
+    user_id: int, session: AsyncSession, include_archive: bool = False
+) -> list:
     """
     Возвращает все задачи, назначенные на пользователя.
 
     :param user_id: ID пользователя.
     :param session: Асинхронная сессия базы данных.
+    :param include_archive: Включать архивные задачи.
     :return: Список задач пользователя.
     """
     stmt = (
@@ -113,7 +429,7 @@ async def get_my_tasks(user_id: int, session: AsyncSession) -> list:
         )
         .join(User, Task.contractor == User.id)
         .join(Project, Task.project_id == Project.id)
-        .where(Task.contractor == user_id)
+        .where(Task.contractor == user_id, *_archive_filter(include_archive))
         .order_by(Task.date_to)
     )
     result = await session.execute(stmt)
@@ -130,61 +446,233 @@ async def get_my_tasks(user_id: int, session: AsyncSession) -> list:
     return tasks
 
 
-# Изменение статуса задачи
-async def change_status_task(
-    task_id: int, user_id: int, session: AsyncSession, **data: dict
-) -> Task:
+# Принятие задачи в работу
+async def accept_task(
+    task_id: int, user_id: int, session: AsyncSession
+) -> Tuple[Optional[Row], list]:
     """
-    Изменяет статус задачи для исполнителя.
+    Переводит задачу исполнителя в статус "В работе" и в том же запросе
+    возвращает обновленный список его задач.
+
+    UPDATE ... RETURNING выполняется в CTE и одновременно проверяет, что задача
+    принадлежит пользователю. Основной запрос видит данные до обновления,
+    поэтому новые статус и версия подставляются из CTE. Уведомление о принятии
+    записывается в outbox в той же транзакции.
 
     :param task_id: ID задачи.
     :param user_id: ID исполнителя (контрактора).
     :param session: Асинхронная сессия базы данных.
-    :param data: Данные для обновления (статус задачи).
-    :return: Обновленная задача.
+    :return: Кортеж из принятой задачи с полями contractor_email и project_name
+             (None, если задача не найдена или не принадлежит пользователю)
+             и списка задач пользователя в том же виде, что и get_my_tasks.
+    """
+    updated = (
+        update(Task)
+        .where(Task.id == task_id, Task.contractor == user_id, HOT_TASKS)
+        .values(status=TaskStatus.IN_PROGRESS, version=Task.version + 1)
+        .returning(Task.id, Task.status, Task.version)
+        .cte("updated")
+    )
+    stmt = (
+        select(
+            *[
+                column
+                for column in TASK_COLUMNS
+                if column.key not in ("status", "version")
+            ],
+            func.coalesce(updated.c.status, Task.status).label("status"),
+            func.coalesce(updated.c.version, Task.version).label("version"),
+            User.email.label("contractor_email"),
+            Project.name.label("project_name"),
+            updated.c.id.is_not(None).label("accepted"),
+        )
+        .join(User, Task.contractor == User.id)
+        .join(Project, Task.project_id == Project.id)
+        .outerjoin(updated, updated.c.id == Task.id)
+        .where(Task.contractor == user_id, HOT_TASKS)
+        .order_by(Task.date_to)
+    )
+    result = await session.execute(stmt)
+    rows = result.all()
+    accepted = next((row for row in rows if row.accepted), None)
+    if accepted is not None:
+        await add_outbox_messages(
+            session, [(user_id, OutboxEvent.TASK_ACCEPTED, [task_id])]
+        )
+    await session.commit()
+
+    tasks = [
+        jsonable_encoder({k: v for k, v in row._mapping.items() if k != "accepted"})
+        for row in rows
+    ]
+    return accepted, tasks
+
+
+# Пакетное изменение статуса задач
+async def change_status_tasks(
+    task_ids: List[int], user_id: int, status: TaskStatus, session: AsyncSession
+) -> List[int]:
+    """
+    Изменяет статус нескольких задач исполнителя одним запросом
+    UPDATE ... WHERE id = ANY(:ids) AND contractor = :user_id RETURNING id.
+    Архивные задачи не изменяются. Уведомление об изменении каждой задачи
+    записывается в outbox в той же транзакции.
+
+    :param task_ids: Список ID задач.
+    :param user_id: ID исполнителя (контрактора).
+    :param status: Новый статус задач.
+    :param session: Асинхронная сессия базы данных.
+    :return: Список ID задач, статус которых был изменен.
     """
     stmt = (
         update(Task)
-        .filter_by(id=task_id, contractor=user_id)
-        .values(**data)
-        .returning(Task)
+        .where(
+            Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+            Task.contractor == user_id,
+            HOT_TASKS,
+        )
+        .values(status=status, version=Task.version + 1)
+        .returning(Task.id)
+    )
+    result = await session.execute(stmt)
+    applied = result.scalars().all()
+    await add_outbox_messages(
+        session,
+        [(user_id, OutboxEvent.TASK_CHANGED, [task_id, ["status"]]) for task_id in applied],
     )
-    up_task = await session.execute(stmt)
     await session.commit()
-    return up_task.scalar()
+    return applied
+
+
+async def _lock_target_project(changes: Dict[str, Any], session: AsyncSession) -> None:
+    """
+    Если задача переносится в другой проект, блокирует этот проект (см. _active_projects)
+    до конца транзакции.
+
+    :raises ProjectUnavailableError: Проект не существует или удаляется.
+    """
+    if "project_id" not in changes:
+        return
+    project = await session.execute(_active_projects([changes["project_id"]]))
+    if project.scalar_one_or_none() is None:
+        await session.rollback()
+        raise ProjectUnavailableError
 
 
 # Обновление задачи
 async def update_task(
-    task_id: int, data_task: SChangeTask, session: AsyncSession
-) -> Task:
+    task_id: int,
+    changes: Dict[str, Any],
+    session: AsyncSession,
+    version: Optional[int] = None,
+) -> Optional[Task]:
     """
-    Обновляет задачу по ее ID.
+    Обновляет только переданные поля задачи и увеличивает ее версию.
+    Уведомление об изменении записывается в outbox в той же транзакции.
+    Архивные задачи не изменяются.
 
     :param task_id: ID задачи.
-    :param data_task: Данные для обновления.
+    :param changes: Измененные поля {поле: новое значение} (см. detect_changes).
     :param session: Асинхронная сессия базы данных.
-    :return: Обновленная задача.
+    :param version: Ожидаемая версия задачи: если задача уже изменена, она не обновляется.
+    :return: Обновленная задача или None, если задача не найдена или версия не совпала.
+    :raises ProjectUnavailableError: Задача переносится в несуществующий или удаляемый проект.
     """
+    await _lock_target_project(changes, session)
+    stmt = update(Task).filter_by(id=task_id).where(HOT_TASKS)
+    if version is not None:
+        stmt = stmt.where(Task.version == version)
+    stmt = stmt.values(**changes, version=Task.version + 1).returning(Task)
+
+    up_task = (await session.execute(stmt)).scalar_one_or_none()
+    if up_task is not None:
+        await add_outbox_messages(
+            session,
+            [(up_task.contractor, OutboxEvent.TASK_CHANGED, [task_id, list(changes)])],
+        )
+    await session.commit()
+    return up_task
+
+
+# Условное обновление задачи по версии
+async def update_task_if_match(
+    task_id: int, changes: Dict[str, Any], version: int, session: AsyncSession
+) -> Optional[Row]:
+    """
+    Обновляет задачу одним запросом без предварительного чтения, если ее версия
+    равна version и хотя бы одно из полей changes отличается от текущего значения.
+
+    Текущие значения полей блокируются и читаются в CTE, поэтому запрос
+    возвращает и новую задачу, и прежние значения (old_<поле>). Уведомление
+    со списком действительно изменившихся полей записывается в outbox
+    в той же транзакции.
+
+    :param task_id: ID задачи.
+    :param changes: Новые значения полей {поле: значение}.
+    :param version: Ожидаемая версия задачи (из заголовка If-Match).
+    :param session: Асинхронная сессия базы данных.
+    :return: Обновленная задача с полями contractor_email и old_<поле> или None,
+             если задача не найдена, версия не совпала или значения не изменились.
+    :raises ProjectUnavailableError: Задача переносится в несуществующий или удаляемый проект.
+    """
+    if not changes:
+        return None
+    await _lock_target_project(changes, session)
+
+    current = (
+        select(
+            Task.id,
+            User.email.label("contractor_email"),
+            *[Task.__table__.c[field] for field in changes],
+        )
+        .join(User, Task.contractor == User.id)
+        .where(Task.id == task_id, HOT_TASKS, Task.version == version)
+        .with_for_update(of=Task)
+        .cte("current_task")
+    )
     stmt = (
         update(Task)
-        .filter_by(id=task_id)
-        .values(data_task.model_dump())
-        .returning(Task)
+        .where(
+            Task.id == current.c.id,
+            HOT_TASKS,
+            or_(
+                *[
+                    current.c[field].is_distinct_from(value)
+                    for field, value in changes.items()
+                ]
+            ),
+        )
+        .values(**changes, version=Task.version + 1)
+        .returning(
+            *TASK_COLUMNS,
+            current.c.contractor_email,
+            *[current.c[field].label(f"old_{field}") for field in changes],
+        )
+        .execution_options(synchronize_session=False)
     )
-    up_task = await session.execute(stmt)
+    result = await session.execute(stmt)
+    task = result.one_or_none()
+    if task is not None:
+        changed = [
+            field
+            for field, value in changes.items()
+            if task._mapping[f"old_{field}"] != value
+        ]
+        await add_outbox_messages(
+            session, [(task.contractor, OutboxEvent.TASK_CHANGED, [task_id, changed])]
+        )
     await session.commit()
-    return up_task.scalar()
+    return task
 
 
 # Удаление задачи
 async def remove_task(task_id: int, session: AsyncSession):
     """
-    Удаляет задачу по ее ID.
+    Удаляет задачу по ее ID. Архивные задачи удаляются только вместе с проектом.
 
     :param task_id: ID задачи.
     :param session: Асинхронная сессия базы данных.
     """
-    stmt = delete(Task).where(Task.id == task_id)
+    stmt = delete(Task).where(Task.id == task_id, HOT_TASKS)
     await session.execute(stmt)
     await session.commit()
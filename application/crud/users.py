@@ -1,10 +1,35 @@
-from sqlalchemy import select
+from typing import Optional
+
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.core.config import settings
 from application.core.models import User
 from application.core.models.user import PositionType
+from application.core.schemas.pagination import SPage
 from application.core.schemas.user import SUserCreate, SUser
-from application.utils.auth_user import get_password_hash
+from application.utils.auth_user import get_password_hash_async
+from application.crud.statements import execute_filter_by
+from application.utils.cache import TTLCache
+from application.utils.emun_types import NotificationMode
+from application.utils.pagination import paginate
+
+# Базовый запрос для поиска пользователя по фильтрам
+USER_SELECT = select(User.__table__.columns)
+
+# Кэш пользователей по id для проверки авторизации (свой в каждом процессе)
+user_cache = TTLCache(
+    ttl=settings.auth_user_cache_ttl, maxsize=settings.auth_user_cache_size
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Удаляет пользователя из кэша. Вызывается при любом изменении пользователя.
+
+    :param user_id: ID пользователя.
+    """
+    user_cache.pop(user_id)
 
 
 # Добавление нового пользователя в базу данных
@@ -21,8 +46,8 @@ async def add_user(
     :param session: Асинхронная сессия базы данных.
     :return: Возвращает созданного пользователя.
     """
-    # Хэшируем пароль перед сохранением
-    hash_password = get_password_hash(password)
+    # Хэшируем пароль перед сохранением (в пуле потоков, не блокируя цикл событий)
+    hash_password = await get_password_hash_async(password)
 
     # Создаем объект пользователя
     user = User(
@@ -48,11 +73,47 @@ async def get_user(session: AsyncSession, **data: dict):
     :param data: Фильтры для поиска пользователя.
     :return: Найденный пользователь или None.
     """
-    stmt = select(User.__table__.columns).filter_by(**data)
-    user = await session.execute(stmt)
+    user = await execute_filter_by(session, USER_SELECT, data)
     return user.mappings().one_or_none()
 
 
+# Получение пользователя по id через кэш
+async def get_user_cached(session: AsyncSession, user_id: int):
+    """
+    Возвращает пользователя по id из кэша user_cache, а при промахе - из базы данных.
+    Данные могут отставать от базы не более чем на settings.auth_user_cache_ttl секунд.
+
+    :param session: Асинхронная сессия базы данных.
+    :param user_id: ID пользователя.
+    :return: Найденный пользователь или None (отсутствие пользователя не кэшируется).
+    """
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await get_user(session, id=user_id)
+        if user is not None:
+            user_cache.set(user_id, user)
+    return user
+
+
+# Изменение режима email уведомлений пользователя
+async def set_notification_mode(
+    user_id: int, mode: NotificationMode, session: AsyncSession
+) -> None:
+    """
+    Сохраняет режим email уведомлений пользователя: сразу или сводкой раз в час / сутки.
+    Уже накопленные уведомления отправляются по новому режиму.
+
+    :param user_id: ID пользователя.
+    :param mode: Режим уведомлений.
+    :param session: Асинхронная сессия базы данных.
+    """
+    await session.execute(
+        update(User).where(User.id == user_id).values(notification_mode=mode)
+    )
+    await session.commit()
+    invalidate_user(user_id)
+
+
 # Получение профиля текущего пользователя по его ID
 async def get_my_profile(user_id: int, session: AsyncSession):
     """
@@ -78,3 +139,21 @@ async def get_users(session: AsyncSession):
     stmt = select(User).where(User.is_director == False)
     user = await session.execute(stmt)
     return user.scalars().all()
+
+
+# Получение страницы пользователей, которые не являются директорами
+async def get_users_page(
+    session: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> SPage:
+    """
+    Возвращает одну страницу пользователей (не директоров), отсортированных по id.
+
+    :param session: Асинхронная сессия базы данных.
+    :param cursor: Курсор страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :return: Страница SPage с пользователями в виде отображений (mappings).
+    """
+    stmt = select(
+        User.id, User.name, User.email, User.position, User.is_director
+    ).where(User.is_director == False)
+    return await paginate(session, stmt, (User.id,), cursor, limit)
@@ -1,13 +1,17 @@
+import asyncio
+import math
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
 from application.api.view_auth import router as router_auth
 from application.api.view_user import router as router_user
 from application.api.view_project import router as router_project
 from application.api.view_tasks import router as router_task
-from application.core.models.db_helper import db_helper
+from application.background_tasks.db import worker_db
+from application.core.config import settings
+from application.core.models.db_helper import LAST_WRITE_COOKIE, db_helper
 from application.pages.router_base import router as router_pages
 from application.pages.router_admin import router as router_admin
 
@@ -25,11 +29,44 @@ async def lifespan(app: FastAPI):
     # Действия при завершении работы приложения (shutdown)
     print("dispose engine")
     await db_helper.dispose()  # Закрытие соединения с базой данных
+    # Пулы потоков, в которых письма отправлялись в режиме email_dispatch_mode == "sync";
+    # циклы событий потоков нельзя запускать из работающего цикла приложения
+    await asyncio.to_thread(worker_db.close)
 
 
 # Инициализация FastAPI-приложения с управлением жизненным циклом
 main_app = FastAPI(lifespan=lifespan)
 
+
+# Продление сессии: access-токен, выпущенный get_current_user по refresh-токену,
+# сохраняется в cookies ответа
+@main_app.middleware("http")
+async def refresh_session_cookie(request: Request, call_next):
+    response = await call_next(request)
+    access_token = getattr(request.state, "access_token", None)
+    if access_token:
+        response.set_cookie("access_token", access_token, httponly=True, path="/")
+    return response
+
+
+# Окно read-after-write: время записи клиента сохраняется в cookies ответа,
+# и его запросы на чтение в любом процессе приложения идут в основную БД,
+# пока окно не истечет
+@main_app.middleware("http")
+async def last_write_cookie(request: Request, call_next):
+    response = await call_next(request)
+    last_write = getattr(request.state, "last_write", None)
+    if last_write is not None:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(last_write),
+            max_age=math.ceil(settings.db_read_after_write_window),
+            httponly=True,
+            path="/",
+        )
+    return response
+
+
 # Подключение всех маршрутов (роутеров) к приложению
 main_app.include_router(router_auth)     # Роуты для авторизации
 main_app.include_router(router_user)     # Роуты для пользователей
@@ -1,8 +1,21 @@
+from datetime import timedelta
 from unittest.mock import patch, ANY
 
 import pytest
 from httpx import AsyncClient
 
+from application.core.models import User
+from application.core.models.db_helper import db_helper as db
+from application.crud.users import get_user, user_cache
+from application.utils.auth_user import (
+    create_access_token,
+    create_refresh_token,
+    create_session_access_token,
+    decode_token,
+)
+from application.utils.emun_types import PositionType
+from application.utils.verification_code import verification_codes
+
 
 @pytest.mark.asyncio
 async def test_check_user_exists(ac: AsyncClient, prepare_base):
@@ -40,9 +53,91 @@ async def test_generate_and_send_verification_code(ac: AsyncClient, prepare_base
     ) as mock_send_email:
         response = await ac.post("/auth/register", data=user_data)
 
-        # Проверяем, что email отправлен
-        mock_send_email.assert_called_once_with(user_data["email"], ANY)
+        # Проверяем, что email отправлен с сохраненным кодом
+        mock_send_email.delay.assert_called_once_with(user_data["email"], ANY)
+        code = mock_send_email.delay.call_args.args[1]
+        assert await verification_codes.get(user_data["email"]) == code
 
         # Проверяем, что статус ответа успешный
         assert response.status_code == 303
         assert response.headers["location"] == "/pages/verify"
+
+
+@pytest.fixture(scope="module")
+async def session_user(prepare_base):
+    """Пользователь для проверки токенов сессии."""
+    async with db.session_factory() as session:
+        user = User(
+            name="Session",
+            email="session@example.com",
+            hash_password="hash",
+            position=PositionType.TESTER,
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+
+@pytest.mark.asyncio
+async def test_session_token_needs_no_user_lookup(ac: AsyncClient, session_user):
+    token = create_session_access_token(session_user)
+
+    with patch("application.utils.dependencies.get_user") as mock_get_user:
+        response = await ac.get("/task/stats", headers={"Authorization": f"Bearer {token}"})
+
+    # Права проверены по данным токена, без запроса пользователя
+    assert response.status_code == 403
+    mock_get_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_session(ac: AsyncClient, session_user):
+    token = create_session_access_token(session_user)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await ac.post("/auth/logout", headers={"Cookie": f"access_token={token}"})
+    assert response.status_code == 303
+
+    response = await ac.get("/task/stats", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_refreshed(ac: AsyncClient, session_user):
+    expired = create_access_token(
+        {**decode_token(create_session_access_token(session_user))},
+        timedelta(seconds=-1),
+    )
+    refresh_token = create_refresh_token(session_user.id)
+
+    response = await ac.get(
+        "/pages/base",
+        headers={"Cookie": f"access_token={expired}; refresh_token={refresh_token}"},
+    )
+    assert response.status_code == 200
+    new_token = response.cookies["access_token"]
+    assert decode_token(new_token)["email"] == "session@example.com"
+
+    # Явное обновление выдает новую пару токенов и отзывает использованный refresh-токен
+    response = await ac.post("/auth/refresh", data={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    assert decode_token(response.json()["access_token"])["sub"] == str(session_user.id)
+
+    response = await ac.post("/auth/refresh", data={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_is_cached(ac: AsyncClient, session_user):
+    # Токен без данных пользователя: пользователь загружается через кэш
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(session_user.id)})}"}
+    ac.cookies.clear()
+    user_cache.clear()
+    hits = user_cache.hits
+
+    with patch("application.crud.users.get_user", wraps=get_user) as mock_get_user:
+        for _ in range(3):
+            response = await ac.get("/task/stats", headers=headers)
+            assert response.status_code == 403
+    assert mock_get_user.call_count == 1
+    assert user_cache.hits - hits == 2
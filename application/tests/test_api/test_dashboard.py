@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from application.api.view_tasks import dashboard_cache
+from application.core.models import User, Project, Task
+from application.core.models.db_helper import db_helper as db
+from application.crud.dashboard import get_dashboard
+from application.utils.auth_user import create_access_token
+from application.utils.emun_types import PositionType, TaskStatus, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def dashboard_data(prepare_base):
+    """Директор, исполнитель и задачи с прошедшими и ближайшими сроками."""
+    today = date.today()
+    async with db.session_factory() as session:
+        director = User(
+            name="Boss",
+            email="boss@example.com",
+            hash_password="hash",
+            position=PositionType.MANAGER,
+            is_director=True,
+        )
+        worker = User(
+            name="Worker",
+            email="worker@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        project = Project(name="Dashboard", description="")
+        session.add_all([director, worker, project])
+        await session.flush()
+
+        def task(name, days, status=TaskStatus.PENDING):
+            return Task(
+                name=name,
+                project_id=project.id,
+                description="",
+                date_from=today - timedelta(days=30),
+                date_to=today + timedelta(days=days),
+                contractor=worker.id,
+                type_task=TypeTask.DEVELOPER,
+                status=status,
+            )
+
+        tasks = [
+            task("overdue", -3),
+            task("overdue done", -2, TaskStatus.COMPLETED),
+            task("soon", 2, TaskStatus.IN_PROGRESS),
+            task("later", 60),
+        ]
+        session.add_all(tasks)
+        await session.commit()
+
+        token = create_access_token({"sub": str(director.id), "admin": "True"})
+        return {
+            "headers": {"Authorization": f"Bearer {token}"},
+            "worker": worker.id,
+            "project_id": project.id,
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard(dashboard_data):
+    async with db.session_factory() as session:
+        data = await get_dashboard(session, date.today(), list_size=100, upcoming_days=7)
+
+    overdue = [task.name for task in data.overdue if task.project_id == dashboard_data["project_id"]]
+    upcoming = [task.name for task in data.upcoming if task.project_id == dashboard_data["project_id"]]
+    assert overdue == ["overdue"]
+    assert upcoming == ["soon"]
+    assert data.overdue_total >= 1
+
+    project = next(p for p in data.stats.by_project if p.project_id == dashboard_data["project_id"])
+    assert project.counts == {"Ожидание": 2, "Выполнено": 1, "В работе": 1}
+    worker = next(c for c in data.stats.by_contractor if c.contractor == dashboard_data["worker"])
+    assert worker.total == 4
+
+
+@pytest.mark.asyncio
+async def test_dashboard_endpoint_is_cached(ac: AsyncClient, dashboard_data):
+    dashboard_cache.clear()
+    with patch(
+        "application.api.view_tasks.get_dashboard", wraps=get_dashboard
+    ) as mock_dashboard:
+        first = await ac.get("/task/dashboard", headers=dashboard_data["headers"])
+        second = await ac.get("/task/dashboard", headers=dashboard_data["headers"])
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert mock_dashboard.call_count == 1
+    assert first.headers["Cache-Control"].startswith("private, max-age=")
@@ -0,0 +1,147 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from application.core.exception.base_exception import ProjectUnavailableError
+from application.core.models import User, Project, ProjectTaskCounter, Task
+from application.core.models.db_helper import db_helper as db
+from application.core.schemas.task import STaskCreateForm
+from application.crud.projects import (
+    delete_project_tasks,
+    get_all_projects,
+    mark_project_deleting,
+)
+from application.crud.task_archive import ensure_archive_partitions
+from application.crud.tasks import add_task, add_tasks_bulk, update_task
+from application.utils.auth_user import create_access_token
+from application.utils.emun_types import PositionType, TaskStatus, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def deletion_data(prepare_base):
+    """Директор и проект с задачами, в том числе архивными."""
+    async with db.session_factory() as session:
+        director = User(
+            name="Remover",
+            email="remover@example.com",
+            hash_password="hash",
+            position=PositionType.MANAGER,
+            is_director=True,
+        )
+        project = Project(name="To delete", description="")
+        session.add_all([director, project])
+        await session.flush()
+        await ensure_archive_partitions(session, [2024])
+
+        session.add_all(
+            Task(
+                name=f"doomed {i}",
+                project_id=project.id,
+                description="",
+                date_from=date(2024, 1, 1),
+                date_to=date(2024, 1, 10),
+                contractor=director.id,
+                type_task=TypeTask.DEVELOPER,
+                status=TaskStatus.PENDING,
+                archived=i == 0,
+            )
+            for i in range(5)
+        )
+        await session.commit()
+
+        token = create_access_token({"sub": str(director.id), "admin": "True"})
+        return {
+            "headers": {"Authorization": f"Bearer {token}"},
+            "director_id": director.id,
+            "project_id": project.id,
+        }
+
+
+@pytest.mark.asyncio
+async def test_delete_project_in_background(ac: AsyncClient, deletion_data):
+    project_id = deletion_data["project_id"]
+
+    with patch("application.api.view_project.delete_project_job") as mock_job:
+        response = await ac.post(
+            "/project/delete",
+            data={"project_id": project_id},
+            headers=deletion_data["headers"],
+        )
+    assert response.status_code == 200
+    mock_job.delay.assert_called_once_with(project_id)
+
+    # Проект сразу скрыт из списка, задачи еще на месте
+    async with db.session_factory() as session:
+        projects = await get_all_projects(session)
+        assert project_id not in {project["id"] for project in projects}
+
+    response = await ac.get(
+        f"/project/delete_status/{project_id}", headers=deletion_data["headers"]
+    )
+    assert response.json() == {
+        "project_id": project_id,
+        "status": "deleting",
+        "tasks_deleted": 0,
+        "tasks_left": 5,
+    }
+
+    # Работа фоновой задачи
+    async with db.session_factory() as session:
+        assert await delete_project_tasks(session, project_id, batch_size=2) == 5
+        left = await session.execute(
+            select(func.count()).select_from(Task).where(Task.project_id == project_id)
+        )
+        assert left.scalar() == 0
+        assert await session.get(Project, project_id) is None
+
+    response = await ac.get(
+        f"/project/delete_status/{project_id}", headers=deletion_data["headers"]
+    )
+    assert response.json()["status"] == "deleted"
+
+
+@pytest.mark.asyncio
+async def test_deleting_project_refuses_tasks(deletion_data):
+    director = deletion_data["director_id"]
+    async with db.session_factory() as session:
+        doomed, other = Project(name="Doomed", description=""), Project(name="Other", description="")
+        session.add_all([doomed, other])
+        await session.commit()
+        doomed_id, other_id = doomed.id, other.id
+
+        def form(project_id: int) -> STaskCreateForm:
+            return STaskCreateForm(
+                name="late",
+                project_id=project_id,
+                description="",
+                date_from=date(2024, 1, 1),
+                date_to=date(2024, 1, 10),
+                contractor=director,
+                type_task=TypeTask.DEVELOPER,
+                status=TaskStatus.PENDING,
+            )
+
+        await add_task(form(doomed_id), session)
+        task = await add_task(form(other_id), session)
+        assert await mark_project_deleting(doomed_id, session)
+
+        # Задачи не добавляются и не переносятся в удаляемый проект
+        with pytest.raises(ProjectUnavailableError):
+            await add_task(form(doomed_id), session)
+        with pytest.raises(ProjectUnavailableError):
+            await add_tasks_bulk([form(other_id), form(doomed_id)], session)
+        with pytest.raises(ProjectUnavailableError):
+            await update_task(task.id, {"project_id": doomed_id}, session)
+
+        # Счетчики удаляются вместе с проектом, счетчики другого проекта не меняются
+        assert await delete_project_tasks(session, doomed_id, batch_size=10) == 1
+        counters = await session.execute(
+            select(ProjectTaskCounter.project_id, ProjectTaskCounter.count).where(
+                ProjectTaskCounter.project_id.in_([doomed_id, other_id])
+            )
+        )
+        assert counters.all() == [(other_id, 1)]
+        assert await session.get(Project, doomed_id) is None
@@ -0,0 +1,338 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from application.core.models import User, Project, Task, OutboxMessage
+from application.core.models.db_helper import db_helper as db
+from application.core.config import settings
+from application.crud.tasks import accept_task, get_my_tasks, get_task_by_id
+from application.utils.auth_user import create_access_token
+from application.utils.emun_types import OutboxEvent, PositionType, TaskStatus, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def director_data(prepare_base):
+    """Директор, два исполнителя и проект для тестов задач."""
+    async with db.session_factory() as session:
+        director = User(
+            name="Director",
+            email="director@example.com",
+            hash_password="hash",
+            position=PositionType.MANAGER,
+            is_director=True,
+        )
+        first = User(
+            name="First",
+            email="first@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        second = User(
+            name="Second",
+            email="second@example.com",
+            hash_password="hash",
+            position=PositionType.TESTER,
+        )
+        project = Project(name="Bulk", description="Bulk project")
+        session.add_all([director, first, second, project])
+        await session.commit()
+
+        token = create_access_token({"sub": str(director.id), "admin": "True"})
+        return {
+            "headers": {"Authorization": f"Bearer {token}"},
+            "contractors": [first.id, second.id],
+            "contractor_headers": {
+                "Authorization": f"Bearer {create_access_token({'sub': str(first.id)})}"
+            },
+            "project_id": project.id,
+        }
+
+
+async def _outbox(event: OutboxEvent) -> list:
+    """Аргументы сообщений outbox с событием event в порядке записи."""
+    async with db.session_factory() as session:
+        result = await session.execute(
+            select(OutboxMessage.payload)
+            .where(OutboxMessage.event == event)
+            .order_by(OutboxMessage.id)
+        )
+        return result.scalars().all()
+
+
+def _task(project_id: int, contractor: int, name: str) -> dict:
+    return {
+        "name": name,
+        "project_id": project_id,
+        "description": "bulk",
+        "date_from": "2024-01-01",
+        "date_to": "2024-01-10",
+        "contractor": contractor,
+        "type_task": "Developer",
+        "status": "Ожидание",
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_ndjson(ac: AsyncClient, director_data):
+    first, second = director_data["contractors"]
+    rows = [
+        _task(director_data["project_id"], first, "first 1"),
+        _task(director_data["project_id"], first, "first 2"),
+        _task(director_data["project_id"], second, "second 1"),
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+
+    response = await ac.post(
+        "/task/bulk_create",
+        content=body,
+        headers={
+            "Content-Type": "application/x-ndjson",
+            **director_data["headers"],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+    # Одно письмо на каждого исполнителя, в outbox записаны только ID задач
+    ids = response.json()["ids"]
+    sent = (await _outbox(OutboxEvent.TASKS_CREATED))[-2:]
+    assert sorted(sent) == [[ids[:2]], [ids[2:]]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_validation_error(ac: AsyncClient, director_data):
+    row = _task(director_data["project_id"], director_data["contractors"][0], "bad")
+    row["date_to"] = "not a date"
+
+    response = await ac.post(
+        "/task/bulk_create", json=[row], headers=director_data["headers"]
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_change_status_batch(ac: AsyncClient, director_data):
+    first, second = director_data["contractors"]
+    async with db.session_factory() as session:
+        tasks = [
+            Task(
+                name="batch",
+                project_id=director_data["project_id"],
+                description="batch",
+                date_from=date(2024, 1, 1),
+                date_to=date(2024, 1, 10),
+                contractor=contractor,
+                type_task=TypeTask.DEVELOPER,
+                status=TaskStatus.PENDING,
+            )
+            for contractor in (first, first, second)
+        ]
+        session.add_all(tasks)
+        await session.commit()
+    own, other = [tasks[0].id, tasks[1].id], tasks[2].id
+    sent = await _outbox(OutboxEvent.TASK_CHANGED)
+
+    response = await ac.post(
+        "/task/change_status_batch",
+        json={"task_ids": [*own, other, -1], "status": "Выполнено"},
+        headers=director_data["contractor_headers"],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"applied": own, "rejected": [other, -1]}
+    # Уведомление об изменении только для задач, статус которых изменен
+    changed = (await _outbox(OutboxEvent.TASK_CHANGED))[len(sent):]
+    assert sorted(changed) == [[task_id, ["status"]] for task_id in own]
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(ac: AsyncClient, director_data):
+    project_id = director_data["project_id"]
+
+    response = await ac.get(
+        "/task/export",
+        params={"project_id": project_id},
+        headers=director_data["headers"],
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows and all(row["project_id"] == project_id for row in rows)
+    assert [row["date_to"] for row in rows] == sorted(row["date_to"] for row in rows)
+
+    response = await ac.get(
+        "/task/export",
+        params={"project_id": project_id, "format": "csv"},
+        headers=director_data["headers"],
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,name,project_id")
+    assert len(lines) == len(rows) + 1
+
+
+@pytest.mark.asyncio
+async def test_create_task(ac: AsyncClient, director_data):
+    first = director_data["contractors"][0]
+    form = _task(director_data["project_id"], first, "created")
+
+    response = await ac.post("/task/create", data=form, headers=director_data["headers"])
+
+    assert response.status_code == 200
+    (task_id,) = (await _outbox(OutboxEvent.TASK_CREATED))[-1]
+    async with db.session_factory() as session:
+        task = await get_task_by_id(task_id, session)
+    assert (task.name, task.project_name) == ("created", "Bulk")
+
+
+@pytest.mark.asyncio
+async def test_create_task_sync_email(ac: AsyncClient, director_data):
+    form = _task(director_data["project_id"], director_data["contractors"][0], "sync")
+
+    # В синхронном режиме письмо собирается из базы и отправляется до ответа
+    with patch.object(settings, "email_dispatch_mode", "sync"), patch(
+        "application.background_tasks.send_message.smtp_pool"
+    ) as mock_pool:
+        response = await ac.post(
+            "/task/create", data=form, headers=director_data["headers"]
+        )
+
+    assert response.status_code == 200
+    message = next(
+        call.args[0]
+        for call in mock_pool.send.call_args_list
+        if "Название: sync" in call.args[0].get_content()
+    )
+    assert message["To"] == "first@example.com"
+    assert "Проект: Bulk" in message.get_content()
+
+    # Отправленные сообщения удалены из outbox
+    assert await _outbox(OutboxEvent.TASK_CREATED) == []
+
+
+@pytest.mark.asyncio
+async def test_accept_task(ac: AsyncClient, director_data):
+    first, second = director_data["contractors"]
+    async with db.session_factory() as session:
+        task = Task(
+            name="to accept",
+            project_id=director_data["project_id"],
+            description="accept",
+            date_from=date(2024, 1, 1),
+            date_to=date(2024, 1, 10),
+            contractor=first,
+            type_task=TypeTask.DEVELOPER,
+            status=TaskStatus.PENDING,
+        )
+        session.add(task)
+        await session.commit()
+
+    response = await ac.post(
+        "/task/accepted_for_work",
+        data={"task_id": task.id},
+        headers=director_data["contractor_headers"],
+    )
+
+    assert response.status_code == 200
+    assert (await _outbox(OutboxEvent.TASK_ACCEPTED))[-1] == [task.id]
+
+    # Чужую задачу принять нельзя
+    async with db.session_factory() as session:
+        not_accepted, _ = await accept_task(task.id, second, session)
+        assert not_accepted is None
+
+        # Список задач из того же запроса совпадает с отдельным чтением
+        _, tasks = await accept_task(task.id, first, session)
+        assert tasks == await get_my_tasks(first, session)
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(ac: AsyncClient, director_data):
+    response = await ac.get(
+        "/task/search",
+        params={"q": "bulk", "project_id": director_data["project_id"], "limit": 2},
+        headers=director_data["headers"],
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page["items"]) == 2 and page["next_cursor"]
+    assert all(item["project_id"] == director_data["project_id"] for item in page["items"])
+
+    # Исполнитель находит только свои задачи
+    response = await ac.get(
+        "/task/search",
+        params={"q": "bulk"},
+        headers=director_data["contractor_headers"],
+    )
+    first = director_data["contractors"][0]
+    assert {item["contractor"] for item in response.json()["items"]} == {first}
+
+
+@pytest.mark.asyncio
+async def test_task_stats(ac: AsyncClient, director_data):
+    response = await ac.get("/task/stats", headers=director_data["headers"])
+    assert response.status_code == 200
+    stats = response.json()
+    bulk = next(p for p in stats["by_project"] if p["project_id"] == director_data["project_id"])
+    assert bulk["total"] == sum(bulk["counts"].values()) > 0
+
+    response = await ac.get("/task/stats", headers=director_data["contractor_headers"])
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_change_task_writes_only_changes(ac: AsyncClient, director_data):
+    first = director_data["contractors"][0]
+    async with db.session_factory() as session:
+        task = Task(
+            name="to change",
+            project_id=director_data["project_id"],
+            description="before",
+            date_from=date(2024, 1, 1),
+            date_to=date(2024, 1, 10),
+            contractor=first,
+            type_task=TypeTask.DEVELOPER,
+            status=TaskStatus.PENDING,
+        )
+        session.add(task)
+        await session.commit()
+
+    def change(body, **headers):
+        return ac.patch(
+            "/task/change",
+            params={"task_id": task.id},
+            json=body,
+            headers={**director_data["headers"], **headers},
+        )
+
+    # Изменение без изменений не пишет в базу и не отправляет письмо
+    sent = await _outbox(OutboxEvent.TASK_CHANGED)
+    with patch("application.api.view_tasks.update_task") as mock_update:
+        response = await change({"description": "before", "date_to": "2024-01-10"})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    mock_update.assert_not_called()
+    assert await _outbox(OutboxEvent.TASK_CHANGED) == sent
+
+    response = await change({"description": "after", "status": "В работе"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "В работе"
+    assert response.headers["ETag"] == '"2"'
+    assert (await _outbox(OutboxEvent.TASK_CHANGED))[-1] == [
+        task.id,
+        ["description", "status"],
+    ]
+
+    # Условное изменение по устаревшей и по текущей версии
+    response = await change({"name": "stale"}, **{"If-Match": '"1"'})
+    assert response.status_code == 412
+
+    response = await change({"name": "fresh", "description": "after"}, **{"If-Match": '"2"'})
+    assert response.status_code == 200
+    assert (response.json()["name"], response.headers["ETag"]) == ("fresh", '"3"')
+    assert (await _outbox(OutboxEvent.TASK_CHANGED))[-1] == [task.id, ["name"]]
@@ -0,0 +1,24 @@
+import pytest
+
+from application.background_tasks.send_message import celery
+from application.background_tasks.worker import worker_argv
+from application.utils.emun_types import CeleryQueue
+
+
+@pytest.mark.parametrize(
+    "task_name, queue",
+    [
+        ("application.background_tasks.send_message.send_email_confirmation_code", "auth"),
+        ("application.background_tasks.send_message.send_email_digest", "notifications"),
+        ("application.background_tasks.send_message.send_email_accept_task", "notifications"),
+        ("application.background_tasks.task_archive.archive_completed_tasks_job", "default"),
+    ],
+)
+def test_task_routes(task_name, queue):
+    route = celery.amqp.router.route({}, task_name)
+    assert route["queue"].name == queue
+
+
+def test_worker_argv():
+    argv = worker_argv(CeleryQueue.AUTH)
+    assert "--queues=auth" in argv and "--prefetch-multiplier=1" in argv
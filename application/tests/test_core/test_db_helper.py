@@ -0,0 +1,80 @@
+import time
+from typing import Optional
+
+import pytest
+from sqlalchemy import text
+from starlette.requests import Request
+
+from application.core.config import settings
+from application.core.models.db_helper import LAST_WRITE_COOKIE, DatabaseHelper
+
+# Адрес, по которому гарантированно нет сервера базы данных
+UNREACHABLE_URL = "postgresql+asyncpg://postgres@127.0.0.1:1/postgres"
+
+
+def _request(last_write: Optional[float] = None) -> Request:
+    """Запрос клиента, в cookies которого (если задано) время его последней записи."""
+    headers = []
+    if last_write is not None:
+        headers.append((b"cookie", f"{LAST_WRITE_COOKIE}={last_write}".encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+async def _read_engine(helper: DatabaseHelper, request: Optional[Request] = None):
+    """Возвращает движок, к которому привязана сессия чтения."""
+    sessions = helper.read_session_getter(request)
+    session = await anext(sessions)
+    await session.execute(text("SELECT 1"))
+    await sessions.aclose()
+    return session.bind
+
+
+@pytest.fixture
+async def helper():
+    helper = DatabaseHelper(
+        url=settings.TEST_DB_URL,
+        replica_urls=[settings.TEST_DB_URL, settings.TEST_DB_URL],
+        read_after_write_window=60,
+    )
+    yield helper
+    await helper.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_balanced_between_replicas(helper):
+    engines = [await _read_engine(helper) for _ in range(4)]
+
+    replica_engines = [replica.engine for replica in helper.replicas]
+    assert engines == replica_engines * 2
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_primary_after_client_commit(helper):
+    writer = _request()
+    async for session in helper.session_getter(writer):
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+
+    # Чтение в том же запросе и в следующем запросе клиента с cookie идет в основную БД
+    last_write = writer.state.last_write
+    assert await _read_engine(helper, writer) is helper.engine
+    assert await _read_engine(helper, _request(last_write)) is helper.engine
+
+    # Запись одного клиента не отключает реплики для остальных
+    assert await _read_engine(helper, _request()) is not helper.engine
+    assert await _read_engine(helper, _request(time.time() - 120)) is not helper.engine
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary():
+    helper = DatabaseHelper(
+        url=settings.TEST_DB_URL,
+        replica_urls=[UNREACHABLE_URL],
+        replica_connect_timeout=1,
+    )
+    try:
+        assert await _read_engine(helper) is helper.engine
+        # Недоступная реплика исключается и следующий запрос сразу идет в основную БД
+        assert helper.pick_replica() is None
+    finally:
+        await helper.dispose()
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from application.core.exception.user_exception import PasswordHashingBusy
+from application.utils.auth_user import (
+    PasswordHashPool,
+    get_password_hash_async,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_roundtrip():
+    hashed = await get_password_hash_async("secret")
+
+    assert await verify_password_async("secret", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_pool_rejects_when_full():
+    pool = PasswordHashPool(workers=1, queue_size=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def blocked() -> bool:
+        # Поток ждет, пока тест не разрешит завершиться
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return True
+
+    running = [asyncio.create_task(pool.run(blocked)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHashingBusy):
+        await pool.run(blocked)
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
@@ -0,0 +1,42 @@
+import smtplib
+from email.message import EmailMessage
+from unittest.mock import MagicMock
+
+from application.utils.smtp_pool import SMTPConnectionPool
+
+
+def _pool(**kwargs) -> SMTPConnectionPool:
+    connect = MagicMock(side_effect=lambda: MagicMock(spec=smtplib.SMTP))
+    return SMTPConnectionPool(connect, **{"size": 2, "idle_timeout": 60.0, **kwargs})
+
+
+def test_smtp_pool_reuses_connection():
+    pool = _pool()
+    for _ in range(3):
+        pool.send(EmailMessage())
+
+    # Одно соединение и один вход на все письма
+    assert pool.connect.call_count == 1
+    server = pool._idle[0][0]
+    assert server.send_message.call_count == 3
+
+
+def test_smtp_pool_reconnects_after_idle_timeout():
+    pool = _pool(idle_timeout=0.0)
+    pool.send(EmailMessage())
+    pool.send(EmailMessage())
+
+    assert pool.connect.call_count == 2
+
+
+def test_smtp_pool_retries_on_closed_connection():
+    pool = _pool()
+    pool.send(EmailMessage())
+    stale = pool._idle[0][0]
+    stale.send_message.side_effect = smtplib.SMTPServerDisconnected()
+
+    # Сервер закрыл простаивающее соединение: письмо уходит через новое
+    pool.send(EmailMessage())
+    assert pool.connect.call_count == 2
+    assert [server for server, _ in pool._idle] != [stale]
+    assert pool._idle[0][0].send_message.call_count == 1
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from application.utils.verification_code import MemoryCodeStore
+
+
+@pytest.mark.asyncio
+async def test_memory_code_store_expires_codes():
+    store = MemoryCodeStore(ttl=0.05, reap_interval=0.02)
+
+    await store.set("first@example.com", 1234)
+    await store.set("second@example.com", 5678)
+    assert await store.get("first@example.com") == 1234
+
+    await store.delete("second@example.com")
+    assert await store.get("second@example.com") is None
+
+    # Одна фоновая задача очищает истекшие коды и завершается на пустом хранилище
+    reaper = store._reaper
+    await asyncio.sleep(0.1)
+    assert await store.get("first@example.com") is None
+    assert store._codes == {}
+    assert reaper.done() and store._reaper is reaper
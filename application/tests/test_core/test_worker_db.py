@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from sqlalchemy import text
+
+from application.background_tasks.db import WorkerDatabase
+from application.core.config import settings
+
+
+async def _backend_pid(session) -> int:
+    return (await session.execute(text("SELECT pg_backend_pid()"))).scalar()
+
+
+async def test_worker_db_reuses_connection():
+    worker_db = WorkerDatabase(settings.TEST_DB_URL, pool_size=1)
+
+    def run_tasks():
+        # Несколько задач подряд в одном потоке воркера
+        try:
+            return [worker_db.run(_backend_pid) for _ in range(3)]
+        finally:
+            worker_db.close()
+
+    pids = await asyncio.to_thread(run_tasks)
+    assert len(set(pids)) == 1
+
+
+async def test_worker_db_close_disposes_all_threads():
+    worker_db = WorkerDatabase(settings.TEST_DB_URL, pool_size=1)
+    # Задачи в разных потоках (пул threads, режим отправки sync)
+    threads = [threading.Thread(target=worker_db.run, args=(_backend_pid,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    states = list(worker_db._states)
+    assert len(states) == 2
+    pools = [state.engine.pool for state in states]
+    assert all(pool.checkedin() == 1 for pool in pools)
+
+    await asyncio.to_thread(worker_db.close)
+
+    assert all(state.loop.is_closed() for state in states)
+    assert all(pool.checkedin() == 0 for pool in pools)
+    assert worker_db._states == []
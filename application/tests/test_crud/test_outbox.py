@@ -0,0 +1,173 @@
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from application.background_tasks.send_message import send_email_digest
+from application.core.models import Project, Task, User
+from application.core.models.db_helper import db_helper as db
+from application.crud.outbox import add_outbox_messages, digest_windows, drain_outbox
+from application.utils.emun_types import (
+    NotificationMode,
+    OutboxEvent,
+    PositionType,
+    TaskStatus,
+    TypeTask,
+)
+
+
+async def _discard(recipient, events):
+    pass
+
+
+@pytest.fixture(scope="module")
+async def recipients(prepare_base):
+    """Получатели с мгновенными уведомлениями и со сводкой раз в час и их задачи."""
+    async with db.session_factory() as session:
+        instant = User(
+            name="Instant",
+            email="instant@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        hourly = User(
+            name="Hourly",
+            email="hourly@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+            notification_mode=NotificationMode.HOURLY,
+        )
+        project = Project(name="Digest", description="")
+        session.add_all([instant, hourly, project])
+        await session.flush()
+
+        tasks = [
+            Task(
+                name=f"digest {i}",
+                project_id=project.id,
+                description="",
+                date_from=date(2024, 1, 1),
+                date_to=date(2024, 1, 10),
+                contractor=instant.id,
+                type_task=TypeTask.DEVELOPER,
+                status=TaskStatus.PENDING,
+            )
+            for i in range(3)
+        ]
+        session.add_all(tasks)
+        await session.commit()
+
+        # Сообщения других тестов не мешают проверкам
+        await drain_outbox(session, _discard, 100, digest_windows(0))
+        return {"instant": instant.id, "hourly": hourly.id, "tasks": [t.id for t in tasks]}
+
+
+@pytest.mark.asyncio
+async def test_drain_outbox_coalesces_by_recipient(recipients):
+    instant, hourly = recipients["instant"], recipients["hourly"]
+    first, second, third = recipients["tasks"]
+    async with db.session_factory() as session:
+        await add_outbox_messages(
+            session,
+            [
+                (instant, OutboxEvent.TASK_CREATED, [first]),
+                (hourly, OutboxEvent.TASK_ACCEPTED, [third]),
+                (instant, OutboxEvent.TASK_CHANGED, [second, ["status"]]),
+                (instant, OutboxEvent.TASKS_CREATED, [[second, third]]),
+            ],
+        )
+        await session.commit()
+
+        published = []
+
+        async def publish(recipient, events):
+            published.append((recipient, events))
+
+        # Сводка раз в час еще не накопилась: уходит одно письмо мгновенному получателю
+        windows = digest_windows(0)
+        assert await drain_outbox(session, publish, 100, windows) == 3
+        assert published == [
+            (
+                instant,
+                [
+                    ["task_created", [first]],
+                    ["task_changed", [second, ["status"]]],
+                    ["tasks_created", [[second, third]]],
+                ],
+            )
+        ]
+
+        windows[NotificationMode.HOURLY] = windows[NotificationMode.INSTANT]
+        assert await drain_outbox(session, publish, 100, windows) == 1
+        assert published[-1] == (hourly, [["task_accepted", [third]]])
+
+
+@pytest.mark.asyncio
+async def test_send_email_digest(recipients):
+    first, second, _ = recipients["tasks"]
+    events = [["task_created", [first]], ["task_changed", [second, ["status"]]]]
+
+    with patch("application.background_tasks.send_message.smtp_pool") as mock_pool:
+        await asyncio.to_thread(
+            send_email_digest.apply, args=(recipients["instant"], events), throw=True
+        )
+
+    # Два уведомления - одно письмо со сводкой
+    (message,), _ = mock_pool.send.call_args
+    assert mock_pool.send.call_count == 1
+    assert message["To"] == "instant@example.com"
+    content = message.get_content()
+    assert "Вам назначена новая задача" in content and "Название: digest 0" in content
+    assert "Ваша задача изменилась" in content and "status: Ожидание" in content
+
+    # Задачи другого получателя в сводку не попадают
+    with patch("application.background_tasks.send_message.smtp_pool") as mock_pool:
+        await asyncio.to_thread(
+            send_email_digest.apply, args=(recipients["hourly"], events), throw=True
+        )
+    mock_pool.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_drain_outbox_skips_locked_messages(recipients):
+    async with db.session_factory() as session:
+        users = [
+            User(
+                name=f"Locked {i}",
+                email=f"locked{i}@example.com",
+                hash_password="hash",
+                position=PositionType.DEVELOPER,
+            )
+            for i in range(4)
+        ]
+        session.add_all(users)
+        await session.flush()
+        await add_outbox_messages(
+            session, [(user.id, OutboxEvent.TASK_ACCEPTED, [user.id]) for user in users]
+        )
+        await session.commit()
+
+    first, second = [], []
+    locked, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_publish(recipient, events):
+        first.append(recipient)
+        locked.set()
+        await release.wait()
+
+    async def publish(recipient, events):
+        second.append(recipient)
+
+    windows = digest_windows(0)
+    async with db.session_factory() as slow, db.session_factory() as fast:
+        # Первый диспетчер держит блокировку своей пачки, второй ее пропускает
+        slow_drain = asyncio.create_task(drain_outbox(slow, slow_publish, 2, windows))
+        await locked.wait()
+        assert await drain_outbox(fast, publish, 2, windows) == 2
+
+        release.set()
+        assert await slow_drain == 2
+
+    assert len(first + second) == 4
+    assert not set(first) & set(second)
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from application.core.exception.base_exception import InvalidCursorError
+from application.core.models import User, Project, Task
+from application.core.models.db_helper import db_helper as db
+from application.crud.tasks import get_tasks_page
+from application.utils.emun_types import PositionType, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def seeded_tasks(prepare_base):
+    """Наполнение базы задачами с повторяющимися датами завершения."""
+    async with db.session_factory() as session:
+        user = User(
+            name="Paginator",
+            email="paginator@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        project = Project(name="Pagination", description="Keyset")
+        session.add_all([user, project])
+        await session.flush()
+        session.add_all(
+            [
+                Task(
+                    name=f"task {i}",
+                    project_id=project.id,
+                    description="",
+                    date_from=date(2024, 1, 1),
+                    date_to=date(2024, 1, 1) + timedelta(days=i % 3),
+                    contractor=user.id,
+                    type_task=TypeTask.DEVELOPER,
+                )
+                for i in range(11)
+            ]
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_tasks_pages_forward_and_back(seeded_tasks):
+    async with db.session_factory() as session:
+        expected = (
+            await session.execute(select(Task.id).order_by(Task.date_to, Task.id))
+        ).scalars().all()
+
+        # Проходим все страницы вперед
+        pages, cursor = [], None
+        while True:
+            page = await get_tasks_page(session, cursor, limit=4)
+            pages.append(page)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+        assert [t["id"] for p in pages for t in p.items] == expected
+        assert pages[0].prev_cursor is None
+
+        # Возвращаемся назад с последней страницы
+        back = await get_tasks_page(session, pages[-1].prev_cursor, limit=4)
+        assert [t["id"] for t in back.items] == [t["id"] for t in pages[-2].items]
+
+
+@pytest.mark.asyncio
+async def test_tasks_page_invalid_cursor(seeded_tasks):
+    async with db.session_factory() as session:
+        with pytest.raises(InvalidCursorError):
+            await get_tasks_page(session, "not-a-cursor", limit=4)
@@ -0,0 +1,239 @@
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.models.db_helper import db_helper as db
+from application.core.schemas.task import STaskCreateForm
+from application.crud import dashboard, projects, tasks, users
+from application.utils.emun_types import TaskStatus, TypeTask
+
+# Объем тестовых данных, при котором планировщик выбирает реальные планы
+USERS = 2_000
+PROJECTS = 20_000
+TASKS = 50_000
+
+# Операторы, планы которых проверяются (служебные SAVEPOINT/RELEASE пропускаются)
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+SEED_SQL = (
+    f"""
+    INSERT INTO users (name, email, hash_password, position, is_director)
+    SELECT 'explain ' || g, 'explain' || g || '@example.com', 'x', 'DEVELOPER', false
+    FROM generate_series(1, {USERS}) g
+    """,
+    f"""
+    INSERT INTO projects (name, description)
+    SELECT 'explain ' || g, '' FROM generate_series(1, {PROJECTS}) g
+    """,
+    f"""
+    INSERT INTO tasks
+        (name, project_id, description, date_from, date_to, contractor, type_task, status)
+    SELECT
+        'explain ' || g,
+        (SELECT min(id) FROM projects WHERE name LIKE 'explain%') + g % {PROJECTS},
+        '',
+        DATE '2024-01-01',
+        DATE '2024-01-01' + g % 365,
+        (SELECT min(id) FROM users WHERE email LIKE 'explain%') + g % {USERS},
+        'DEVELOPER',
+        (ARRAY['PENDING', 'IN_PROGRESS', 'COMPLETED'])[1 + g % 3]::taskstatus
+    FROM generate_series(1, {TASKS}) g
+    """,
+    # Переносим строки из списка ожидания GIN в основную структуру индекса,
+    # как это сделал бы autovacuum, иначе стоимость поиска по индексу завышена
+    "SELECT gin_clean_pending_list('ix_projects_search_vector')",
+    # (tasks секционирована: очищается индекс оперативной секции)
+    "SELECT gin_clean_pending_list(indexrelid) FROM pg_index "
+    "JOIN pg_inherits ON inhrelid = indexrelid "
+    "WHERE inhparent = 'ix_tasks_search_vector'::regclass "
+    "AND indrelid = 'tasks_hot'::regclass",
+    "ANALYZE users",
+    "ANALYZE projects",
+    "ANALYZE tasks",
+)
+
+
+def _scan_nodes(plan: dict):
+    """Рекурсивный обход узлов плана EXPLAIN (FORMAT JSON)."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _scan_nodes(child)
+
+
+@pytest.fixture(scope="module")
+async def explain_conn(prepare_base):
+    """
+    Соединение с заполненной базой внутри транзакции, которая откатывается
+    после тестов модуля, чтобы данные не влияли на другие тесты.
+    """
+    async with db.engine.connect() as conn:
+        trans = await conn.begin()
+        for sql in SEED_SQL:
+            await conn.exec_driver_sql(sql)
+        yield conn
+        await trans.rollback()
+
+
+@pytest.fixture
+async def explain(explain_conn):
+    """
+    Возвращает функцию, которая выполняет CRUD-вызов, перехватывает все его SQL-запросы
+    и возвращает их планы выполнения. С generic=True запрос подготавливается
+    (PREPARE) и объясняется через EXECUTE, как его выполняет asyncpg.
+    """
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINABLE):
+            captured.append((statement, parameters))
+
+    async def run(crud_call, generic=False):
+        captured.clear()
+        sync_conn = explain_conn.sync_connection
+        event.listen(sync_conn, "before_cursor_execute", capture)
+        try:
+            async with AsyncSession(
+                bind=explain_conn, join_transaction_mode="create_savepoint"
+            ) as session:
+                await crud_call(session)
+        finally:
+            event.remove(sync_conn, "before_cursor_execute", capture)
+
+        assert captured, "CRUD-функция не выполнила ни одного запроса"
+        plans = []
+        for statement, parameters in captured:
+            plan = await _explain(explain_conn, statement, parameters, generic)
+            plans.append((statement, plan if isinstance(plan, list) else json.loads(plan)))
+        return plans
+
+    return run
+
+
+async def _explain(conn, statement, parameters, generic):
+    """План запроса в формате JSON; для generic - план подготовленного запроса."""
+    if not generic:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        return result.scalar()
+    await conn.exec_driver_sql(f"PREPARE explained AS {statement}")
+    try:
+        # Обобщенный план не зависит от значений параметров, а EXECUTE не принимает
+        # связанные параметры, поэтому передаются NULL
+        args = ", ".join(["NULL"] * len(parameters))
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) EXECUTE explained({args})")
+        return result.scalar()
+    finally:
+        await conn.exec_driver_sql("DEALLOCATE explained")
+
+
+async def _ids(conn):
+    """Идентификаторы одной тестовой задачи, ее исполнителя и проекта."""
+    row = (
+        await conn.exec_driver_sql(
+            "SELECT id, contractor, project_id FROM tasks "
+            "WHERE name LIKE 'explain%' ORDER BY id LIMIT 1"
+        )
+    ).one()
+    return row.id, row.contractor, row.project_id
+
+
+CRUD_CALLS = {
+    "add_task": lambda ids: lambda s: tasks.add_task(
+        STaskCreateForm(
+            name="explain new",
+            project_id=ids[2],
+            description="",
+            date_from=date(2024, 1, 1),
+            date_to=date(2024, 2, 1),
+            contractor=ids[1],
+            type_task=TypeTask.DEVELOPER,
+            status=TaskStatus.PENDING,
+        ),
+        s,
+    ),
+    "get_tasks_page": lambda ids: lambda s: tasks.get_tasks_page(s, limit=50),
+    "get_tasks_page_cursor": lambda ids: lambda s: _second_tasks_page(s),
+    "search_tasks": lambda ids: lambda s: tasks.search_tasks(
+        s, "explain 17", status=TaskStatus.COMPLETED, limit=50
+    ),
+    "get_task": lambda ids: lambda s: tasks.get_task(s, id=ids[0]),
+    "get_task_by_id": lambda ids: lambda s: tasks.get_task_by_id(ids[0], s),
+    "get_tasks_by_project": lambda ids: lambda s: tasks.get_tasks_by_project(ids[2], s),
+    "get_my_tasks": lambda ids: lambda s: tasks.get_my_tasks(ids[1], s),
+    "accept_task": lambda ids: lambda s: tasks.accept_task(ids[0], ids[1], s),
+    "change_status_tasks": lambda ids: lambda s: tasks.change_status_tasks(
+        [ids[0], ids[0] + 1], ids[1], TaskStatus.COMPLETED, s
+    ),
+    "update_task": lambda ids: lambda s: tasks.update_task(
+        ids[0],
+        {"description": "", "date_from": date(2024, 1, 1), "date_to": date(2024, 2, 1)},
+        s,
+    ),
+    "update_task_if_match": lambda ids: lambda s: tasks.update_task_if_match(
+        ids[0], {"description": "explain"}, 1, s
+    ),
+    "remove_task": lambda ids: lambda s: tasks.remove_task(ids[0], s),
+    "get_project": lambda ids: lambda s: projects.get_project(s, id=ids[2]),
+    "get_projects_page": lambda ids: lambda s: projects.get_projects_page(s, limit=50),
+    "search_projects": lambda ids: lambda s: projects.search_projects(
+        s, "explain 17", limit=50
+    ),
+    "get_user_by_id": lambda ids: lambda s: users.get_user(s, id=ids[1]),
+    "get_user_by_email": lambda ids: lambda s: users.get_user(
+        s, email="explain1@example.com"
+    ),
+    "get_my_profile": lambda ids: lambda s: users.get_my_profile(ids[1], s),
+    "get_users_page": lambda ids: lambda s: users.get_users_page(s, limit=50),
+}
+
+
+async def _second_tasks_page(session):
+    page = await tasks.get_tasks_page(session, limit=50)
+    return await tasks.get_tasks_page(session, page.next_cursor, limit=50)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", CRUD_CALLS)
+async def test_crud_statement_has_no_seq_scan(name, explain, explain_conn):
+    ids = await _ids(explain_conn)
+    plans = await explain(CRUD_CALLS[name](ids))
+
+    for statement, plan in plans:
+        seq_scans = [
+            node["Relation Name"]
+            for node in _scan_nodes(plan[0]["Plan"])
+            if node["Node Type"] == "Seq Scan"
+        ]
+        assert not seq_scans, f"{name}: Seq Scan по {seq_scans} в запросе\n{statement}"
+
+
+@pytest.mark.asyncio
+async def test_dashboard_uses_open_tasks_index_in_generic_plan(explain, explain_conn):
+    await explain_conn.exec_driver_sql("SAVEPOINT generic_plan")
+    try:
+        # Без полного индекса по сроку выбор не зависит от оценки стоимости:
+        # частичный индекс доступен, только если условие на статус видно в тексте запроса
+        await explain_conn.exec_driver_sql("DROP INDEX ix_tasks_date_to_id")
+        # asyncpg кэширует подготовленные запросы, и со временем Postgres выбирает
+        # для них обобщенный план без значений параметров
+        await explain_conn.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan")
+        ((statement, plan),) = await explain(
+            lambda s: dashboard.get_dashboard(s, date(2024, 6, 1), 20, 7), generic=True
+        )
+    finally:
+        await explain_conn.exec_driver_sql("ROLLBACK TO SAVEPOINT generic_plan")
+
+    # Имена секционных индексов зависят от порядка миграций, поэтому индекс
+    # ix_tasks_open_date_to оперативной секции ищется в каталоге
+    open_index = (
+        await explain_conn.exec_driver_sql(
+            "SELECT indexrelid::regclass::text FROM pg_index "
+            "JOIN pg_inherits ON inhrelid = indexrelid "
+            "WHERE inhparent = 'ix_tasks_open_date_to'::regclass "
+            "AND indrelid = 'tasks_hot'::regclass"
+        )
+    ).scalar_one()
+    indexes = {node.get("Index Name") for node in _scan_nodes(plan[0]["Plan"])}
+    assert open_index in indexes, statement
@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+from application.core.models import User, Project, Task
+from application.core.models.db_helper import db_helper as db
+from application.crud.projects import search_projects
+from application.crud.tasks import search_tasks
+from application.utils.emun_types import PositionType, TaskStatus, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def search_data(prepare_base):
+    """Проект и задачи с разным совпадением по имени и описанию."""
+    async with db.session_factory() as session:
+        user = User(
+            name="Searcher",
+            email="searcher@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        project = Project(name="Платежный шлюз", description="Интеграция с банком")
+        session.add_all([user, project])
+        await session.flush()
+
+        def task(name, description, status=TaskStatus.PENDING):
+            return Task(
+                name=name,
+                project_id=project.id,
+                description=description,
+                date_from=date(2024, 1, 1),
+                date_to=date(2024, 1, 10),
+                contractor=user.id,
+                type_task=TypeTask.DEVELOPER,
+                status=status,
+            )
+
+        tasks = [
+            task("Отчет по платежам", "Выгрузка платежей за месяц"),
+            task("Сверка", "Сверить платежи с банком", TaskStatus.COMPLETED),
+            task("Платежи", "Платежный шлюз"),
+            task("Верстка", "Главная страница"),
+        ]
+        session.add_all(tasks)
+        await session.commit()
+        return {"project_id": project.id, "tasks": [t.id for t in tasks]}
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_ranked(search_data):
+    report, reconcile, payments, layout = search_data["tasks"]
+    async with db.session_factory() as session:
+        page = await search_tasks(session, "платежи", project_id=search_data["project_id"])
+
+    ids = [item["id"] for item in page.items]
+    # Словоформы находятся через стемминг, совпадения в имени и описании выше
+    assert set(ids) == {report, reconcile, payments}
+    assert ids[-1] == reconcile
+    ranks = [item["rank"] for item in page.items]
+    assert ranks == sorted(ranks, reverse=True)
+    assert "search_vector" not in page.items[0]
+    assert "rank_order" not in page.items[0]
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_filters_and_pages(search_data):
+    report, reconcile, payments, _ = search_data["tasks"]
+    async with db.session_factory() as session:
+        completed = await search_tasks(session, "платежи", status=TaskStatus.COMPLETED)
+        assert [item["id"] for item in completed.items] == [reconcile]
+
+        first = await search_tasks(
+            session, "платежи", project_id=search_data["project_id"], limit=2
+        )
+        second = await search_tasks(
+            session,
+            "платежи",
+            project_id=search_data["project_id"],
+            cursor=first.next_cursor,
+            limit=2,
+        )
+        back = await search_tasks(
+            session,
+            "платежи",
+            project_id=search_data["project_id"],
+            cursor=second.prev_cursor,
+            limit=2,
+        )
+
+    assert [item["id"] for item in second.items] == [reconcile]
+    assert second.next_cursor is None
+    assert [item["id"] for item in back.items] == [item["id"] for item in first.items]
+
+
+@pytest.mark.asyncio
+async def test_search_projects(search_data):
+    async with db.session_factory() as session:
+        page = await search_projects(session, "банк")
+        assert [item["id"] for item in page.items] == [search_data["project_id"]]
+        assert "rank_order" not in page.items[0]
+        assert (await search_projects(session, "шлюз -банк")).items == []
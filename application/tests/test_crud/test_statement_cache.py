@@ -0,0 +1,33 @@
+import pytest
+
+from application.core.models import User
+from application.core.models.db_helper import db_helper as db
+from application.crud.statements import filter_by_statement
+from application.crud.users import USER_SELECT, get_user
+from application.utils.emun_types import PositionType
+
+
+@pytest.mark.asyncio
+async def test_filter_by_statement_is_reused(prepare_base):
+    async with db.session_factory() as session:
+        user = User(
+            name="Cached",
+            email="cached@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        session.add(user)
+        await session.commit()
+
+        first = await get_user(session, id=user.id)
+        # Порядок полей фильтра не влияет на выбор запроса
+        second = await get_user(session, email=user.email, id=user.id)
+        assert first["email"] == second["email"] == "cached@example.com"
+        assert await get_user(session, id=-1) is None
+
+    assert filter_by_statement(USER_SELECT, ("id",)) is filter_by_statement(
+        USER_SELECT, ("id",)
+    )
+    assert filter_by_statement(USER_SELECT, ("email", "id")) is filter_by_statement(
+        USER_SELECT, ("email", "id")
+    )
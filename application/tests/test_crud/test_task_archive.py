@@ -0,0 +1,137 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import literal_column, select, update
+
+from application.core.models import User, Project, Task
+from application.core.models.db_helper import db_helper as db
+from application.crud.task_archive import archive_completed_tasks
+from application.crud.task_counters import get_task_stats
+from application.crud.tasks import get_task_by_id, get_tasks_by_project
+from application.utils.emun_types import PositionType, TaskStatus, TypeTask
+
+
+@pytest.fixture(scope="module")
+async def archive_data(prepare_base):
+    """Проект со старыми завершенными, старыми открытыми и свежими завершенными задачами."""
+    async with db.session_factory() as session:
+        user = User(
+            name="Archive",
+            email="archive@example.com",
+            hash_password="hash",
+            position=PositionType.DEVELOPER,
+        )
+        project = Project(name="Archive", description="Archive project")
+        session.add_all([user, project])
+        await session.flush()
+
+        def task(date_to: date, status: TaskStatus) -> Task:
+            return Task(
+                name="archive",
+                project_id=project.id,
+                description="archive",
+                date_from=date(2020, 1, 1),
+                date_to=date_to,
+                contractor=user.id,
+                type_task=TypeTask.DEVELOPER,
+                status=status,
+            )
+
+        old = [
+            task(date(2021, 3, 1), TaskStatus.COMPLETED),
+            task(date(2021, 9, 1), TaskStatus.COMPLETED),
+            task(date(2022, 5, 1), TaskStatus.COMPLETED),
+        ]
+        kept = [
+            task(date(2021, 6, 1), TaskStatus.IN_PROGRESS),
+            task(date(2024, 6, 1), TaskStatus.COMPLETED),
+        ]
+        session.add_all(old + kept)
+        await session.commit()
+        return {
+            "user_id": user.id,
+            "project_id": project.id,
+            "old": [t.id for t in old],
+            "kept": [t.id for t in kept],
+        }
+
+
+@pytest.mark.asyncio
+async def test_archive_completed_tasks(archive_data):
+    async with db.session_factory() as session:
+        stats_before = await get_task_stats(session)
+
+        archived = await archive_completed_tasks(session, date(2024, 1, 1), batch_size=2)
+        assert archived == 3
+
+        # Строки перенесены в годовые секции архива
+        partitions = await session.execute(
+            select(Task.id, literal_column("tasks.tableoid::regclass::text"))
+            .where(Task.project_id == archive_data["project_id"])
+        )
+        partitions = dict(partitions.all())
+        assert {partitions[task_id] for task_id in archive_data["old"]} == {
+            "tasks_archive_2021",
+            "tasks_archive_2022",
+        }
+        assert {partitions[task_id] for task_id in archive_data["kept"]} == {"tasks_hot"}
+
+        # По умолчанию архив не читается
+        tasks = await get_tasks_by_project(archive_data["project_id"], session)
+        assert {task["id"] for task in tasks} == set(archive_data["kept"])
+        assert await get_task_by_id(archive_data["old"][0], session) is None
+
+        tasks = await get_tasks_by_project(
+            archive_data["project_id"], session, include_archive=True
+        )
+        assert {task["id"] for task in tasks} == set(archive_data["old"] + archive_data["kept"])
+
+        # Перенос в архив не меняет счетчики задач
+        assert await get_task_stats(session) == stats_before
+
+        # Повторный запуск ничего не переносит
+        assert await archive_completed_tasks(session, date(2024, 1, 1), batch_size=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_archive_creates_partitions_for_late_completed_tasks(archive_data):
+    async with db.session_factory() as session:
+        first, late = [
+            Task(
+                name="late",
+                project_id=archive_data["project_id"],
+                description="archive",
+                date_from=date(1990, 1, 1),
+                date_to=date_to,
+                contractor=archive_data["user_id"],
+                type_task=TypeTask.DEVELOPER,
+                status=status,
+            )
+            for date_to, status in (
+                (date(1996, 1, 1), TaskStatus.COMPLETED),
+                (date(1995, 1, 1), TaskStatus.IN_PROGRESS),
+            )
+        ]
+        session.add_all([first, late])
+        await session.commit()
+        late_id = late.id
+
+    # Задача завершается, пока архивация уже идет, и попадает в год без секции
+    async with db.session_factory() as session, db.session_factory() as other:
+        commit = session.commit
+
+        async def commit_and_complete():
+            await commit()
+            await other.execute(
+                update(Task).where(Task.id == late_id).values(status=TaskStatus.COMPLETED)
+            )
+            await other.commit()
+
+        with patch.object(session, "commit", commit_and_complete):
+            assert await archive_completed_tasks(session, date(2000, 1, 1), batch_size=1) == 2
+
+        partition = await session.execute(
+            select(literal_column("tasks.tableoid::regclass::text")).where(Task.id == late_id)
+        )
+        assert partition.scalar() == "tasks_archive_1995"
@@ -0,0 +1,132 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from application.core.models import (
+    User,
+    Project,
+    Task,
+    ProjectTaskCounter,
+    ContractorTaskCounter,
+)
+from application.core.models.db_helper import db_helper as db
+from application.core.schemas.task import STaskCreateForm
+from application.crud.task_counters import get_task_stats, reconcile_task_counters
+from application.crud.tasks import (
+    add_task,
+    add_tasks_bulk,
+    change_status_tasks,
+    remove_task,
+    update_task,
+)
+from application.utils.emun_types import PositionType, TaskStatus, TypeTask
+
+
+async def _actual_counts(session):
+    """Количество задач по (проект, статус) и (исполнитель, статус) из таблицы tasks."""
+    rows = (await session.execute(select(Task.project_id, Task.contractor, Task.status))).all()
+    return (
+        Counter((row.project_id, row.status) for row in rows),
+        Counter((row.contractor, row.status) for row in rows),
+    )
+
+
+async def _counter_counts(session):
+    """Ненулевые значения таблиц счетчиков."""
+    projects = await session.execute(
+        select(ProjectTaskCounter.project_id, ProjectTaskCounter.status, ProjectTaskCounter.count)
+        .where(ProjectTaskCounter.count != 0)
+    )
+    contractors = await session.execute(
+        select(ContractorTaskCounter.contractor, ContractorTaskCounter.status, ContractorTaskCounter.count)
+        .where(ContractorTaskCounter.count != 0)
+    )
+    return (
+        Counter({(key, status): count for key, status, count in projects}),
+        Counter({(key, status): count for key, status, count in contractors}),
+    )
+
+
+@pytest.fixture(scope="module")
+async def counter_data(prepare_base):
+    async with db.session_factory() as session:
+        users = [
+            User(
+                name=f"Counter {i}",
+                email=f"counter{i}@example.com",
+                hash_password="hash",
+                position=PositionType.DEVELOPER,
+            )
+            for i in range(2)
+        ]
+        projects = [Project(name=f"Counter {i}", description="") for i in range(2)]
+        session.add_all([*users, *projects])
+        await session.commit()
+        return [u.id for u in users], [p.id for p in projects]
+
+
+def _form(project_id: int, contractor: int) -> STaskCreateForm:
+    return STaskCreateForm(
+        name="counted",
+        project_id=project_id,
+        description="",
+        date_from=date(2024, 1, 1),
+        date_to=date(2024, 1, 10),
+        contractor=contractor,
+        type_task=TypeTask.DEVELOPER,
+        status=TaskStatus.PENDING,
+    )
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_task_changes(counter_data):
+    (first, second), (project_a, project_b) = counter_data
+    async with db.session_factory() as session:
+        task = await add_task(_form(project_a, first), session)
+        bulk = await add_tasks_bulk(
+            [_form(project_a, second), _form(project_b, first), _form(project_b, second)],
+            session,
+        )
+        await change_status_tasks([task.id], first, TaskStatus.IN_PROGRESS, session)
+        await change_status_tasks(
+            [row["id"] for row in bulk], second, TaskStatus.COMPLETED, session
+        )
+        # Изменение полей, не влияющих на счетчики
+        await update_task(
+            task.id,
+            {"description": "x", "date_from": date(2024, 1, 2), "date_to": date(2024, 1, 9)},
+            session,
+        )
+        await remove_task(bulk[1]["id"], session)
+
+        assert await _counter_counts(session) == await _actual_counts(session)
+
+        stats = await get_task_stats(session)
+        by_project = {p.project_id: p for p in stats.by_project}
+        assert by_project[project_a].counts == {"В работе": 1, "Выполнено": 1}
+        assert by_project[project_b].counts == {"Выполнено": 1}
+        assert stats.total == sum(p.total for p in stats.by_project)
+        assert stats.total == sum(c.total for c in stats.by_contractor)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_fixes_drift(counter_data):
+    (first, _), (project_a, _) = counter_data
+    async with db.session_factory() as session:
+        # Искусственное расхождение: неверный счетчик, потерянный и лишний
+        await session.execute(
+            update(ProjectTaskCounter)
+            .where(ProjectTaskCounter.project_id == project_a)
+            .values(count=ProjectTaskCounter.count + 5)
+        )
+        await session.execute(
+            delete(ContractorTaskCounter).where(ContractorTaskCounter.contractor == first)
+        )
+        session.add(ProjectTaskCounter(project_id=-1, status=TaskStatus.PENDING, count=3))
+        await session.commit()
+
+        assert await reconcile_task_counters(session) > 0
+        assert await _counter_counts(session) == await _actual_counts(session)
+        assert await reconcile_task_counters(session) == 0
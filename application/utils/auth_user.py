@@ -1,10 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, TypeVar
+from uuid import uuid4
+
+from fastapi import Response
 from jose import jwt
 from passlib.context import CryptContext
 
 from application.core.config import settings
+from application.core.exception.user_exception import PasswordHashingBusy
+from application.core.schemas.user import SSessionUser
+
+T = TypeVar("T")
 
-# Используемый контекст для хеширования паролей с bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Используемый контекст для хеширования паролей с bcrypt.
+# Хеши с другой стоимостью продолжают проверяться (стоимость хранится в самом хеше)
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# Типы токенов сессии
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
 
 
 def get_password_hash(password: str) -> str:
@@ -28,15 +46,79 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(data: dict) -> str:
+# Ограниченный пул потоков для bcrypt
+class PasswordHashPool:
+    def __init__(self, workers: int, queue_size: int) -> None:
+        """
+        bcrypt отпускает GIL на время вычисления хеша, поэтому потоки выполняют
+        хеширование параллельно, не блокируя цикл событий.
+
+        :param workers: Количество потоков.
+        :param queue_size: Максимум запросов, ожидающих свободного потока;
+                           сверх этого запросы отклоняются (PasswordHashingBusy).
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self._limit = workers + queue_size
+        self._pending = 0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Выполняет func(*args) в пуле потоков.
+
+        :raises PasswordHashingBusy: Если пул и очередь заняты.
+        """
+        if self._pending >= self._limit:
+            raise PasswordHashingBusy
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+
+password_pool = PasswordHashPool(
+    settings.password_hash_workers, settings.password_hash_queue_size
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Возвращает хеш пароля, вычисленный в пуле потоков bcrypt.
+
+    :param password: Открытый пароль в виде строки.
+    :return: Хешированный пароль.
+    :raises PasswordHashingBusy: Если очередь хеширования переполнена.
+    """
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверяет пароль в пуле потоков bcrypt.
+
+    :param plain_password: Открытый пароль.
+    :param hashed_password: Хешированный пароль.
+    :return: True, если пароль совпадает, иначе False.
+    :raises PasswordHashingBusy: Если очередь хеширования переполнена.
+    """
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Создание JWT токена для авторизации пользователя.
 
     :param data: Данные, которые будут зашифрованы в токене.
+    :param expires_delta: Время жизни токена (None - токен без срока действия).
     :return: Строка с закодированным JWT токеном.
     """
     # Создаем копию переданных данных для дальнейшего кодирования
     to_encode = data.copy()
+    if expires_delta is not None:
+        to_encode["exp"] = datetime.now(timezone.utc) + expires_delta
 
     # Кодируем данные в JWT токен, используя секретный ключ и алгоритм
     encoded_jwt = jwt.encode(
@@ -45,3 +127,84 @@ def create_access_token(data: dict) -> str:
 
     # Возвращаем закодированный JWT токен
     return encoded_jwt
+
+
+def create_session_access_token(user) -> str:
+    """
+    Создает короткоживущий access-токен, содержащий все поля пользователя,
+    нужные маршрутам, чтобы get_current_user не обращался к базе данных.
+
+    :param user: Пользователь (User или SSessionUser).
+    :return: Строка с закодированным JWT токеном.
+    """
+    return create_access_token(
+        {
+            "sub": str(user.id),
+            "typ": ACCESS_TOKEN,
+            "jti": uuid4().hex,
+            "admin": str(user.is_director),
+            "email": user.email,
+            "position": user.position.value,
+        },
+        timedelta(minutes=settings.access_token_expire_minutes),
+    )
+
+
+def create_refresh_token(user_id: int) -> str:
+    """
+    Создает долгоживущий refresh-токен для выпуска новых access-токенов.
+
+    :param user_id: ID пользователя.
+    :return: Строка с закодированным JWT токеном.
+    """
+    return create_access_token(
+        {"sub": str(user_id), "typ": REFRESH_TOKEN, "jti": uuid4().hex},
+        timedelta(days=settings.refresh_token_expire_days),
+    )
+
+
+def decode_token(token: str, verify_exp: bool = True) -> dict:
+    """
+    Раскодирует и проверяет JWT токен.
+
+    :param token: JWT токен.
+    :param verify_exp: Проверять срок действия токена.
+    :return: Данные токена.
+    :raises JWTError: Если токен некорректен или истек (ExpiredSignatureError).
+    """
+    return jwt.decode(
+        token,
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+        options={"verify_exp": verify_exp},
+    )
+
+
+def session_user_from_claims(payload: dict) -> SSessionUser:
+    """
+    Восстанавливает пользователя сессии из данных access-токена.
+
+    :param payload: Данные access-токена.
+    :return: Объект SSessionUser.
+    """
+    return SSessionUser(
+        id=int(payload["sub"]),
+        email=payload["email"],
+        is_director=payload["admin"] == "True",
+        position=payload["position"],
+    )
+
+
+def set_session_cookies(
+    response: Response, access_token: str, refresh_token: Optional[str] = None
+) -> None:
+    """
+    Сохраняет токены сессии в cookies ответа.
+
+    :param response: Ответ, в который добавляются cookies.
+    :param access_token: Access-токен.
+    :param refresh_token: Refresh-токен (None - не изменяется).
+    """
+    response.set_cookie("access_token", access_token, httponly=True, path="/")
+    if refresh_token is not None:
+        response.set_cookie("refresh_token", refresh_token, httponly=True, path="/")
@@ -0,0 +1,43 @@
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+from pydantic import TypeAdapter
+
+from application.core.schemas.task import STaskCreateForm
+
+# Адаптер для валидации всего списка задач за один проход
+tasks_adapter = TypeAdapter(List[STaskCreateForm])
+
+# Типы содержимого, которые считаются NDJSON (одна задача в строке)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def parse_tasks_payload(body: bytes, content_type: str) -> List[STaskCreateForm]:
+    """
+    Разбирает тело запроса массового создания задач.
+
+    :param body: Тело запроса: JSON-массив или NDJSON (по одной задаче в строке).
+    :param content_type: Заголовок Content-Type запроса.
+    :return: Список провалидированных схем STaskCreateForm.
+    :raises ValueError: Если тело не является корректным JSON/NDJSON.
+    :raises pydantic.ValidationError: Если данные задач не прошли валидацию.
+    """
+    if content_type.split(";")[0].strip() in NDJSON_CONTENT_TYPES:
+        rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        rows = json.loads(body)
+    return tasks_adapter.validate_python(rows)
+
+
+def group_by_contractor(tasks: list) -> Dict[str, list]:
+    """
+    Группирует созданные задачи по email исполнителя для пакетных уведомлений.
+
+    :param tasks: Список задач с полем contractor_email.
+    :return: Словарь email исполнителя -> список его задач.
+    """
+    grouped = defaultdict(list)
+    for task in tasks:
+        grouped[task["contractor_email"]].append(task)
+    return grouped
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+# Кэш в памяти процесса с ограничением по времени жизни и размеру
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 128) -> None:
+        """
+        :param ttl: Время жизни записи в секундах.
+        :param maxsize: Максимальное количество записей; при переполнении
+                        удаляется запись, которая дольше всех не использовалась.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Количество обращений, найденных и не найденных в кэше
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Возвращает значение по ключу или None, если записи нет или она устарела.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение на время ttl.
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Удаляет запись по ключу, если она есть.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи.
+        """
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша: попадания, промахи, долю попаданий и размер.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
@@ -52,6 +52,34 @@ def create_message_add_new_task(email_to: EmailStr, data_task: SMyTask) -> Email
     return email
 
 
+def create_message_add_new_tasks(email_to: EmailStr, data_tasks: list) -> EmailMessage:
+    """
+    Создает одно сообщение со списком новых задач для отправки на email.
+
+    :param email_to: Электронная почта получателя.
+    :param data_tasks: Список словарей с данными о задачах.
+    :return: Объект EmailMessage с заданным содержимым.
+    """
+    email = EmailMessage()
+
+    email["Subject"] = f"Вам назначено новых задач: {len(data_tasks)}"
+    email["From"] = settings.SMTP_USERNAME
+    email["To"] = email_to
+
+    # Формируем текст сообщения из списка задач
+    text = "\n\n".join(
+        f"Название: {task['name']}\n"
+        f"Проект: {task['project_name']}\n"
+        f"Описание: {task['description']}\n"
+        f"Сроки: с {task['date_from']} по {task['date_to']}\n"
+        f"Статус: {task['status']}"
+        for task in data_tasks
+    )
+
+    email.set_content(f"Здравствуйте, вот ваши новые задачи!\n\n{text}")
+    return email
+
+
 def create_message_change_task(email_to: EmailStr, data_task: dict) -> EmailMessage:
     """
     Создает сообщение с информацией об изменениях в задаче для отправки на email.
@@ -98,3 +126,26 @@ def create_message_accept_task(email_to: EmailStr, data_task: SMyTask) -> EmailM
         f"Сроки: с {data_task.date_from} по {data_task.date_to}"
     )
     return email
+
+
+def create_message_digest(email_to: EmailStr, messages: list) -> EmailMessage:
+    """
+    Объединяет несколько уведомлений одному получателю в одно письмо-сводку.
+
+    :param email_to: Электронная почта получателя.
+    :param messages: Список объектов EmailMessage, созданных функциями этого модуля.
+    :return: Объект EmailMessage с темами и текстами всех уведомлений.
+    """
+    email = EmailMessage()
+
+    email["Subject"] = f"Сводка по вашим задачам: уведомлений {len(messages)}"
+    email["From"] = settings.SMTP_USERNAME
+    email["To"] = email_to
+
+    # Каждое уведомление - отдельный раздел со своей темой
+    text = "\n\n".join(
+        f"{message['Subject']}\n{message.get_content().strip()}" for message in messages
+    )
+
+    email.set_content(text)
+    return email
@@ -1,7 +1,7 @@
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Tuple
 
 from fastapi import HTTPException, Depends, Request
-from jose import jwt, ExpiredSignatureError, JWTError
+from jose import ExpiredSignatureError, JWTError
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,8 +13,16 @@ from application.core.exception.user_exception import (
 )
 from application.core.models import User
 from application.core.models.db_helper import db_helper
-from application.crud.users import get_user
-from application.utils.auth_user import verify_password
+from application.crud.users import get_user, get_user_cached
+from application.utils.auth_user import (
+    ACCESS_TOKEN,
+    REFRESH_TOKEN,
+    create_session_access_token,
+    decode_token,
+    session_user_from_claims,
+    verify_password_async,
+)
+from application.utils.revocation import revocation_list
 
 
 async def authenticate_user(
@@ -42,7 +50,7 @@ async def authenticate_user(
         raise UserNotFound
     else:
         # Проверяем соответствие переданного пароля хэшированному паролю пользователя
-        if not verify_password(password, user.hash_password):
+        if not await verify_password_async(password, user.hash_password):
             # Если пароли не совпадают, выбрасываем исключение InvalidPasswordError
             raise InvalidPasswordError
 
@@ -68,6 +76,34 @@ async def get_token_from_request(request: Request) -> Optional[str]:
     return token
 
 
+async def load_refresh_session(
+    refresh_token: str, session: AsyncSession
+) -> Tuple[User, dict]:
+    """
+    Проверяет refresh-токен и загружает пользователя из базы данных,
+    чтобы новый access-токен содержал актуальные данные.
+
+    :param refresh_token: Refresh-токен.
+    :param session: Сессия базы данных для выполнения запросов.
+    :return: Кортеж из пользователя и данных refresh-токена.
+    :raises HTTPException: Если токен некорректен, истек или отозван, или пользователь удален.
+    """
+    try:
+        payload = decode_token(refresh_token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Сессия истекла, войдите снова.")
+
+    if payload.get("typ") != REFRESH_TOKEN or await revocation_list.is_revoked(
+        payload["jti"]
+    ):
+        raise HTTPException(status_code=401, detail="Сессия истекла, войдите снова.")
+
+    user = await get_user(session, id=int(payload["sub"]))
+    if not user:
+        raise HTTPException(status_code=401, detail="Пользователь не найден.")
+    return user, payload
+
+
 async def get_current_user(
     request: Request,
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
@@ -76,11 +112,19 @@ async def get_current_user(
     """
     Получение текущего пользователя на основе JWT-токена.
 
+    Access-токен сессии (см. create_session_access_token) содержит id, is_director,
+    email и position, поэтому пользователь восстанавливается из токена без запроса
+    к базе данных; проверяется только список отозванных токенов. Для токенов без
+    этих данных пользователь загружается через кэш get_user_cached.
+    Истекший access-токен из cookies продлевается по refresh-токену из cookies:
+    новый токен сохраняется в request.state.access_token и записывается в cookies ответа.
+
     :param request: Объект запроса, из которого будет извлечен токен.
     :param session: Сессия базы данных для выполнения запросов.
     :param token: JWT-токен для декодирования пользователя (может быть None).
-    :return: Возвращает объект User, если токен валиден, иначе None для неавторизованных.
-    :raises HTTPException: Если токен некорректный или пользователь не найден.
+    :return: Возвращает объект User (или SSessionUser), если токен валиден,
+             иначе None для неавторизованных.
+    :raises HTTPException: Если токен некорректный, отозван или пользователь не найден.
     """
     # Если токен отсутствует, пользователь не авторизован
     if not token:
@@ -88,7 +132,15 @@ async def get_current_user(
 
     try:
         # Раскодируем токен с использованием секретного ключа и алгоритма
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_token(token)
+    except ExpiredSignatureError:
+        refresh_token = request.cookies.get("refresh_token")
+        if not refresh_token or request.cookies.get("access_token") != token:
+            raise HTTPException(status_code=401, detail="Срок действия токена истек.")
+
+        user, _ = await load_refresh_session(refresh_token, session)
+        request.state.access_token = create_session_access_token(user)
+        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Ошибка проверки токена.")
 
@@ -97,11 +149,20 @@ async def get_current_user(
     if user_id is None:
         raise HTTPException(status_code=401, detail="Некорректный токен.")
 
-    # Ищем пользователя в базе данных по идентификатору
-    user = await get_user(session, id=int(user_id))
+    # Токены сессии можно отозвать при выходе
+    if "jti" in payload and await revocation_list.is_revoked(payload["jti"]):
+        raise HTTPException(status_code=401, detail="Сессия завершена.")
+
+    if settings.auth_stateless_sessions and payload.get("typ") == ACCESS_TOKEN:
+        return session_user_from_claims(payload)
+
+    # Ищем пользователя по идентификатору (кэш процесса, затем база данных).
+    # Кэш сбрасывается только в set_notification_mode (crud/users.py): любое новое
+    # изменение пользователя должно вызывать invalidate_user, иначе здесь до
+    # settings.auth_user_cache_ttl секунд возвращаются устаревшие данные
+    user = await get_user_cached(session, int(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден.")
 
     # Возвращаем объект пользователя
     return user
-
@@ -38,3 +38,44 @@ class PositionType(Enum):
     DEVELOPER = "Developer"       # Должность разработчика
     MANAGER = "Manager"           # Должность менеджера
     TESTER = "Tester"             # Должность тестировщика
+
+
+class OutboxEvent(Enum):
+    """
+    Перечисление событий транзакционного outbox.
+    Каждое событие отправляется своей задачей Celery:
+    - TASK_CREATED: назначена новая задача.
+    - TASKS_CREATED: назначено несколько задач одному исполнителю.
+    - TASK_CHANGED: задача изменена.
+    - TASK_ACCEPTED: задача принята в работу.
+    """
+    TASK_CREATED = "task_created"      # Новая задача
+    TASKS_CREATED = "tasks_created"    # Несколько новых задач исполнителя
+    TASK_CHANGED = "task_changed"      # Изменение задачи
+    TASK_ACCEPTED = "task_accepted"    # Задача принята в работу
+
+
+class NotificationMode(Enum):
+    """
+    Перечисление режимов email уведомлений пользователя.
+    Уведомления одному получателю объединяются в одно письмо-сводку:
+    - INSTANT: сразу после окна объединения settings.notification_coalesce_window.
+    - HOURLY: не чаще одного письма в час.
+    - DAILY: не чаще одного письма в сутки.
+    """
+    INSTANT = "instant"    # Сразу (после короткого окна объединения)
+    HOURLY = "hourly"      # Сводка раз в час
+    DAILY = "daily"        # Сводка раз в сутки
+
+
+class CeleryQueue(Enum):
+    """
+    Перечисление очередей Celery. Каждую очередь обслуживает свой воркер,
+    поэтому массовые уведомления не задерживают коды подтверждения:
+    - AUTH: коды подтверждения регистрации.
+    - NOTIFICATIONS: уведомления о задачах.
+    - DEFAULT: периодические и фоновые задачи обслуживания базы данных.
+    """
+    AUTH = "auth"                      # Коды подтверждения
+    NOTIFICATIONS = "notifications"    # Уведомления о задачах
+    DEFAULT = "default"                # Остальные задачи
@@ -0,0 +1,21 @@
+from typing import Optional
+
+
+def version_etag(version: int) -> str:
+    """
+    Возвращает значение заголовка ETag для версии объекта.
+    """
+    return f'"{version}"'
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """
+    Разбирает заголовок If-Match с версией объекта.
+
+    :param value: Значение заголовка ("3", "\"3\"" или W/"3").
+    :return: Ожидаемая версия или None, если заголовок не передан или равен "*".
+    :raises ValueError: Если значение не является версией.
+    """
+    if value is None or value.strip() == "*":
+        return None
+    return int(value.strip().removeprefix("W/").strip('"'))
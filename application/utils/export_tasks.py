@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator
+
+# Колонки выгрузки задач в порядке следования в CSV
+EXPORT_COLUMNS = (
+    "id",
+    "name",
+    "project_id",
+    "project_name",
+    "description",
+    "date_from",
+    "date_to",
+    "contractor",
+    "contractor_email",
+    "type_task",
+    "status",
+)
+
+# Типы содержимого для поддерживаемых форматов выгрузки
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_value(value: Any) -> Any:
+    """
+    Приводит значение колонки к виду, пригодному для JSON и CSV.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+async def tasks_to_ndjson(chunks: AsyncIterator[list]) -> AsyncIterator[str]:
+    """
+    Преобразует поток частей выборки задач в NDJSON (одна задача в строке).
+
+    :param chunks: Асинхронный итератор списков задач.
+    :return: Асинхронный итератор фрагментов текста.
+    """
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(
+                {column: _export_value(row[column]) for column in EXPORT_COLUMNS},
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        )
+
+
+async def tasks_to_csv(chunks: AsyncIterator[list]) -> AsyncIterator[str]:
+    """
+    Преобразует поток частей выборки задач в CSV с заголовком.
+
+    :param chunks: Асинхронный итератор списков задач.
+    :return: Асинхронный итератор фрагментов текста.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Заголовок отдается сразу, еще до первой строки из базы
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_export_value(row[column]) for column in EXPORT_COLUMNS] for row in rows
+        )
+        yield buffer.getvalue()
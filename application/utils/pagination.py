@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.core.config import settings
+from application.core.exception.base_exception import InvalidCursorError
+from application.core.schemas.pagination import SPage
+
+# Направления перехода по курсору
+NEXT = "next"
+PREV = "prev"
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """
+    Приводит размер страницы к допустимому диапазону.
+
+    :param limit: Запрошенный размер страницы (None - размер по умолчанию).
+    :return: Размер страницы в пределах от 1 до settings.page_size_max.
+    """
+    if limit is None:
+        limit = settings.page_size
+    return max(1, min(limit, settings.page_size_max))
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    """
+    Кодирует направление и значения ключа сортировки в непрозрачный курсор.
+
+    :param direction: Направление перехода (NEXT или PREV).
+    :param values: Значения ключа сортировки граничной строки.
+    :return: Строка курсора, безопасная для использования в URL.
+    """
+    raw = json.dumps({"d": direction, "k": jsonable_encoder(list(values))})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse_key_value(key, value: Any) -> Any:
+    """
+    Приводит значение из курсора к python-типу колонки сортировки.
+    """
+    python_type = key.type.python_type
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> Tuple[str, List[Any]]:
+    """
+    Декодирует курсор, созданный функцией encode_cursor.
+
+    :param cursor: Строка курсора.
+    :param keys: Колонки ключа сортировки, для которых был создан курсор.
+    :return: Кортеж из направления перехода и значений ключа.
+    :raises InvalidCursorError: Если курсор поврежден или не подходит к ключу сортировки.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        direction, values = data["d"], data["k"]
+        if direction not in (NEXT, PREV) or len(values) != len(keys):
+            raise ValueError("Cursor does not match the sort key")
+        return direction, [_parse_key_value(k, v) for k, v in zip(keys, values)]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError from e
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    keys: Sequence,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> SPage:
+    """
+    Выполняет запрос с курсорной (keyset) пагинацией.
+
+    Вместо OFFSET используется условие по ключу сортировки, поэтому стоимость
+    запроса зависит только от размера страницы, а не от размера таблицы.
+
+    :param session: Асинхронная сессия базы данных.
+    :param stmt: Запрос без сортировки и лимита.
+    :param keys: Колонки уникального ключа сортировки, например (Task.date_to, Task.id).
+        Колонки, которых нет в выборке, добавляются для курсора и не попадают в элементы.
+    :param cursor: Курсор из предыдущей страницы (None - первая страница).
+    :param limit: Размер страницы.
+    :return: Страница SPage с элементами в виде словарей и курсорами.
+    :raises InvalidCursorError: Если курсор некорректен.
+    """
+    limit = clamp_limit(limit)
+    direction = NEXT
+    hidden = [k for k in keys if k.key not in stmt.selected_columns.keys()]
+    stmt = stmt.add_columns(*hidden)
+
+    if cursor:
+        direction, values = decode_cursor(cursor, keys)
+        key_tuple = tuple_(*keys)
+        bound = tuple_(*[literal(v, k.type) for k, v in zip(keys, values)])
+        stmt = stmt.where(key_tuple > bound if direction == NEXT else key_tuple < bound)
+
+    # При переходе назад читаем в обратном порядке и разворачиваем результат
+    order = keys if direction == NEXT else [k.desc() for k in keys]
+    result = await session.execute(stmt.order_by(*order).limit(limit + 1))
+    rows = result.mappings().all()
+
+    # Лишняя строка означает, что в направлении чтения есть еще данные
+    has_more = len(rows) > limit
+    rows = [dict(row) for row in rows[:limit]]
+    if direction == PREV:
+        rows.reverse()
+
+    page = SPage(items=rows, limit=limit)
+    if rows:
+        first = [rows[0][k.key] for k in keys]
+        last = [rows[-1][k.key] for k in keys]
+        if has_more or direction == PREV:
+            page.next_cursor = encode_cursor(NEXT, last)
+        if (direction == PREV and has_more) or (direction == NEXT and cursor):
+            page.prev_cursor = encode_cursor(PREV, first)
+    for row in rows:
+        for k in hidden:
+            del row[k.key]
+    return page
@@ -0,0 +1,66 @@
+import time
+from typing import Dict
+
+from redis import asyncio as aioredis
+
+from application.core.config import settings
+
+
+# Отозванные токены в памяти процесса (для тестов и запуска без Redis)
+class MemoryRevocationList:
+    def __init__(self) -> None:
+        """
+        Хранит идентификаторы (jti) отозванных токенов до истечения их срока действия.
+        """
+        self._revoked: Dict[str, float] = {}
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Отзывает токен до момента expires_at (unix time), после которого он
+        недействителен и без списка отзыва.
+        """
+        now = time.time()
+        # Истекшие записи больше не нужны
+        self._revoked = {
+            key: until for key, until in self._revoked.items() if until > now
+        }
+        self._revoked[jti] = expires_at
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Проверяет, отозван ли токен.
+        """
+        return self._revoked.get(jti, 0) > time.time()
+
+
+# Отозванные токены в Redis, общие для всех процессов приложения
+class RedisRevocationList:
+    # Префикс ключей отозванных токенов
+    key_prefix = "revoked_token:"
+
+    def __init__(self, url: str) -> None:
+        """
+        Каждый отозванный токен хранится отдельным ключом со сроком жизни,
+        равным оставшемуся сроку действия токена, поэтому список не растет.
+        """
+        self._redis = aioredis.from_url(url)
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Отзывает токен до момента expires_at (unix time).
+        """
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self._redis.set(self.key_prefix + jti, 1, ex=ttl)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Проверяет, отозван ли токен.
+        """
+        return bool(await self._redis.exists(self.key_prefix + jti))
+
+
+if settings.MODE == "TEST" or settings.auth_revocation_backend == "memory":
+    revocation_list = MemoryRevocationList()
+else:
+    revocation_list = RedisRevocationList(settings.REDIS_URL)
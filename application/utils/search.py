@@ -0,0 +1,27 @@
+from sqlalchemy import REAL, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+# Конфигурация полнотекстового поиска (совпадает с выражением search_vector в моделях)
+SEARCH_CONFIG = "russian"
+
+
+def search_query(text: str):
+    """
+    Строит tsquery из строки поиска в синтаксисе веб-поиска:
+    слова через пробел, "точная фраза", or, -исключение.
+
+    :param text: Строка поиска пользователя.
+    :return: SQL-выражение websearch_to_tsquery.
+    """
+    return func.websearch_to_tsquery(literal(SEARCH_CONFIG, REGCONFIG), text)
+
+
+def search_rank(vector, query):
+    """
+    Оценка релевантности документа запросу (совпадения в имени весят больше, чем в описании).
+
+    :param vector: Колонка search_vector.
+    :param query: Выражение, построенное search_query.
+    :return: SQL-выражение ts_rank типа REAL.
+    """
+    return func.ts_rank(vector, query, type_=REAL)
@@ -0,0 +1,134 @@
+import os
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, List, Tuple
+
+from application.core.config import settings
+
+# Ошибки соединения, после которых письмо повторяется на новом соединении
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def connect_smtp() -> smtplib.SMTP:
+    """
+    Открывает SMTP-соединение по настройкам приложения и авторизуется на сервере.
+
+    :return: Авторизованное SMTP-соединение.
+    """
+    server_class = smtplib.SMTP_SSL if settings.smtp_use_ssl else smtplib.SMTP
+    server = server_class(
+        settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.smtp_timeout
+    )
+    if settings.SMTP_USERNAME:
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    return server
+
+
+# Пул авторизованных SMTP-соединений процесса воркера
+class SMTPConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        size: int,
+        idle_timeout: float,
+    ) -> None:
+        """
+        Хранит до size открытых авторизованных соединений и переиспользует их
+        для следующих писем, чтобы не повторять TLS-рукопожатие и вход на каждое письмо.
+
+        :param connect: Функция, открывающая авторизованное соединение.
+        :param size: Максимальное количество простаивающих соединений.
+        :param idle_timeout: Время простоя (сек.), после которого соединение
+                             не используется, а открывается заново
+                             (SMTP-серверы закрывают простаивающие соединения сами).
+        """
+        self.connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _acquire(self) -> Tuple[smtplib.SMTP, bool]:
+        """
+        Выдает свежее простаивающее соединение или открывает новое.
+
+        :return: Соединение и признак того, что оно уже использовалось.
+        """
+        expired = []
+        with self._lock:
+            # Соединения родительского процесса не используются после fork
+            if self._pid != os.getpid():
+                self._idle, self._pid = [], os.getpid()
+            deadline = time.monotonic() - self.idle_timeout
+            while self._idle:
+                server, released_at = self._idle.pop()
+                if released_at > deadline:
+                    break
+                expired.append(server)
+            else:
+                server = None
+
+        for stale in expired:
+            self._close(stale)
+        if server is not None:
+            return server, True
+        return self.connect(), False
+
+    def _release(self, server: smtplib.SMTP) -> None:
+        """
+        Возвращает соединение в пул или закрывает его, если пул заполнен.
+        """
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def send(self, message: EmailMessage) -> None:
+        """
+        Отправляет письмо через соединение из пула. Если переиспользованное
+        соединение оказалось закрытым сервером, письмо повторяется на новом.
+
+        :param message: Сформированное письмо.
+        """
+        while True:
+            server, reused = self._acquire()
+            try:
+                server.send_message(message)
+            except CONNECTION_ERRORS:
+                server.close()
+                if not reused:
+                    raise
+            except BaseException:
+                # Состояние сессии неизвестно: соединение не возвращается в пул
+                self._close(server)
+                raise
+            else:
+                self._release(server)
+                return
+
+    def close(self) -> None:
+        """
+        Закрывает все простаивающие соединения.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+smtp_pool = SMTPConnectionPool(
+    connect_smtp,
+    size=settings.smtp_pool_size,
+    idle_timeout=settings.smtp_idle_timeout,
+)
@@ -1,28 +1,101 @@
 import asyncio
+import time
+from typing import Dict, Optional, Tuple
 
-from typing import Dict
+from redis import asyncio as aioredis
 
-# Хранилище для временных кодов подтверждения
-verification_codes: Dict[str, int] = {}
+from application.core.config import settings
 
 
-async def remove_code_after_delay(email: str, delay: int = 300):
-    """
-    Асинхронная функция для удаления кода подтверждения по истечению времени.
+# Коды подтверждения в памяти процесса (для тестов и запуска без Redis)
+class MemoryCodeStore:
+    def __init__(self, ttl: int, reap_interval: float = 30.0) -> None:
+        """
+        Хранит коды подтверждения со временем истечения. Истекшие коды удаляет
+        одна фоновая задача на все хранилище, а не отдельная задача на каждый код.
 
-    Аргументы:
-    email (str): Адрес электронной почты пользователя, для которого был отправлен код подтверждения.
-    delay (int): Время задержки в секундах перед удалением кода. По умолчанию 300 секунд (5 минут).
+        :param ttl: Время жизни кода (сек.).
+        :param reap_interval: Период очистки истекших кодов (сек.).
+        """
+        self.ttl = ttl
+        self.reap_interval = reap_interval
+        self._codes: Dict[str, Tuple[int, float]] = {}
+        self._reaper: Optional[asyncio.Task] = None
 
-    Действия:
-    - Ждет указанное количество времени.
-    - По истечению времени удаляет код подтверждения из хранилища verification_codes.
-    - Выводит сообщение в консоль о том, что код был удален.
-    """
-    # Ожидание указанного времени (в секундах)
-    await asyncio.sleep(delay)
+    async def set(self, email: str, code: int) -> None:
+        """
+        Сохраняет код подтверждения для email, заменяя предыдущий.
+        """
+        self._codes[email] = (code, time.monotonic() + self.ttl)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
 
-    # Удаление кода из хранилища после истечения времени
-    if email in verification_codes:
-        del verification_codes[email]
-        print(f"Verification code for {email} has expired and been removed.")
+    async def get(self, email: str) -> Optional[int]:
+        """
+        Возвращает действующий код подтверждения или None.
+        """
+        code, expires_at = self._codes.get(email, (None, 0.0))
+        return code if expires_at > time.monotonic() else None
+
+    async def delete(self, email: str) -> None:
+        """
+        Удаляет код подтверждения.
+        """
+        self._codes.pop(email, None)
+
+    def reap(self) -> None:
+        """
+        Удаляет истекшие коды.
+        """
+        now = time.monotonic()
+        self._codes = {
+            email: entry for email, entry in self._codes.items() if entry[1] > now
+        }
+
+    async def _reap(self) -> None:
+        # Задача завершается, когда хранилище пустеет, и создается заново при записи
+        while self._codes:
+            await asyncio.sleep(self.reap_interval)
+            self.reap()
+
+
+# Коды подтверждения в Redis, общие для всех процессов и переживающие перезапуск
+class RedisCodeStore:
+    # Префикс ключей кодов подтверждения
+    key_prefix = "verification_code:"
+
+    def __init__(self, url: str, ttl: int) -> None:
+        """
+        Каждый код хранится отдельным ключом со сроком жизни (SET EX),
+        поэтому истекшие коды удаляет сам Redis.
+
+        :param url: URL подключения к Redis.
+        :param ttl: Время жизни кода (сек.).
+        """
+        self._redis = aioredis.from_url(url)
+        self.ttl = ttl
+
+    async def set(self, email: str, code: int) -> None:
+        """
+        Сохраняет код подтверждения для email, заменяя предыдущий.
+        """
+        await self._redis.set(self.key_prefix + email, code, ex=self.ttl)
+
+    async def get(self, email: str) -> Optional[int]:
+        """
+        Возвращает действующий код подтверждения или None.
+        """
+        code = await self._redis.get(self.key_prefix + email)
+        return int(code) if code is not None else None
+
+    async def delete(self, email: str) -> None:
+        """
+        Удаляет код подтверждения.
+        """
+        await self._redis.delete(self.key_prefix + email)
+
+
+if settings.MODE == "TEST" or settings.verification_code_backend == "memory":
+    verification_codes = MemoryCodeStore(settings.verification_code_ttl)
+else:
+    verification_codes = RedisCodeStore(settings.REDIS_URL, settings.verification_code_ttl)
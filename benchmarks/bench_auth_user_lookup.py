@@ -0,0 +1,50 @@
+"""
+Сравнение затрат CPU на поиск пользователя при авторизации (get_current_user -> get_user):
+запрос, собираемый заново при каждом вызове, против закэшированного запроса.
+
+Запуск: python -m benchmarks.bench_auth_user_lookup [количество вызовов]
+Нужна база с хотя бы одним пользователем (настройки берутся из .env).
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+
+from application.core.models import User
+from application.core.models.db_helper import db_helper
+from application.crud.users import get_user
+
+
+async def inline_get_user(session, **data):
+    # Прежняя реализация get_user: запрос строится при каждом вызове
+    stmt = select(User.__table__.columns).filter_by(**data)
+    user = await session.execute(stmt)
+    return user.mappings().one_or_none()
+
+
+async def measure(name: str, lookup, session, user_id: int, calls: int) -> None:
+    for _ in range(200):
+        await lookup(session, id=user_id)
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(calls):
+        await lookup(session, id=user_id)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(f"{name:8} cpu/call={cpu / calls * 1e6:7.1f}us wall/call={wall / calls * 1e6:7.1f}us")
+
+
+async def main(calls: int) -> None:
+    async with db_helper.session_factory() as session:
+        user_id = (await session.execute(select(User.id).limit(1))).scalar()
+        if user_id is None:
+            sys.exit("В базе нет пользователей")
+        for _ in range(2):
+            await measure("inline", inline_get_user, session, user_id, calls)
+            await measure("cached", get_user, session, user_id, calls)
+    await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000))
@@ -0,0 +1,120 @@
+"""
+Размер сообщений уведомлений в брокере и загрузка задач на стороне воркера.
+
+1. Байты на уведомление в Redis: прежние аргументы задач (email и задача целиком,
+   словарем) против аргументов только из ID (send_email_add_new_task_for_you,
+   send_email_add_new_tasks_for_you, send_email_digest). Сообщения публикуются
+   в транспорт kombu memory://, размер считается так же, как транспорт Redis
+   записывает сообщение в список (kombu.utils.json.dumps конверта).
+2. Загрузка задач воркером (get_tasks_by_ids): новое соединение на каждую задачу
+   (run_in_session с NullPool) против пула соединений потока (worker_db)
+   и одного запроса WHERE id = ANY на всю пачку.
+
+Запуск: python -m benchmarks.bench_broker_payload [количество задач]
+Нужна база с задачами (настройки берутся из .env).
+"""
+
+import asyncio
+import sys
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from kombu.transport import memory
+from kombu.utils.json import dumps
+from sqlalchemy import select
+
+from application.background_tasks import send_message
+from application.background_tasks.db import run_in_session, worker_db
+from application.core.models import Task
+from application.crud.tasks import HOT_TASKS, get_tasks_by_ids
+from application.utils.emun_types import OutboxEvent
+
+NAME = "application.background_tasks.send_message."
+
+
+def published_bytes(publish: Callable[[], None]) -> int:
+    """Возвращает размер сообщений, записанных в брокер функцией publish."""
+    sizes = []
+    put = memory.Channel._put
+
+    def measured_put(channel, queue, message, **kwargs):
+        sizes.append(len(dumps(message)))
+        return put(channel, queue, message, **kwargs)
+
+    memory.Channel._put = measured_put
+    try:
+        publish()
+    finally:
+        memory.Channel._put = put
+    return sum(sizes)
+
+
+def payload_sizes(rows: list) -> None:
+    celery = send_message.celery
+    celery.conf.broker_url = "memory://"
+    data = [jsonable_encoder(dict(row._mapping)) for row in rows]
+    first, email = rows[0], rows[0].contractor_email
+
+    single = {
+        # Прежняя реализация: email и задача целиком
+        "before": lambda: celery.send_task(
+            NAME + "send_email_add_new_task_for_you", args=[email, data[0]]
+        ),
+        "task_id": lambda: send_message.send_email_add_new_task_for_you.delay(first.id),
+        "digest": lambda: send_message.send_email_digest.delay(
+            first.contractor, [[OutboxEvent.TASK_CREATED.value, [first.id]]]
+        ),
+    }
+    bulk = {
+        "before": lambda: celery.send_task(
+            NAME + "send_email_add_new_tasks_for_you", args=[email, data]
+        ),
+        "task_ids": lambda: send_message.send_email_add_new_tasks_for_you.delay(
+            [row.id for row in rows]
+        ),
+    }
+    for title, variants in (("1 task", single), (f"{len(rows)} tasks", bulk)):
+        for name, publish in variants.items():
+            print(f"{title:9} {name:9} bytes/message={published_bytes(publish):6}")
+
+
+def load_time(name: str, load: Callable[[List[int]], list], batches: List[List[int]]) -> None:
+    load(batches[0])
+    started = time.perf_counter()
+    for batch in batches:
+        load(batch)
+    elapsed = time.perf_counter() - started
+    tasks = sum(len(batch) for batch in batches)
+    print(f"{name:9} ms/task={elapsed / tasks * 1000:7.2f}")
+
+
+def main(count: int) -> None:
+    task_ids = list(
+        worker_db.run(
+            lambda session: session.scalars(
+                select(Task.id).where(HOT_TASKS).order_by(Task.id).limit(count)
+            )
+        )
+    )
+    if not task_ids:
+        sys.exit("В базе нет задач")
+    rows = worker_db.run(lambda session: get_tasks_by_ids(task_ids, session))
+    payload_sizes(rows)
+
+    def per_connection(ids: List[int]) -> list:
+        # Прежняя загрузка: новый цикл событий и соединение на каждую задачу
+        return asyncio.run(run_in_session(lambda session: get_tasks_by_ids(ids, session)))
+
+    def pooled(ids: List[int]) -> list:
+        return worker_db.run(lambda session: get_tasks_by_ids(ids, session))
+
+    single = [[task_id] for task_id in task_ids]
+    load_time("NullPool", per_connection, single)
+    load_time("pool", pooled, single)
+    load_time("ANY", pooled, [task_ids])
+    worker_db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
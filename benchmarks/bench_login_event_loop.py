@@ -0,0 +1,69 @@
+"""
+Задержка цикла событий при одновременных входах пользователей: проверка пароля bcrypt
+прямо в обработчике против проверки в пуле потоков (verify_password_async).
+
+Пока выполняются входы, фоновая задача каждые 5 мс просыпается и измеряет,
+на сколько позже запланированного она получила управление.
+
+Запуск: python -m benchmarks.bench_login_event_loop [количество входов]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from application.utils.auth_user import (
+    get_password_hash,
+    verify_password,
+    verify_password_async,
+)
+
+TICK = 0.005
+
+
+async def blocking_login(password: str, hashed: str) -> bool:
+    # Прежняя реализация authenticate_user: bcrypt в цикле событий
+    return verify_password(password, hashed)
+
+
+async def pooled_login(password: str, hashed: str) -> bool:
+    return await verify_password_async(password, hashed)
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def measure(name: str, login, logins: int, hashed: str) -> None:
+    lags, stop = [], asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login("password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick_task
+
+    assert all(results)
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:8} logins/s={logins / elapsed:6.1f} "
+        f"loop lag p50={statistics.median(lags_ms):7.1f}ms "
+        f"p99={p99:7.1f}ms max={lags_ms[-1]:7.1f}ms"
+    )
+
+
+async def main(logins: int) -> None:
+    hashed = get_password_hash("password")
+    await measure("blocking", blocking_login, logins, hashed)
+    await measure("pool", pooled_login, logins, hashed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 32))
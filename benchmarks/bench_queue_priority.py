@@ -0,0 +1,131 @@
+"""
+Задержка отправки кода подтверждения во время массовой рассылки уведомлений:
+одна общая очередь (прежняя схема с одним воркером) против отдельных очередей
+auth и notifications со своими воркерами (CeleryQueue, task_routes).
+
+В очередь сразу ставится пачка задач send_email_digest (импорт спринта), затем,
+пока пачка обрабатывается, каждые 50 мс ставится задача send_email_confirmation_code.
+Брокер - транспорт kombu memory://, воркеры запускаются в этом же процессе:
+каждый процесс воркера моделируется отдельным воркером с пулом solo и своей
+предвыборкой (пул threads с транспортом memory:// обрабатывает задачи с задержкой
+~0,1 с на сообщение и искажает измерение). Общее количество процессов в обеих
+схемах одинаковое.
+Отправка писем заменена задержкой: база данных и SMTP-сервер не нужны.
+
+Запуск: python -m benchmarks.bench_queue_priority [количество уведомлений] [время отправки, мс]
+"""
+
+import statistics
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List
+
+from celery.contrib.testing.worker import start_worker
+
+from application.background_tasks import send_message
+from application.background_tasks.worker import WORKER_SETTINGS
+from application.utils.emun_types import CeleryQueue
+
+CODE_INTERVAL = 0.05
+
+
+class StubPool:
+    """Вместо SMTP: ждет send_time и запоминает задержку кодов подтверждения."""
+
+    def __init__(self, send_time: float) -> None:
+        self.send_time = send_time
+        self.enqueued: Dict[str, float] = {}
+        self.latencies: List[float] = []
+
+    def send(self, message) -> None:
+        time.sleep(self.send_time)
+        self.latencies.append(time.perf_counter() - self.enqueued[message["To"]])
+
+
+def run(name: str, notifications: int, send_time: float, shared: bool) -> None:
+    pool = StubPool(send_time)
+    send_message.smtp_pool = pool
+    done = threading.Semaphore(0)
+
+    def send_events(events, recipient_id=None) -> None:
+        time.sleep(send_time)
+        done.release()
+
+    send_message._send_events = send_events
+
+    auth_concurrency = WORKER_SETTINGS[CeleryQueue.AUTH][0]
+    notifications_concurrency, prefetch = WORKER_SETTINGS[CeleryQueue.NOTIFICATIONS]
+    # Общая очередь: все задачи, все процессы и один множитель предвыборки
+    workers = (
+        [(CeleryQueue.NOTIFICATIONS, auth_concurrency + notifications_concurrency, prefetch)]
+        if shared
+        else [
+            (queue, *WORKER_SETTINGS[queue])
+            for queue in (CeleryQueue.AUTH, CeleryQueue.NOTIFICATIONS)
+        ]
+    )
+    code_options = {"queue": CeleryQueue.NOTIFICATIONS.value} if shared else {}
+
+    with ExitStack() as stack:
+        for queue, concurrency, prefetch_multiplier in workers:
+            for _ in range(concurrency):
+                stack.enter_context(
+                    start_worker(
+                        send_message.celery,
+                        pool="solo",
+                        queues=[queue.value],
+                        prefetch_multiplier=prefetch_multiplier,
+                        perform_ping_check=False,
+                        shutdown_timeout=30,
+                    )
+                )
+
+        started = time.perf_counter()
+        for number in range(notifications):
+            send_message.send_email_digest.delay(number, [["task_accepted", [number]]])
+
+        sent = 0
+        codes = 0
+        while sent < notifications:
+            email = f"user{codes}@example.com"
+            pool.enqueued[email] = time.perf_counter()
+            send_message.send_email_confirmation_code.apply_async(
+                (email, 123456), **code_options
+            )
+            codes += 1
+            deadline = time.perf_counter() + CODE_INTERVAL
+            while sent < notifications and done.acquire(
+                timeout=max(deadline - time.perf_counter(), 0)
+            ):
+                sent += 1
+        burst = time.perf_counter() - started
+
+        while len(pool.latencies) < codes:
+            time.sleep(CODE_INTERVAL)
+
+    latencies = sorted(pool.latencies)
+    print(
+        f"{name:7} burst={burst:6.1f}s codes={codes:4} "
+        f"p50={statistics.median(latencies) * 1000:8.1f}ms "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1000:8.1f}ms "
+        f"max={latencies[-1] * 1000:8.1f}ms"
+    )
+
+
+def main(notifications: int, send_ms: float) -> None:
+    send_message.celery.conf.broker_url = "memory://"
+    send_message.celery.conf.broker_transport_options = {
+        **send_message.celery.conf.broker_transport_options,
+        "polling_interval": 0.01,
+    }
+    for name, shared in (("shared", True), ("routed", False)):
+        run(name, notifications, send_ms / 1000, shared)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+    )
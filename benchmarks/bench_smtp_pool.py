@@ -0,0 +1,154 @@
+"""
+Пропускная способность отправки писем одним воркером: новое соединение SMTP_SSL
+и вход на каждое письмо (прежняя реализация send_message) против пула
+постоянных соединений (SMTPConnectionPool).
+
+В качестве SMTP-сервера запускается локальный aiosmtpd с неявным TLS
+(самоподписанный сертификат создается через openssl) и обязательной авторизацией.
+Письма сервер не сохраняет. Задержка сети до почтового сервера моделируется
+TCP-прокси, задерживающим каждую порцию данных на половину RTT в каждую сторону.
+
+Запуск: python -m benchmarks.bench_smtp_pool [количество писем] [RTT, мс]
+Нужны пакет aiosmtpd и утилита openssl.
+"""
+
+import logging
+import smtplib
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from email.message import EmailMessage
+from pathlib import Path
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from application.utils.smtp_pool import SMTPConnectionPool
+
+HOST = "127.0.0.1"
+USERNAME, PASSWORD = "bench@example.com", "password"
+
+
+class DiscardHandler:
+    async def handle_DATA(self, server, session, envelope) -> str:
+        return "250 OK"
+
+
+def authenticator(server, session, envelope, mechanism, auth_data) -> AuthResult:
+    return AuthResult(
+        success=(auth_data.login, auth_data.password)
+        == (USERNAME.encode(), PASSWORD.encode())
+    )
+
+
+def server_ssl_context(directory: Path) -> ssl.SSLContext:
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+class LatencyProxy:
+    def __init__(self, target_port: int, rtt: float) -> None:
+        self.target_port = target_port
+        self.delay = rtt / 2
+        self.listener = socket.create_server((HOST, 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            client, _ = self.listener.accept()
+            upstream = socket.create_connection((HOST, self.target_port))
+            for src, dst in ((client, upstream), (upstream, client)):
+                threading.Thread(target=self._pipe, args=(src, dst), daemon=True).start()
+
+    def _pipe(self, src: socket.socket, dst: socket.socket) -> None:
+        try:
+            while data := src.recv(65536):
+                time.sleep(self.delay)
+                dst.sendall(data)
+            dst.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        finally:
+            src.close()
+
+
+def message(number: int) -> EmailMessage:
+    email = EmailMessage()
+    email["Subject"] = f"Ваша задача изменилась #{number}"
+    email["From"] = USERNAME
+    email["To"] = "contractor@example.com"
+    email.set_content("Здравствуйте, ваша задача изменилась!\nstatus: В работе")
+    return email
+
+
+def main(messages: int, rtt_ms: float) -> None:
+    # Предупреждения aiosmtpd о настройке авторизации не относятся к измерению
+    warnings.simplefilter("ignore")
+    logging.getLogger("mail.log").setLevel(logging.ERROR)
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        controller = Controller(
+            DiscardHandler(),
+            hostname=HOST,
+            port=port,
+            ssl_context=server_ssl_context(Path(directory)),
+            authenticator=authenticator,
+            auth_required=True,
+            auth_require_tls=False,
+        )
+        controller.start()
+    if rtt_ms:
+        port = LatencyProxy(port, rtt_ms / 1000).port
+    client_context = ssl._create_unverified_context()
+
+    def connect() -> smtplib.SMTP:
+        server = smtplib.SMTP_SSL(HOST, port, context=client_context, timeout=10)
+        server.login(USERNAME, PASSWORD)
+        return server
+
+    def per_message(email: EmailMessage) -> None:
+        # Прежняя реализация: TLS-рукопожатие и вход на каждое письмо
+        with smtplib.SMTP_SSL(HOST, port, context=client_context, timeout=10) as server:
+            server.login(USERNAME, PASSWORD)
+            server.send_message(email)
+
+    pool = SMTPConnectionPool(connect, size=1, idle_timeout=60.0)
+    try:
+        results = {}
+        for name, send in (("per-msg", per_message), ("pool", pool.send)):
+            started = time.perf_counter()
+            for number in range(messages):
+                send(message(number))
+            results[name] = messages / (time.perf_counter() - started)
+            print(f"{name:8} rtt={rtt_ms:g}ms messages/s={results[name]:8.1f}")
+        print(f"speedup  x{results['pool'] / results['per-msg']:.1f}")
+    finally:
+        pool.close()
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10.0,
+    )